@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+📦 Benchmark de Arquivos Curtos em Lote
+Autor: Diego Sottani
+
+Transcreve a mesma pasta de arquivos curtos arquivo por arquivo e com
+--lote-curtos e compara:
+- Arquivos por minuto e ganho de velocidade do modo em lote
+- Taxa de erro de palavras (WER) do lote tomando o laço como referência
+
+Uso:
+    python benchmarks/benchmark_curtos.py --arquivos 64 --lote 16
+    python benchmarks/benchmark_curtos.py --audio notas/*.ogg --saida curtos.json
+"""
+
+import os
+import sys
+import json
+import shutil
+import platform
+import argparse
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+# Permite rodar a partir de qualquer pasta
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RAIZ))
+
+from benchmark_pipeline import SINAIS, gerar_video, medir, _silencioso, _versao_git
+from benchmark_quantizacao import taxa_erro_palavras
+from preprocessar_videos import PreProcessadorVideo
+from transcrever import TranscritorVideos
+
+
+def medir_modo(args, pasta, lote_curtos):
+    """
+    Transcreve a pasta inteira (sem cache) com ou sem o modo em lote
+    
+    Returns:
+        tuple: (medidas do modo, {arquivo: texto})
+    """
+    saida = tempfile.mkdtemp(prefix='benchmark_curtos_saida_')
+    try:
+        transcritor = TranscritorVideos(modelo=args.modelo, idioma=args.idioma,
+                                        usar_cache=False, lote_curtos=lote_curtos)
+        # Modelo carregado antes: só a transcrição entra na medida
+        _silencioso(transcritor._carregar_modelo, args.verbose)()
+        _, medidas = medir(_silencioso(transcritor.transcrever_lote, args.verbose), pasta, saida)
+        
+        textos = {}
+        for txt in Path(saida).glob('*.txt'):
+            textos[txt.stem] = txt.read_text(encoding='utf-8').strip()
+    finally:
+        shutil.rmtree(saida, ignore_errors=True)
+    
+    return {
+        'parede_s': round(medidas['parede_s'], 3),
+        'cpu_s': round(medidas['cpu_s'], 3),
+        'pico_rss_mb': round(medidas['pico_rss_mb'], 1),
+        'arquivos_por_minuto': round(60 * len(textos) / medidas['parede_s'], 2),
+    }, textos
+
+
+def executar(args):
+    """Prepara a pasta de entrada, roda os dois modos e devolve o relatório"""
+    pasta = tempfile.mkdtemp(prefix='benchmark_curtos_')
+    try:
+        if args.audio:
+            for arquivo in args.audio:
+                os.symlink(os.path.abspath(arquivo), os.path.join(pasta, os.path.basename(arquivo)))
+        else:
+            print(f"🎛️  Sem --audio: gerando {args.arquivos} arquivos sintéticos de {args.duracao}s...")
+            sinais = list(SINAIS.items())
+            for i in range(args.arquivos):
+                nome, sinal = sinais[i % len(sinais)]
+                gerar_video(f"{nome}_{i:04d}", sinal, args.duracao, pasta)
+        
+        processador = PreProcessadorVideo(usar_indice=False)
+        arquivos = sorted(str(a) for a in Path(pasta).iterdir())
+        duracao_audio = sum(len(processador.carregar_audio(a)) / 16000 for a in arquivos)
+        
+        modos = {}
+        textos = {}
+        for nome, lote_curtos in (('laco', 0), ('lote', args.lote)):
+            print(f"⏱️  Transcrevendo ({nome})...")
+            modos[nome], textos[nome] = medir_modo(args, pasta, lote_curtos)
+    finally:
+        shutil.rmtree(pasta, ignore_errors=True)
+    
+    wer = {nome: round(taxa_erro_palavras(texto, textos['lote'].get(nome, '')), 4)
+           for nome, texto in textos['laco'].items()}
+    
+    return {
+        'versao': _versao_git(),
+        'data': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'maquina': {
+            'sistema': platform.platform(),
+            'processador': platform.processor() or platform.machine(),
+            'cpus': os.cpu_count(),
+            'python': platform.python_version(),
+        },
+        'config': {
+            'modelo': args.modelo,
+            'idioma': args.idioma,
+            'lote': args.lote,
+            'arquivos': len(arquivos),
+            'duracao_audio_s': round(duracao_audio, 1),
+        },
+        'modos': modos,
+        'wer_lote': wer,
+        'resumo': {
+            'ganho_velocidade': round(modos['laco']['parede_s'] / modos['lote']['parede_s'], 2),
+            'wer_medio': round(sum(wer.values()) / len(wer), 4) if wer else None,
+        },
+    }
+
+
+def main():
+    """Função principal - interface CLI"""
+    
+    parser = argparse.ArgumentParser(
+        description='📦 Benchmark do modo em lote para arquivos curtos (--lote-curtos)',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Exemplos de uso:
+  
+  # 64 arquivos sintéticos de 15s, 16 por passada do modelo
+  python benchmarks/benchmark_curtos.py --arquivos 64 --lote 16
+  
+  # Mensagens de voz reais (recomendado para o WER)
+  python benchmarks/benchmark_curtos.py -m small --audio notas/*.ogg --saida curtos.json
+        """
+    )
+    
+    parser.add_argument('--modelo', '-m', default='tiny',
+                        choices=list(TranscritorVideos.MODELOS_DISPONIVEIS),
+                        help='Modelo Whisper (padrão: tiny)')
+    parser.add_argument('--idioma', '-l', default='pt',
+                        help='Código do idioma (padrão: pt)')
+    parser.add_argument('--audio', '-a', nargs='+',
+                        help='Arquivos curtos de amostra (padrão: sinais sintéticos)')
+    parser.add_argument('--arquivos', type=int, default=32,
+                        help='Quantidade de arquivos sintéticos (padrão: 32)')
+    parser.add_argument('--duracao', type=int, default=15,
+                        help='Duração dos arquivos sintéticos em segundos (padrão: 15)')
+    parser.add_argument('--lote', '-b', type=int, default=16,
+                        help='Janelas por passada no modo em lote (padrão: 16)')
+    parser.add_argument('--saida', '-o',
+                        help='Arquivo JSON para guardar os resultados')
+    parser.add_argument('--verbose', '-v', action='store_true',
+                        help='Mostra a saída de cada etapa')
+    
+    args = parser.parse_args()
+    
+    if not PreProcessadorVideo.verificar_ffmpeg():
+        sys.exit(2)
+    
+    relatorio = executar(args)
+    
+    print(f"\n{'='*60}")
+    print(f"📦 Modelo '{args.modelo}': {relatorio['config']['arquivos']} arquivos, "
+          f"{relatorio['config']['duracao_audio_s']:.0f}s de áudio")
+    print(f"{'='*60}")
+    print(f"{'Modo':<8}{'Parede (s)':>12}{'CPU (s)':>10}{'Arquivos/min':>14}{'Pico RSS (MB)':>15}")
+    for nome, medidas in relatorio['modos'].items():
+        print(f"{nome:<8}{medidas['parede_s']:>12.2f}{medidas['cpu_s']:>10.2f}"
+              f"{medidas['arquivos_por_minuto']:>14.1f}{medidas['pico_rss_mb']:>15.1f}")
+    
+    resumo = relatorio['resumo']
+    print(f"\n🚀 Ganho de velocidade: {resumo['ganho_velocidade']}x")
+    if resumo['wer_medio'] is not None:
+        print(f"📝 WER médio do lote (referência: laço): {resumo['wer_medio']:.1%}")
+    if not args.audio:
+        print("⚠️  Sinais sintéticos não têm fala: use --audio para um WER representativo")
+    
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as f:
+            json.dump(relatorio, f, ensure_ascii=False, indent=2)
+        print(f"✅ Resultados salvos: {args.saida}")
+
+
+if __name__ == '__main__':
+    main()
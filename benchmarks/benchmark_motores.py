@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+⚙️ Benchmark dos Motores de Inferência
+Autor: Diego Sottani
+
+Transcreve os mesmos arquivos com o motor padrão (openai-whisper) e com o
+faster-whisper (CTranslate2) e compara velocidade, memória e resultado:
+- Tempo de carga e de transcrição, fator de tempo real e ganho de velocidade
+- Pico de memória (RSS) de cada motor
+- Taxa de erro de palavras (WER) do faster-whisper tomando o padrão como
+  referência, número de segmentos e diferença média dos tempos de início
+
+Uso:
+    python benchmarks/benchmark_motores.py --modelo small --audio amostra.wav
+    python benchmarks/benchmark_motores.py --quantizar --saida motores.json --limite-wer 0.05
+"""
+
+import gc
+import os
+import sys
+import json
+import shutil
+import platform
+import argparse
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+# Permite rodar a partir de qualquer pasta
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RAIZ))
+
+from benchmark_pipeline import SINAIS, gerar_video, medir, _silencioso, _versao_git
+from benchmark_quantizacao import taxa_erro_palavras
+from motores_inferencia import MotorWhisper, MotorFasterWhisper
+from preprocessar_videos import PreProcessadorVideo
+from transcrever import TranscritorVideos
+
+
+def medir_motor(args, arquivos, motor, modelo):
+    """
+    Carrega o modelo no motor indicado e transcreve todos os arquivos
+    
+    Returns:
+        tuple: (medidas do motor, {arquivo: resultado})
+    """
+    transcritor = TranscritorVideos(modelo=modelo, idioma=args.idioma, usar_cache=False,
+                                    quantizar=args.quantizar, threads=args.threads,
+                                    motor=motor)
+    _, carga = medir(_silencioso(transcritor._carregar_modelo, args.verbose), False)
+    
+    resultados = {}
+    tempo = 0.0
+    pico = carga['pico_rss_mb']
+    for arquivo in arquivos:
+        result, medidas = medir(_silencioso(transcritor.transcrever, args.verbose), arquivo)
+        resultados[arquivo] = result or {'text': '', 'segments': []}
+        tempo += medidas['parede_s']
+        pico = max(pico, medidas['pico_rss_mb'])
+    
+    medidas_motor = {
+        'modelo': modelo,
+        'carga_s': round(carga['parede_s'], 3),
+        'transcricao_s': round(tempo, 3),
+        'pico_rss_mb': round(pico, 1),
+    }
+    
+    # Libera o modelo antes do próximo motor para não somar na memória
+    transcritor.model = None
+    transcritor.motor_inferencia.descarregar(modelo)
+    del transcritor
+    gc.collect()
+    return medidas_motor, resultados
+
+
+def comparar_resultados(referencia, hipotese):
+    """
+    Compara o resultado de um arquivo nos dois motores
+    
+    Returns:
+        dict: wer, segmentos de cada motor e diferença média dos inícios
+            dos segmentos (em pares, na ordem)
+    """
+    pares = list(zip(referencia['segments'], hipotese['segments']))
+    diferenca = (sum(abs(a['start'] - b['start']) for a, b in pares) / len(pares)
+                 if pares else 0.0)
+    return {
+        'wer': round(taxa_erro_palavras(referencia['text'], hipotese['text']), 4),
+        'segmentos': [len(referencia['segments']), len(hipotese['segments'])],
+        'diferenca_inicio_s': round(diferenca, 3),
+    }
+
+
+def executar(args):
+    """Roda os dois motores e devolve o relatório"""
+    pasta = None
+    arquivos = args.audio
+    if not arquivos:
+        pasta = tempfile.mkdtemp(prefix='benchmark_motores_')
+        print(f"🎛️  Sem --audio: gerando {len(SINAIS)} arquivos sintéticos de {args.duracao}s...")
+        arquivos = [gerar_video(nome, sinal, args.duracao, pasta)
+                    for nome, sinal in SINAIS.items()]
+    
+    try:
+        processador = PreProcessadorVideo()
+        duracao_audio = sum(len(processador.carregar_audio(a)) / 16000 for a in arquivos)
+        
+        motores = {}
+        resultados = {}
+        for motor, modelo in ((MotorWhisper.NOME, args.modelo),
+                              (MotorFasterWhisper.NOME, args.modelo_faster or args.modelo)):
+            print(f"⏱️  Transcrevendo com o motor {motor}...")
+            motores[motor], resultados[motor] = medir_motor(args, arquivos, motor, modelo)
+            motores[motor]['fator_tempo_real'] = round(
+                motores[motor]['transcricao_s'] / duracao_audio, 4)
+    finally:
+        if pasta:
+            shutil.rmtree(pasta, ignore_errors=True)
+    
+    paridade = {os.path.basename(a): comparar_resultados(resultados[MotorWhisper.NOME][a],
+                                                         resultados[MotorFasterWhisper.NOME][a])
+                for a in arquivos}
+    padrao, faster = motores[MotorWhisper.NOME], motores[MotorFasterWhisper.NOME]
+    
+    return {
+        'versao': _versao_git(),
+        'data': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'maquina': {
+            'sistema': platform.platform(),
+            'processador': platform.processor() or platform.machine(),
+            'cpus': os.cpu_count(),
+            'python': platform.python_version(),
+        },
+        'config': {
+            'modelo': args.modelo,
+            'idioma': args.idioma,
+            'quantizar': args.quantizar,
+            'threads': args.threads,
+            'arquivos': [os.path.basename(a) for a in arquivos],
+            'duracao_audio_s': round(duracao_audio, 1),
+        },
+        'motores': motores,
+        'paridade': paridade,
+        'resumo': {
+            'ganho_velocidade': round(padrao['transcricao_s'] / faster['transcricao_s'], 2),
+            'reducao_pico_rss': round(1 - faster['pico_rss_mb'] / padrao['pico_rss_mb'], 3),
+            'wer_medio': round(sum(p['wer'] for p in paridade.values()) / len(paridade), 4),
+        },
+    }
+
+
+def main():
+    """Função principal - interface CLI"""
+    
+    parser = argparse.ArgumentParser(
+        description='⚙️ Benchmark do motor faster-whisper contra o openai-whisper',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Exemplos de uso:
+  
+  # Comparar o modelo small em gravações reais (recomendado para o WER)
+  python benchmarks/benchmark_motores.py --modelo small --audio aula1.mp3 aula2.mp3
+  
+  # Os dois motores em int8, 4 threads
+  python benchmarks/benchmark_motores.py --audio amostra.wav --quantizar --threads 4
+  
+  # Modelo já convertido para o CTranslate2 (sem baixar do Hugging Face)
+  python benchmarks/benchmark_motores.py --audio amostra.wav --modelo-faster modelos/base-ct2
+        """
+    )
+    
+    parser.add_argument('--modelo', '-m', default='base',
+                        choices=list(TranscritorVideos.MODELOS_DISPONIVEIS),
+                        help='Modelo Whisper (padrão: base)')
+    parser.add_argument('--modelo-faster',
+                        help='Nome ou pasta do modelo no faster-whisper (padrão: o de --modelo)')
+    parser.add_argument('--idioma', '-l', default='pt',
+                        help='Código do idioma (padrão: pt)')
+    parser.add_argument('--audio', '-a', nargs='+',
+                        help='Arquivos de amostra (padrão: sinais sintéticos)')
+    parser.add_argument('--duracao', type=int, default=60,
+                        help='Duração dos arquivos sintéticos em segundos (padrão: 60)')
+    parser.add_argument('--quantizar', action='store_true',
+                        help='int8 nos dois motores')
+    parser.add_argument('--threads', '-t', type=int,
+                        help='Threads de cada motor (padrão: da biblioteca)')
+    parser.add_argument('--saida', '-o',
+                        help='Arquivo JSON para guardar os resultados')
+    parser.add_argument('--limite-wer', type=float,
+                        help='WER médio máximo do faster-whisper; acima disso sai com código 1')
+    parser.add_argument('--verbose', '-v', action='store_true',
+                        help='Mostra a saída de cada etapa')
+    
+    args = parser.parse_args()
+    
+    if not PreProcessadorVideo.verificar_ffmpeg():
+        sys.exit(2)
+    
+    relatorio = executar(args)
+    
+    print(f"\n{'='*60}")
+    print(f"⚙️  Modelo '{args.modelo}'{' int8' if args.quantizar else ''}: "
+          f"{MotorWhisper.NOME} x {MotorFasterWhisper.NOME}")
+    print(f"{'='*60}")
+    print(f"{'Motor':<16}{'Carga (s)':>11}{'Transcr. (s)':>14}{'RTF':>8}{'Pico RSS (MB)':>15}")
+    for nome, medidas in relatorio['motores'].items():
+        print(f"{nome:<16}{medidas['carga_s']:>11.2f}{medidas['transcricao_s']:>14.2f}"
+              f"{medidas['fator_tempo_real']:>8.3f}{medidas['pico_rss_mb']:>15.1f}")
+    
+    print(f"\n📝 Paridade do {MotorFasterWhisper.NOME} (referência: {MotorWhisper.NOME})")
+    for arquivo, paridade in relatorio['paridade'].items():
+        print(f"   {arquivo}: WER {paridade['wer']:.1%} | segmentos "
+              f"{paridade['segmentos'][0]} x {paridade['segmentos'][1]} | "
+              f"início ±{paridade['diferenca_inicio_s']:.2f}s")
+    
+    resumo = relatorio['resumo']
+    print(f"\n🚀 Ganho de velocidade: {resumo['ganho_velocidade']}x")
+    print(f"🧠 Pico de memória: {resumo['reducao_pico_rss']:+.0%} (redução)")
+    print(f"📝 WER médio: {resumo['wer_medio']:.1%}")
+    if not args.audio:
+        print("⚠️  Sinais sintéticos não têm fala: use --audio para um WER representativo")
+    
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as f:
+            json.dump(relatorio, f, ensure_ascii=False, indent=2)
+        print(f"✅ Resultados salvos: {args.saida}")
+    
+    if args.limite_wer is not None:
+        if resumo['wer_medio'] > args.limite_wer:
+            print(f"\n❌ WER médio acima de {args.limite_wer:.0%}")
+            sys.exit(1)
+        print(f"\n✅ WER médio dentro de {args.limite_wer:.0%}")
+
+
+if __name__ == '__main__':
+    main()
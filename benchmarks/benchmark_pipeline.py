@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+⏱️ Benchmark do Pipeline de Transcrição
+Autor: Diego Sottani
+
+Gera áudio/vídeo sintético com FFmpeg (lavfi) e mede cada etapa do pipeline:
+ffprobe, extração, limpeza, divisão, decodificação, carga do modelo,
+transcrição e gravação das saídas.
+
+Uso:
+    python benchmarks/benchmark_pipeline.py --saida resultados.json
+    python benchmarks/benchmark_pipeline.py --comparar base.json --limite 0.10
+"""
+
+import os
+import io
+import sys
+import json
+import shutil
+import platform
+import argparse
+import statistics
+import subprocess
+import tempfile
+from contextlib import redirect_stdout
+from datetime import datetime
+from pathlib import Path
+
+# Permite rodar a partir de qualquer pasta
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RAIZ))
+
+from instrumentacao import MedidorEtapas
+from preprocessar_videos import PreProcessadorVideo
+from transcrever import TranscritorVideos
+
+
+# Sinais de teste gerados localmente (nada é baixado)
+SINAIS = {
+    'tom': "sine=frequency=440:sample_rate=16000",
+    'ruido': "anoisesrc=color=pink:amplitude=0.3:sample_rate=16000",
+    # Portadora com variação de tom, envelope silábico (~4 Hz) e pausas
+    'fala_sintetica': (
+        "aevalsrc='0.5*sin(2*PI*(150+50*sin(2*PI*0.5*t))*t)"
+        "*(0.5+0.5*sin(2*PI*4*t))*lt(mod(t\\,6)\\,4.5)':s=16000"
+    ),
+}
+
+
+def gerar_video(nome, sinal, duracao, pasta):
+    """Gera um MP4 pequeno (vídeo de teste + áudio sintético)"""
+    caminho = os.path.join(pasta, f"{nome}.mp4")
+    cmd = [
+        'ffmpeg', '-loglevel', 'error', '-y',
+        '-f', 'lavfi', '-i', f"testsrc2=size=320x240:rate=10:duration={duracao}",
+        '-f', 'lavfi', '-i', f"{sinal}:d={duracao}",
+        '-c:v', 'libx264', '-preset', 'ultrafast',
+        '-c:a', 'aac',
+        '-shortest',
+        caminho
+    ]
+    subprocess.run(cmd, check=True)
+    return caminho
+
+
+def medir(funcao, *args, **kwargs):
+    """
+    Executa uma etapa medindo tempo de parede, CPU e pico de memória
+    
+    Returns:
+        tuple: (retorno da função, dicionário de medidas)
+    """
+    medidor = MedidorEtapas()
+    with medidor.etapa('etapa'):
+        retorno = funcao(*args, **kwargs)
+    return retorno, medidor.etapas['etapa']
+
+
+def _silencioso(funcao, verbose):
+    """Esconde a saída das etapas (a menos que --verbose)"""
+    if verbose:
+        return funcao
+    
+    def envolvida(*args, **kwargs):
+        with redirect_stdout(io.StringIO()):
+            return funcao(*args, **kwargs)
+    return envolvida
+
+
+def executar(args):
+    """Roda todas as etapas e devolve o relatório"""
+    pasta = tempfile.mkdtemp(prefix='benchmark_transcricao_')
+    # Sem o índice de metadados: a etapa ffprobe mede a chamada real
+    processador = PreProcessadorVideo(usar_indice=False)
+    etapas = {}
+    
+    def registrar(etapa, medidas):
+        etapas.setdefault(etapa, []).append(medidas)
+    
+    try:
+        print(f"🎛️  Gerando {len(SINAIS)} arquivos sintéticos de {args.duracao}s...")
+        videos = [gerar_video(nome, sinal, args.duracao, pasta)
+                  for nome, sinal in SINAIS.items()]
+        
+        transcritor = TranscritorVideos(modelo=args.modelo, idioma=args.idioma,
+                                        usar_cache=False)
+        # Fora do registro do processo: mede a carga de verdade
+        _, medidas = medir(_silencioso(transcritor._carregar_modelo, args.verbose), False)
+        registrar('carregar_modelo', medidas)
+        
+        duracao_audio = 0.0
+        for repeticao in range(args.repeticoes):
+            for video in videos:
+                print(f"⏱️  Rodada {repeticao + 1}/{args.repeticoes}: {os.path.basename(video)}")
+                nome = Path(video).stem
+                saida = os.path.join(pasta, f"rodada_{repeticao}")
+                
+                info, medidas = medir(_silencioso(processador.obter_info_video, args.verbose), video)
+                registrar('ffprobe', medidas)
+                
+                _, medidas = medir(_silencioso(processador.extrair_audio, args.verbose),
+                                   video, os.path.join(saida, 'audio'))
+                registrar('extrair', medidas)
+                wav = os.path.join(saida, 'audio', f"{nome}.wav")
+                
+                _, medidas = medir(_silencioso(processador.limpar_audio, args.verbose),
+                                   wav, os.path.join(saida, 'limpo'))
+                registrar('limpar', medidas)
+                
+                _, medidas = medir(_silencioso(processador.dividir_video, args.verbose),
+                                   video, os.path.join(saida, 'partes'), args.chunk)
+                registrar('dividir', medidas)
+                
+                audio, medidas = medir(processador.carregar_audio, video)
+                registrar('decodificar', medidas)
+                duracao_audio += len(audio) / 16000
+                
+                result, medidas = medir(_silencioso(transcritor.transcrever, args.verbose), video)
+                registrar('transcrever', medidas)
+                
+                _, medidas = medir(_silencioso(transcritor.salvar_resultados, args.verbose),
+                                   video, result, os.path.join(saida, 'transcricoes'))
+                registrar('escrever_saidas', medidas)
+    finally:
+        shutil.rmtree(pasta, ignore_errors=True)
+    
+    # Mediana de cada medida por etapa
+    resumo_etapas = {
+        etapa: {chave: round(statistics.median(m[chave] for m in medidas), 4)
+                for chave in medidas[0]}
+        for etapa, medidas in etapas.items()
+    }
+    
+    # Pipeline por arquivo: tudo exceto a carga do modelo (feita uma vez)
+    n_execucoes = len(SINAIS) * args.repeticoes
+    tempo_arquivos = sum(m['parede_s'] for etapa, medidas in etapas.items()
+                         if etapa != 'carregar_modelo' for m in medidas)
+    tempo_transcricao = sum(m['parede_s'] for m in etapas['transcrever'])
+    
+    return {
+        'versao': _versao_git(),
+        'data': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'maquina': {
+            'sistema': platform.platform(),
+            'processador': platform.processor() or platform.machine(),
+            'cpus': os.cpu_count(),
+            'python': platform.python_version(),
+        },
+        'config': {
+            'modelo': args.modelo,
+            'duracao_s': args.duracao,
+            'chunk_minutos': args.chunk,
+            'repeticoes': args.repeticoes,
+            'arquivos': list(SINAIS),
+        },
+        'etapas': resumo_etapas,
+        'resumo': {
+            'fator_tempo_real_transcricao': round(tempo_transcricao / duracao_audio, 4),
+            'fator_tempo_real_pipeline': round(tempo_arquivos / duracao_audio, 4),
+            'arquivos_por_hora': round(3600 * n_execucoes / tempo_arquivos, 1),
+            'pico_rss_mb': max(m['pico_rss_mb'] for m in resumo_etapas.values()),
+        },
+    }
+
+
+def _versao_git():
+    """Commit atual, para comparar rodadas entre versões"""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=RAIZ,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return None
+
+
+def comparar(atual, base, limite):
+    """
+    Compara o tempo de parede de cada etapa com uma rodada anterior
+    
+    Uma etapa regrediu se ficou mais que `limite` (fração) mais lenta e a
+    diferença passa de 50 ms (abaixo disso é ruído de medição).
+    
+    Returns:
+        list: Nomes das etapas que regrediram
+    """
+    print(f"\n{'='*60}")
+    print(f"📊 Comparação com {base.get('versao')} ({base.get('data')})")
+    print(f"{'='*60}")
+    print(f"{'Etapa':<18}{'Base (s)':>12}{'Atual (s)':>12}{'Variação':>12}")
+    
+    regressoes = []
+    for etapa, medidas in atual['etapas'].items():
+        if etapa not in base.get('etapas', {}):
+            continue
+        antes = base['etapas'][etapa]['parede_s']
+        agora = medidas['parede_s']
+        variacao = (agora - antes) / antes if antes else 0.0
+        marca = ''
+        if variacao > limite and agora - antes > 0.05:
+            regressoes.append(etapa)
+            marca = ' ❌'
+        print(f"{etapa:<18}{antes:>12.3f}{agora:>12.3f}{variacao:>+11.1%}{marca}")
+    
+    return regressoes
+
+
+def main():
+    """Função principal - interface CLI"""
+    
+    parser = argparse.ArgumentParser(
+        description='⏱️ Benchmark do pipeline de transcrição',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Exemplos de uso:
+  
+  # Medir e guardar o resultado
+  python benchmarks/benchmark_pipeline.py --saida base.json
+  
+  # Depois de uma mudança: medir e falhar se alguma etapa ficar 10% mais lenta
+  python benchmarks/benchmark_pipeline.py --saida atual.json --comparar base.json --limite 0.10
+        """
+    )
+    
+    parser.add_argument('--modelo', '-m', default='tiny',
+                        choices=list(TranscritorVideos.MODELOS_DISPONIVEIS),
+                        help='Modelo Whisper (padrão: tiny)')
+    parser.add_argument('--idioma', '-l', default='pt',
+                        help='Código do idioma (padrão: pt)')
+    parser.add_argument('--duracao', type=int, default=120,
+                        help='Duração de cada arquivo sintético em segundos (padrão: 120)')
+    parser.add_argument('--chunk', type=int, default=1,
+                        help='Duração dos chunks de "dividir" em minutos (padrão: 1)')
+    parser.add_argument('--repeticoes', '-r', type=int, default=1,
+                        help='Rodadas por arquivo; o relatório usa a mediana (padrão: 1)')
+    parser.add_argument('--saida', '-o',
+                        help='Arquivo JSON para guardar os resultados')
+    parser.add_argument('--comparar', '-c',
+                        help='JSON de uma rodada anterior para comparar')
+    parser.add_argument('--limite', type=float, default=0.10,
+                        help='Fração de piora tolerada por etapa (padrão: 0.10)')
+    parser.add_argument('--verbose', '-v', action='store_true',
+                        help='Mostra a saída de cada etapa')
+    
+    args = parser.parse_args()
+    
+    if not PreProcessadorVideo.verificar_ffmpeg():
+        sys.exit(2)
+    
+    relatorio = executar(args)
+    
+    print(f"\n{'='*60}")
+    print(f"⏱️  Resultados (mediana por etapa)")
+    print(f"{'='*60}")
+    print(f"{'Etapa':<18}{'Parede (s)':>12}{'CPU (s)':>12}{'Pico RSS (MB)':>15}")
+    for etapa, medidas in relatorio['etapas'].items():
+        print(f"{etapa:<18}{medidas['parede_s']:>12.3f}{medidas['cpu_s']:>12.3f}"
+              f"{medidas['pico_rss_mb']:>15.1f}")
+    resumo = relatorio['resumo']
+    print(f"\n🚀 Fator de tempo real (transcrição): {resumo['fator_tempo_real_transcricao']}")
+    print(f"🚀 Fator de tempo real (pipeline): {resumo['fator_tempo_real_pipeline']}")
+    print(f"📦 Arquivos por hora: {resumo['arquivos_por_hora']}")
+    print(f"🧠 Pico de memória: {resumo['pico_rss_mb']} MB")
+    
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as f:
+            json.dump(relatorio, f, ensure_ascii=False, indent=2)
+        print(f"✅ Resultados salvos: {args.saida}")
+    
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as f:
+            base = json.load(f)
+        regressoes = comparar(relatorio, base, args.limite)
+        if regressoes:
+            print(f"\n❌ Regressão acima de {args.limite:.0%} em: {', '.join(regressoes)}")
+            sys.exit(1)
+        print(f"\n✅ Nenhuma regressão acima de {args.limite:.0%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+🗜️ Benchmark da Quantização int8
+Autor: Diego Sottani
+
+Transcreve os mesmos arquivos com o modelo original (fp32) e com o modelo
+quantizado (int8) e compara velocidade, memória e texto:
+- Tempo de carga e de transcrição, fator de tempo real e ganho de velocidade
+- Tamanho dos pesos e pico de memória (RSS) de cada variante
+- Taxa de erro de palavras (WER) do int8 tomando o fp32 como referência
+
+Uso:
+    python benchmarks/benchmark_quantizacao.py --modelo small --audio amostra.wav
+    python benchmarks/benchmark_quantizacao.py --saida quantizacao.json --limite-wer 0.05
+"""
+
+import gc
+import os
+import sys
+import json
+import shutil
+import platform
+import argparse
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+# Permite rodar a partir de qualquer pasta
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RAIZ))
+
+from benchmark_pipeline import SINAIS, gerar_video, medir, _silencioso, _versao_git
+from modelos_whisper import RegistroModelos
+from preprocessar_videos import PreProcessadorVideo
+from transcrever import TranscritorVideos
+
+
+def taxa_erro_palavras(referencia, hipotese):
+    """
+    WER: distância de edição entre as palavras, dividida pelo tamanho da referência
+    
+    Returns:
+        float: 0.0 para textos iguais (ignorando maiúsculas e pontuação)
+    """
+    def palavras(texto):
+        return [p.strip('.,;:!?"\'()').lower() for p in texto.split() if p.strip('.,;:!?"\'()')]
+    
+    ref, hip = palavras(referencia), palavras(hipotese)
+    if not ref:
+        return 0.0 if not hip else 1.0
+    
+    # Programação dinâmica guardando só a linha anterior
+    anterior = list(range(len(hip) + 1))
+    for i, palavra in enumerate(ref, 1):
+        atual = [i]
+        for j, outra in enumerate(hip, 1):
+            atual.append(min(anterior[j] + 1, atual[j - 1] + 1,
+                             anterior[j - 1] + (palavra != outra)))
+        anterior = atual
+    return anterior[-1] / len(ref)
+
+
+def medir_variante(args, arquivos, quantizar):
+    """
+    Carrega o modelo (fp32 ou int8) e transcreve todos os arquivos
+    
+    Returns:
+        tuple: (medidas da variante, {arquivo: texto})
+    """
+    transcritor = TranscritorVideos(modelo=args.modelo, idioma=args.idioma,
+                                    usar_cache=False, quantizar=quantizar)
+    # Fora do registro do processo: cada variante paga a sua carga
+    _, carga = medir(_silencioso(transcritor._carregar_modelo, args.verbose), False)
+    
+    textos = {}
+    tempo = 0.0
+    pico = carga['pico_rss_mb']
+    for arquivo in arquivos:
+        result, medidas = medir(_silencioso(transcritor.transcrever, args.verbose), arquivo)
+        textos[arquivo] = result['text'].strip() if result else ''
+        tempo += medidas['parede_s']
+        pico = max(pico, medidas['pico_rss_mb'])
+    
+    variante = {
+        'carga_s': round(carga['parede_s'], 3),
+        'pesos_mb': round(RegistroModelos.tamanho_mb(transcritor.model), 1),
+        'transcricao_s': round(tempo, 3),
+        'pico_rss_mb': round(pico, 1),
+    }
+    
+    # Libera o modelo antes da próxima variante para não somar na memória
+    transcritor.model = None
+    del transcritor
+    gc.collect()
+    return variante, textos
+
+
+def executar(args):
+    """Roda as duas variantes e devolve o relatório"""
+    pasta = None
+    arquivos = args.audio
+    if not arquivos:
+        pasta = tempfile.mkdtemp(prefix='benchmark_quantizacao_')
+        print(f"🎛️  Sem --audio: gerando {len(SINAIS)} arquivos sintéticos de {args.duracao}s...")
+        arquivos = [gerar_video(nome, sinal, args.duracao, pasta)
+                    for nome, sinal in SINAIS.items()]
+    
+    try:
+        processador = PreProcessadorVideo()
+        duracao_audio = sum(len(processador.carregar_audio(a)) / 16000 for a in arquivos)
+        
+        variantes = {}
+        textos = {}
+        for nome, quantizar in (('fp32', False), ('int8', True)):
+            print(f"⏱️  Transcrevendo com o modelo {nome}...")
+            variantes[nome], textos[nome] = medir_variante(args, arquivos, quantizar)
+            variantes[nome]['fator_tempo_real'] = round(
+                variantes[nome]['transcricao_s'] / duracao_audio, 4)
+    finally:
+        if pasta:
+            shutil.rmtree(pasta, ignore_errors=True)
+    
+    wer = {os.path.basename(a): round(taxa_erro_palavras(textos['fp32'][a], textos['int8'][a]), 4)
+           for a in arquivos}
+    fp32, int8 = variantes['fp32'], variantes['int8']
+    
+    return {
+        'versao': _versao_git(),
+        'data': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'maquina': {
+            'sistema': platform.platform(),
+            'processador': platform.processor() or platform.machine(),
+            'cpus': os.cpu_count(),
+            'python': platform.python_version(),
+        },
+        'config': {
+            'modelo': args.modelo,
+            'idioma': args.idioma,
+            'arquivos': [os.path.basename(a) for a in arquivos],
+            'duracao_audio_s': round(duracao_audio, 1),
+        },
+        'variantes': variantes,
+        'wer_int8': wer,
+        'resumo': {
+            'ganho_velocidade': round(fp32['transcricao_s'] / int8['transcricao_s'], 2),
+            'reducao_pesos': round(1 - int8['pesos_mb'] / fp32['pesos_mb'], 3),
+            'reducao_pico_rss': round(1 - int8['pico_rss_mb'] / fp32['pico_rss_mb'], 3),
+            'wer_medio': round(sum(wer.values()) / len(wer), 4),
+        },
+    }
+
+
+def main():
+    """Função principal - interface CLI"""
+    
+    parser = argparse.ArgumentParser(
+        description='🗜️ Benchmark do modelo quantizado (int8) contra o original (fp32)',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Exemplos de uso:
+  
+  # Comparar o modelo small em gravações reais (recomendado para o WER)
+  python benchmarks/benchmark_quantizacao.py --modelo small --audio aula1.mp3 aula2.mp3
+  
+  # Falhar se o texto do int8 divergir mais de 5% do fp32
+  python benchmarks/benchmark_quantizacao.py --audio amostra.wav --limite-wer 0.05
+        """
+    )
+    
+    parser.add_argument('--modelo', '-m', default='base',
+                        choices=list(TranscritorVideos.MODELOS_DISPONIVEIS),
+                        help='Modelo Whisper (padrão: base)')
+    parser.add_argument('--idioma', '-l', default='pt',
+                        help='Código do idioma (padrão: pt)')
+    parser.add_argument('--audio', '-a', nargs='+',
+                        help='Arquivos de amostra (padrão: sinais sintéticos)')
+    parser.add_argument('--duracao', type=int, default=60,
+                        help='Duração dos arquivos sintéticos em segundos (padrão: 60)')
+    parser.add_argument('--saida', '-o',
+                        help='Arquivo JSON para guardar os resultados')
+    parser.add_argument('--limite-wer', type=float,
+                        help='WER médio máximo do int8; acima disso sai com código 1')
+    parser.add_argument('--verbose', '-v', action='store_true',
+                        help='Mostra a saída de cada etapa')
+    
+    args = parser.parse_args()
+    
+    if not PreProcessadorVideo.verificar_ffmpeg():
+        sys.exit(2)
+    
+    relatorio = executar(args)
+    
+    print(f"\n{'='*60}")
+    print(f"🗜️  Modelo '{args.modelo}': fp32 x int8")
+    print(f"{'='*60}")
+    print(f"{'Variante':<10}{'Carga (s)':>11}{'Pesos (MB)':>12}{'Transcr. (s)':>14}"
+          f"{'RTF':>8}{'Pico RSS (MB)':>15}")
+    for nome, medidas in relatorio['variantes'].items():
+        print(f"{nome:<10}{medidas['carga_s']:>11.2f}{medidas['pesos_mb']:>12.1f}"
+              f"{medidas['transcricao_s']:>14.2f}{medidas['fator_tempo_real']:>8.3f}"
+              f"{medidas['pico_rss_mb']:>15.1f}")
+    
+    print(f"\n📝 WER do int8 (referência: fp32)")
+    for arquivo, wer in relatorio['wer_int8'].items():
+        print(f"   {arquivo}: {wer:.1%}")
+    
+    resumo = relatorio['resumo']
+    print(f"\n🚀 Ganho de velocidade: {resumo['ganho_velocidade']}x")
+    print(f"🧠 Pesos: {resumo['reducao_pesos']:+.0%} | "
+          f"pico de memória: {resumo['reducao_pico_rss']:+.0%} (redução)")
+    print(f"📝 WER médio: {resumo['wer_medio']:.1%}")
+    if not args.audio:
+        print("⚠️  Sinais sintéticos não têm fala: use --audio para um WER representativo")
+    
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as f:
+            json.dump(relatorio, f, ensure_ascii=False, indent=2)
+        print(f"✅ Resultados salvos: {args.saida}")
+    
+    if args.limite_wer is not None:
+        if resumo['wer_medio'] > args.limite_wer:
+            print(f"\n❌ WER médio acima de {args.limite_wer:.0%}")
+            sys.exit(1)
+        print(f"\n✅ WER médio dentro de {args.limite_wer:.0%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+🔎 Busca nas Transcrições
+Autor: Diego Sottani
+
+Índice de texto completo (SQLite FTS5) dos segmentos das transcrições:
+- Um índice por pasta de saída, montado a partir dos .json
+- Atualização incremental: só .json novos ou alterados são lidos
+- Resultados ordenados por relevância, com arquivo e timestamp de cada trecho
+
+Uso:
+    python transcrever.py buscar "orçamento anual" --output output/
+"""
+
+import os
+import json
+import sqlite3
+import argparse
+from contextlib import closing
+from datetime import datetime
+from pathlib import Path
+
+
+class IndiceBusca:
+    """Classe para indexar e buscar os segmentos das transcrições de uma pasta"""
+    
+    NOME_ARQUIVO = '.indice_busca.sqlite'
+    
+    def __init__(self, output_dir):
+        """
+        Abre (ou cria) o índice de uma pasta de saída
+        
+        Args:
+            output_dir: Diretório onde ficam as transcrições (.json)
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        self.output_dir = output_dir
+        self.caminho = os.path.join(output_dir, self.NOME_ARQUIVO)
+        
+        with closing(self._conectar()) as conexao, conexao:
+            conexao.executescript("""
+                CREATE TABLE IF NOT EXISTS arquivos (
+                    id INTEGER PRIMARY KEY,
+                    json TEXT UNIQUE,
+                    origem TEXT,
+                    tamanho INTEGER,
+                    mtime_ns INTEGER,
+                    indexado_em TEXT
+                );
+                CREATE TABLE IF NOT EXISTS segmentos (
+                    id INTEGER PRIMARY KEY,
+                    arquivo_id INTEGER,
+                    inicio REAL,
+                    fim REAL
+                );
+                CREATE INDEX IF NOT EXISTS segmentos_arquivo ON segmentos (arquivo_id);
+                -- rowid de textos = id de segmentos; sem acentos na busca
+                CREATE VIRTUAL TABLE IF NOT EXISTS textos
+                    USING fts5(texto, tokenize = 'unicode61 remove_diacritics 2');
+            """)
+    
+    def _conectar(self):
+        """Abre uma conexão com o índice"""
+        conexao = sqlite3.connect(self.caminho, timeout=30)
+        conexao.execute('PRAGMA journal_mode=WAL')
+        return conexao
+    
+    def atualizar(self):
+        """
+        Indexa os .json novos ou alterados e remove os que sumiram
+        
+        Arquivos com mesmo tamanho e data de modificação do último índice
+        não são lidos de novo.
+        
+        Returns:
+            tuple: (arquivos indexados, arquivos removidos do índice)
+        """
+        no_disco = {}
+        for caminho in Path(self.output_dir).glob('*.json'):
+            stat = caminho.stat()
+            no_disco[caminho.name] = (stat.st_size, stat.st_mtime_ns)
+        
+        indexados = 0
+        with closing(self._conectar()) as conexao:
+            conhecidos = {
+                nome: (tamanho, mtime_ns)
+                for nome, tamanho, mtime_ns in conexao.execute(
+                    "SELECT json, tamanho, mtime_ns FROM arquivos")
+            }
+            
+            # Um arquivo por transação: uma interrupção não perde o que já foi feito
+            for nome in sorted(set(conhecidos) - set(no_disco)):
+                with conexao:
+                    self._remover(conexao, nome)
+            
+            for nome, estado in sorted(no_disco.items()):
+                if conhecidos.get(nome) == estado:
+                    continue
+                with conexao:
+                    self._remover(conexao, nome)
+                    self._indexar(conexao, nome, estado)
+                indexados += 1
+        
+        return indexados, len(set(conhecidos) - set(no_disco))
+    
+    def _remover(self, conexao, nome):
+        """Apaga do índice os segmentos de um .json"""
+        linha = conexao.execute("SELECT id FROM arquivos WHERE json = ?", (nome,)).fetchone()
+        if not linha:
+            return
+        conexao.execute(
+            "DELETE FROM textos WHERE rowid IN (SELECT id FROM segmentos WHERE arquivo_id = ?)",
+            linha
+        )
+        conexao.execute("DELETE FROM segmentos WHERE arquivo_id = ?", linha)
+        conexao.execute("DELETE FROM arquivos WHERE id = ?", linha)
+    
+    def _indexar(self, conexao, nome, estado):
+        """
+        Lê os segmentos de um .json e grava no índice
+        
+        .json que não são transcrições (sem 'segmentos') ou que estão
+        malformados ficam registrados sem segmentos, para não serem lidos
+        de novo nem interromperem a atualização do índice.
+        """
+        try:
+            with open(os.path.join(self.output_dir, nome), encoding='utf-8') as f:
+                dados = json.load(f)
+        except (OSError, ValueError):
+            dados = None
+        
+        segmentos = []
+        origem = None
+        if isinstance(dados, dict) and isinstance(dados.get('segmentos'), list):
+            metadados = dados.get('metadados') or {}
+            if isinstance(metadados, dict) and isinstance(metadados.get('arquivo'), str):
+                origem = metadados['arquivo']
+            try:
+                segmentos = [(float(segmento['start']), float(segmento['end']),
+                              segmento['text'].strip())
+                             for segmento in dados['segmentos']]
+            except (KeyError, TypeError, ValueError, AttributeError):
+                print(f"⚠️  Segmentos malformados, ignorando: {nome}")
+                segmentos = []
+        
+        cursor = conexao.execute(
+            "INSERT INTO arquivos (json, origem, tamanho, mtime_ns, indexado_em) VALUES (?, ?, ?, ?, ?)",
+            (nome, origem, *estado, datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+        )
+        arquivo_id = cursor.lastrowid
+        
+        primeiro = conexao.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM segmentos").fetchone()[0]
+        linhas = [(primeiro + i, inicio, fim, texto)
+                  for i, (inicio, fim, texto) in enumerate(segmentos)]
+        conexao.executemany(
+            "INSERT INTO segmentos (id, arquivo_id, inicio, fim) VALUES (?, ?, ?, ?)",
+            [(id_, arquivo_id, inicio, fim) for id_, inicio, fim, _ in linhas]
+        )
+        conexao.executemany(
+            "INSERT INTO textos (rowid, texto) VALUES (?, ?)",
+            [(id_, texto) for id_, _, _, texto in linhas]
+        )
+    
+    def buscar(self, consulta, limite=20):
+        """
+        Busca trechos das transcrições
+        
+        Args:
+            consulta: Termos ou expressão FTS5 ("frase exata", termo*, A OR B,
+                NEAR(a b)); se a expressão for inválida, os termos são
+                buscados literalmente
+            limite: Máximo de resultados
+        
+        Returns:
+            list: Dicionários com json, origem, inicio, fim, trecho e
+                relevancia (menor = mais relevante), do mais relevante
+                para o menos
+        """
+        sql = """
+            SELECT a.json, a.origem, s.inicio, s.fim,
+                   snippet(textos, 0, '**', '**', '…', 16),
+                   bm25(textos)
+            FROM textos
+            JOIN segmentos s ON s.id = textos.rowid
+            JOIN arquivos a ON a.id = s.arquivo_id
+            WHERE textos MATCH ?
+            ORDER BY bm25(textos)
+            LIMIT ?
+        """
+        with closing(self._conectar()) as conexao:
+            try:
+                linhas = conexao.execute(sql, (consulta, limite)).fetchall()
+            except sqlite3.OperationalError:
+                # Sintaxe FTS5 inválida (aspas soltas, hífens...): termos literais
+                literal = ' '.join('"' + termo.replace('"', '""') + '"'
+                                   for termo in consulta.split())
+                linhas = conexao.execute(sql, (literal, limite)).fetchall() if literal else []
+        
+        return [
+            {
+                'json': nome,
+                'origem': origem or Path(nome).stem,
+                'inicio': inicio,
+                'fim': fim,
+                'inicio_ms': int(round(inicio * 1000)),
+                'timestamp': formatar_timestamp_ms(inicio),
+                'trecho': trecho,
+                'relevancia': round(relevancia, 4),
+            }
+            for nome, origem, inicio, fim, trecho, relevancia in linhas
+        ]
+
+
+def formatar_timestamp_ms(segundos):
+    """Converte segundos em [HH:MM:SS.mmm]"""
+    milissegundos = int(round(segundos * 1000))
+    horas, resto = divmod(milissegundos, 3600 * 1000)
+    minutos, resto = divmod(resto, 60 * 1000)
+    segundos, milissegundos = divmod(resto, 1000)
+    return f"[{horas:02d}:{minutos:02d}:{segundos:02d}.{milissegundos:03d}]"
+
+
+def main(argv=None):
+    """Função principal - interface CLI (python transcrever.py buscar ...)"""
+    
+    parser = argparse.ArgumentParser(
+        prog='transcrever.py buscar',
+        description='🔎 Busca nas transcrições de uma pasta de saída',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Exemplos de uso:
+  
+  # Termos (em qualquer ordem, sem diferenciar acentos)
+  python transcrever.py buscar orcamento anual --output output/
+  
+  # Frase exata, prefixo e alternativas (sintaxe FTS5)
+  python transcrever.py buscar '"reunião de diretoria"' --output output/
+  python transcrever.py buscar 'contrat* OR licitação' --output output/
+  
+  # Resultado em JSON (para scripts)
+  python transcrever.py buscar orcamento --output output/ --json
+        """
+    )
+    
+    parser.add_argument('consulta', nargs='+',
+                        help='Termos ou expressão FTS5')
+    parser.add_argument('--output', '-o', required=True,
+                        help='Pasta de saída com as transcrições')
+    parser.add_argument('--limite', '-n', type=int, default=20,
+                        help='Máximo de resultados (padrão: 20)')
+    parser.add_argument('--json', action='store_true',
+                        help='Imprime os resultados em JSON')
+    
+    args = parser.parse_args(argv)
+    
+    if not os.path.isdir(args.output):
+        print(f"❌ Erro: '{args.output}' não encontrado")
+        return
+    
+    indice = IndiceBusca(args.output)
+    indexados, removidos = indice.atualizar()
+    consulta = ' '.join(args.consulta)
+    resultados = indice.buscar(consulta, args.limite)
+    
+    if args.json:
+        print(json.dumps(resultados, ensure_ascii=False, indent=2))
+        return
+    
+    if indexados or removidos:
+        print(f"🗂️  Índice atualizado: {indexados} transcrições indexadas, {removidos} removidas")
+    if not resultados:
+        print(f"🔎 Nenhum resultado para: {consulta}")
+        return
+    
+    print(f"🔎 {len(resultados)} resultados para: {consulta}\n")
+    for i, resultado in enumerate(resultados, 1):
+        print(f"{i:>3}. {resultado['origem']} {resultado['timestamp']}")
+        print(f"     {resultado['trecho']}")
+
+
+if __name__ == '__main__':
+    main()
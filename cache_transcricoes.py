@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+🗃️ Cache de Transcrições por Conteúdo
+Autor: Diego Sottani
+
+Índice SQLite guardado na pasta de saída que evita transcrever de novo:
+- Arquivos sem alteração desde a última execução
+- Arquivos renomeados ou duplicados (mesmo conteúdo)
+- Gravações repetidas em outra codificação (mesmo áudio, --deduplicar)
+"""
+
+import os
+import json
+import zlib
+import hashlib
+import sqlite3
+from contextlib import closing
+from datetime import datetime
+
+import numpy as np
+
+from impressao_audio import ImpressaoAudio
+
+
+class CacheTranscricoes:
+    """Classe para guardar e reaproveitar transcrições pelo conteúdo da mídia"""
+    
+    NOME_ARQUIVO = '.cache_transcricoes.sqlite'
+    
+    # Amostragem usada no hash: N blocos espalhados pelo arquivo
+    TAMANHO_BLOCO = 64 * 1024
+    NUMERO_BLOCOS = 16
+    
+    def __init__(self, output_dir):
+        """
+        Abre (ou cria) o cache de uma pasta de saída
+        
+        Args:
+            output_dir: Diretório onde ficam as transcrições
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        self.caminho = os.path.join(output_dir, self.NOME_ARQUIVO)
+        
+        with closing(self._conectar()) as conexao, conexao:
+            conexao.executescript("""
+                CREATE TABLE IF NOT EXISTS arquivos (
+                    caminho TEXT PRIMARY KEY,
+                    tamanho INTEGER,
+                    mtime_ns INTEGER,
+                    hash TEXT
+                );
+                CREATE TABLE IF NOT EXISTS transcricoes (
+                    chave TEXT PRIMARY KEY,
+                    hash TEXT,
+                    opcoes TEXT,
+                    resultado BLOB,
+                    criado_em TEXT
+                );
+                CREATE TABLE IF NOT EXISTS saidas (
+                    json_path TEXT PRIMARY KEY,
+                    chave TEXT
+                );
+                CREATE TABLE IF NOT EXISTS impressoes (
+                    hash TEXT PRIMARY KEY,
+                    versao INTEGER,
+                    duracao REAL,
+                    impressao BLOB
+                );
+            """)
+    
+    def _conectar(self):
+        """Abre uma conexão; várias podem coexistir entre processos worker"""
+        conexao = sqlite3.connect(self.caminho, timeout=30)
+        conexao.execute('PRAGMA journal_mode=WAL')
+        return conexao
+    
+    def _calcular_hash(self, video_path, tamanho):
+        """Hash do tamanho mais blocos amostrados ao longo do arquivo"""
+        h = hashlib.blake2b(str(tamanho).encode(), digest_size=20)
+        
+        with open(video_path, 'rb') as f:
+            if tamanho <= self.TAMANHO_BLOCO * self.NUMERO_BLOCOS:
+                h.update(f.read())
+            else:
+                passo = (tamanho - self.TAMANHO_BLOCO) // (self.NUMERO_BLOCOS - 1)
+                for i in range(self.NUMERO_BLOCOS):
+                    f.seek(i * passo)
+                    h.update(f.read(self.TAMANHO_BLOCO))
+        
+        return h.hexdigest()
+    
+    def hash_arquivo(self, video_path):
+        """
+        Hash de conteúdo de um arquivo de mídia
+        
+        Se caminho, tamanho e data de modificação não mudaram desde a última
+        vez, reaproveita o hash guardado sem ler o arquivo.
+        
+        Returns:
+            str: Hash hexadecimal
+        """
+        caminho = os.path.abspath(video_path)
+        stat = os.stat(caminho)
+        
+        with closing(self._conectar()) as conexao, conexao:
+            linha = conexao.execute(
+                "SELECT hash FROM arquivos WHERE caminho = ? AND tamanho = ? AND mtime_ns = ?",
+                (caminho, stat.st_size, stat.st_mtime_ns)
+            ).fetchone()
+            if linha:
+                return linha[0]
+            
+            valor = self._calcular_hash(caminho, stat.st_size)
+            conexao.execute(
+                "INSERT OR REPLACE INTO arquivos VALUES (?, ?, ?, ?)",
+                (caminho, stat.st_size, stat.st_mtime_ns, valor)
+            )
+            return valor
+    
+    def chave(self, video_path, opcoes):
+        """
+        Chave da transcrição: conteúdo da mídia + opções que mudam o resultado
+        
+        Args:
+            video_path: Caminho do vídeo ou áudio
+            opcoes: Dicionário com modelo, idioma e pré-processamento
+        """
+        opcoes_json = json.dumps(opcoes, sort_keys=True)
+        conteudo = self.hash_arquivo(video_path)
+        return hashlib.blake2b(f"{conteudo}|{opcoes_json}".encode(),
+                               digest_size=20).hexdigest()
+    
+    def saida_em_dia(self, json_path, chave):
+        """True se .json, .md e .txt existem e o .json veio desta mesma chave"""
+        base = os.path.splitext(json_path)[0]
+        if not all(os.path.exists(base + extensao) for extensao in ('.json', '.md', '.txt')):
+            return False
+        
+        with closing(self._conectar()) as conexao:
+            linha = conexao.execute(
+                "SELECT chave FROM saidas WHERE json_path = ?",
+                (os.path.abspath(json_path),)
+            ).fetchone()
+        return linha is not None and linha[0] == chave
+    
+    def buscar(self, chave):
+        """
+        Busca o resultado do Whisper guardado para uma chave
+        
+        Returns:
+            dict: Resultado (text, segments, language) ou None
+        """
+        with closing(self._conectar()) as conexao:
+            linha = conexao.execute(
+                "SELECT resultado FROM transcricoes WHERE chave = ?",
+                (chave,)
+            ).fetchone()
+        if linha is None:
+            return None
+        return json.loads(zlib.decompress(linha[0]).decode('utf-8'))
+    
+    def salvar(self, chave, video_path, opcoes, result):
+        """Guarda o resultado de uma transcrição (text, segments, language e extras)"""
+        dados = zlib.compress(json.dumps(result, ensure_ascii=False).encode('utf-8'))
+        self.salvar_comprimido(chave, video_path, opcoes, dados)
+    
+    def salvar_comprimido(self, chave, video_path, opcoes, dados):
+        """
+        Guarda um resultado já em JSON comprimido com zlib
+        
+        Para transcrições longas montadas dos arquivos parciais
+        (EscritorTranscricao), sem o resultado inteiro em memória.
+        """
+        with closing(self._conectar()) as conexao, conexao:
+            conexao.execute(
+                "INSERT OR REPLACE INTO transcricoes VALUES (?, ?, ?, ?, ?)",
+                (chave,
+                 self.hash_arquivo(video_path),
+                 json.dumps(opcoes, sort_keys=True),
+                 dados,
+                 datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+            )
+    
+    def registrar_saida(self, json_path, chave):
+        """Registra que o .json de saída corresponde a esta chave"""
+        with closing(self._conectar()) as conexao, conexao:
+            conexao.execute(
+                "INSERT OR REPLACE INTO saidas VALUES (?, ?)",
+                (os.path.abspath(json_path), chave)
+            )
+    
+    def salvar_impressao(self, video_path, duracao, impressao):
+        """
+        Guarda a impressão do áudio de um arquivo, pelo hash do conteúdo
+        
+        Args:
+            video_path: Caminho do vídeo ou áudio
+            duracao: Duração do áudio em segundos
+            impressao: Impressão calculada por ImpressaoAudio
+        """
+        conteudo = self.hash_arquivo(video_path)
+        with closing(self._conectar()) as conexao, conexao:
+            conexao.execute(
+                "INSERT OR REPLACE INTO impressoes VALUES (?, ?, ?, ?)",
+                (conteudo, ImpressaoAudio.VERSAO, duracao, impressao.tobytes())
+            )
+    
+    def buscar_repetida(self, video_path, duracao, impressao, opcoes):
+        """
+        Busca a transcrição de outra gravação com o mesmo áudio
+        
+        Só entram gravações transcritas com as mesmas opções e de duração
+        compatível (ImpressaoAudio.duracoes_comparaveis).
+        
+        Args:
+            video_path: Caminho do arquivo a transcrever
+            duracao: Duração do áudio em segundos
+            impressao: Impressão do áudio do arquivo
+            opcoes: Opções da transcrição (as mesmas da chave)
+        
+        Returns:
+            tuple: (resultado da gravação encontrada, alinhamento de
+                ImpressaoAudio.alinhar com 'arquivo') do alinhamento com
+                menos bits diferentes, ou None
+        """
+        conteudo = self.hash_arquivo(video_path)
+        minima, maxima = ImpressaoAudio.duracoes_comparaveis(duracao)
+        
+        melhor = None
+        with closing(self._conectar()) as conexao:
+            candidatas = conexao.execute(
+                """
+                SELECT t.chave, i.hash, i.impressao
+                FROM impressoes i
+                JOIN transcricoes t ON t.hash = i.hash
+                WHERE t.opcoes = ? AND i.hash != ? AND i.versao = ?
+                      AND i.duracao BETWEEN ? AND ?
+                """,
+                (json.dumps(opcoes, sort_keys=True), conteudo, ImpressaoAudio.VERSAO,
+                 minima, maxima)
+            ).fetchall()
+            
+            for chave, hash_referencia, dados in candidatas:
+                alinhamento = ImpressaoAudio.alinhar(impressao, np.frombuffer(dados, dtype=np.uint32))
+                if alinhamento and (melhor is None
+                                    or alinhamento['erro_bits'] < melhor[1]['erro_bits']):
+                    melhor = (chave, alinhamento, hash_referencia)
+            if melhor is None:
+                return None
+            
+            chave, alinhamento, hash_referencia = melhor
+            linha = conexao.execute(
+                "SELECT caminho FROM arquivos WHERE hash = ? LIMIT 1", (hash_referencia,)
+            ).fetchone()
+        
+        alinhamento['arquivo'] = os.path.basename(linha[0]) if linha else hash_referencia[:12]
+        return self.buscar(chave), alinhamento
@@ -1,6 +1,6 @@
 #!/bin/bash
 # 🎯 Exemplo 3: Workflow Completo de Produção
-# Pipeline completo: info → extrair → limpar → transcrever
+# Pipeline completo: info → transcrever (extração + limpeza em memória)
 
 echo "🎬 Exemplo: Workflow Completo"
 echo "=============================="
@@ -10,44 +10,31 @@ source ../venv/bin/activate
 
 # Criar estrutura de diretórios
 mkdir -p input
-mkdir -p 1_audios_originais
-mkdir -p 2_audios_limpos
-mkdir -p 3_transcricoes
-mkdir -p 4_obsidian
+mkdir -p transcricoes
+mkdir -p obsidian
 
 echo ""
 echo "📊 ETAPA 1: Analisando vídeos..."
 python ../preprocessar_videos.py info --input input/
 
 echo ""
-echo "🎵 ETAPA 2: Extraindo áudios..."
-python ../preprocessar_videos.py extrair \
-  --input input/ \
-  --output 1_audios_originais/
-
-echo ""
-echo "🧹 ETAPA 3: Limpando áudios..."
-python ../preprocessar_videos.py limpar \
-  --input 1_audios_originais/ \
-  --output 2_audios_limpos/
-
-echo ""
-echo "📝 ETAPA 4: Transcrevendo com modelo preciso..."
+echo "📝 ETAPA 2: Extraindo, limpando e transcrevendo com modelo preciso..."
+# --limpar aplica os filtros de limpeza na mesma decodificação usada pelo
+# Whisper: nenhum WAV intermediário é gravado em disco
 python ../transcrever.py \
-  --input 2_audios_limpos/ \
-  --output 3_transcricoes/ \
+  --input input/ \
+  --output transcricoes/ \
   --modelo medium \
-  --idioma pt
+  --idioma pt \
+  --limpar
 
 echo ""
-echo "📋 ETAPA 5: Copiando para Obsidian..."
-cp 3_transcricoes/*.md 4_obsidian/
+echo "📋 ETAPA 3: Copiando para Obsidian..."
+cp transcricoes/*.md obsidian/
 
 echo ""
 echo "✅ Workflow completo concluído!"
 echo "📁 Estrutura final:"
-echo "   input/               - Vídeos originais"
-echo "   1_audios_originais/  - Áudios extraídos"
-echo "   2_audios_limpos/     - Áudios normalizados"
-echo "   3_transcricoes/      - Transcrições (.md, .txt, .json)"
-echo "   4_obsidian/          - Prontos para Obsidian"
+echo "   input/          - Vídeos originais"
+echo "   transcricoes/   - Transcrições (.md, .txt, .json)"
+echo "   obsidian/       - Prontos para Obsidian"
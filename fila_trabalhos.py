@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+📬 Fila Persistente de Trabalhos
+Autor: Diego Sottani
+
+Fila em SQLite usada pelo modo de vigilância de pasta:
+- Sobrevive a reinícios e quedas do processo
+- Não reprocessa itens já concluídos
+- Controla tentativas e falhas definitivas, com espera crescente entre as
+  tentativas (um arquivo ainda sendo copiado não gasta todas de uma vez)
+"""
+
+import os
+import time
+import sqlite3
+from contextlib import closing
+from datetime import datetime
+
+
+class FilaTrabalhos:
+    """Classe para gerenciar a fila de arquivos a transcrever"""
+    
+    NOME_ARQUIVO = '.fila_trabalhos.sqlite'
+    
+    # Estados possíveis de um trabalho
+    PENDENTE = 'pendente'
+    PROCESSANDO = 'processando'
+    CONCLUIDO = 'concluido'
+    FALHOU = 'falhou'
+    
+    # Espera antes da próxima tentativa: dobra a cada falha, até o máximo
+    ESPERA_INICIAL = 30
+    ESPERA_MAXIMA = 15 * 60
+    
+    def __init__(self, diretorio):
+        """
+        Abre (ou cria) a fila guardada em um diretório
+        
+        Itens que estavam em processamento quando o processo anterior parou
+        voltam para a fila.
+        
+        Args:
+            diretorio: Diretório onde o arquivo da fila é guardado
+        """
+        os.makedirs(diretorio, exist_ok=True)
+        self.caminho = os.path.join(diretorio, self.NOME_ARQUIVO)
+        
+        with closing(self._conectar()) as conexao, conexao:
+            conexao.execute("""
+                CREATE TABLE IF NOT EXISTS trabalhos (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    caminho TEXT,
+                    tamanho INTEGER,
+                    mtime_ns INTEGER,
+                    estado TEXT,
+                    tentativas INTEGER DEFAULT 0,
+                    erro TEXT,
+                    criado_em TEXT,
+                    atualizado_em TEXT,
+                    tentar_apos REAL,
+                    UNIQUE (caminho, tamanho, mtime_ns)
+                )
+            """)
+            colunas = [linha[1] for linha in conexao.execute("PRAGMA table_info(trabalhos)")]
+            if 'tentar_apos' not in colunas:
+                conexao.execute("ALTER TABLE trabalhos ADD COLUMN tentar_apos REAL")
+            recuperados = conexao.execute(
+                "UPDATE trabalhos SET estado = ? WHERE estado = ?",
+                (self.PENDENTE, self.PROCESSANDO)
+            ).rowcount
+        
+        if recuperados:
+            print(f"♻️  {recuperados} trabalhos interrompidos voltaram para a fila")
+    
+    def _conectar(self):
+        """Abre uma conexão; cada alteração é gravada em uma transação"""
+        conexao = sqlite3.connect(self.caminho, timeout=30)
+        conexao.execute('PRAGMA journal_mode=WAL')
+        conexao.execute('PRAGMA synchronous=FULL')
+        return conexao
+    
+    def _agora(self):
+        """Data e hora atual formatada"""
+        return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    
+    def adicionar(self, caminho):
+        """
+        Coloca um arquivo na fila
+        
+        O mesmo arquivo (caminho, tamanho e data de modificação) só entra
+        uma vez; uma nova versão do arquivo entra como outro trabalho.
+        
+        Returns:
+            bool: True se o arquivo entrou na fila agora
+        """
+        caminho = os.path.abspath(caminho)
+        stat = os.stat(caminho)
+        
+        with closing(self._conectar()) as conexao, conexao:
+            cursor = conexao.execute(
+                "INSERT OR IGNORE INTO trabalhos "
+                "(caminho, tamanho, mtime_ns, estado, criado_em, atualizado_em) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (caminho, stat.st_size, stat.st_mtime_ns,
+                 self.PENDENTE, self._agora(), self._agora())
+            )
+            return cursor.rowcount == 1
+    
+    def proximo(self):
+        """
+        Retira o próximo trabalho pendente e o marca como em processamento
+        
+        Trabalhos que falharam só voltam depois da espera (tentar_apos).
+        
+        Returns:
+            dict: Trabalho (id, caminho, tentativas) ou None se não houver
+                nenhum pronto para rodar
+        """
+        with closing(self._conectar()) as conexao, conexao:
+            linha = conexao.execute(
+                "SELECT id, caminho, tentativas FROM trabalhos "
+                "WHERE estado = ? AND (tentar_apos IS NULL OR tentar_apos <= ?) "
+                "ORDER BY id LIMIT 1",
+                (self.PENDENTE, time.time())
+            ).fetchone()
+            if linha is None:
+                return None
+            
+            conexao.execute(
+                "UPDATE trabalhos SET estado = ?, tentativas = tentativas + 1, "
+                "atualizado_em = ? WHERE id = ?",
+                (self.PROCESSANDO, self._agora(), linha[0])
+            )
+            return {'id': linha[0], 'caminho': linha[1], 'tentativas': linha[2] + 1}
+    
+    def concluir(self, trabalho_id):
+        """Marca um trabalho como concluído"""
+        with closing(self._conectar()) as conexao, conexao:
+            conexao.execute(
+                "UPDATE trabalhos SET estado = ?, erro = NULL, atualizado_em = ? WHERE id = ?",
+                (self.CONCLUIDO, self._agora(), trabalho_id)
+            )
+    
+    def falhar(self, trabalho_id, erro, max_tentativas):
+        """
+        Registra uma falha; volta para a fila enquanto houver tentativas
+        
+        Returns:
+            bool: True se o trabalho falhou definitivamente
+        """
+        with closing(self._conectar()) as conexao, conexao:
+            tentativas = conexao.execute(
+                "SELECT tentativas FROM trabalhos WHERE id = ?",
+                (trabalho_id,)
+            ).fetchone()[0]
+            definitivo = tentativas >= max_tentativas
+            conexao.execute(
+                "UPDATE trabalhos SET estado = ?, erro = ?, atualizado_em = ?, tentar_apos = ? "
+                "WHERE id = ?",
+                (self.FALHOU if definitivo else self.PENDENTE,
+                 erro, self._agora(), time.time() + self.espera(tentativas), trabalho_id)
+            )
+            return definitivo
+    
+    @classmethod
+    def espera(cls, tentativas):
+        """Segundos de espera depois da falha de número `tentativas`"""
+        return min(cls.ESPERA_INICIAL * 2 ** (tentativas - 1), cls.ESPERA_MAXIMA)
+    
+    def resumo(self):
+        """
+        Conta os trabalhos por estado
+        
+        Returns:
+            dict: {estado: quantidade}
+        """
+        with closing(self._conectar()) as conexao:
+            linhas = conexao.execute(
+                "SELECT estado, COUNT(*) FROM trabalhos GROUP BY estado"
+            ).fetchall()
+        return dict(linhas)
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+🧬 Impressão Digital de Áudio
+Autor: Diego Sottani
+
+Reconhece a mesma gravação em arquivos diferentes (.mp4 do gravador, .m4a
+do celular, .webm reexportado), que o hash de bytes não pega:
+- Impressão calculada de uma decodificação de baixa taxa (4 kHz)
+- Um valor de 32 bits a cada 0,1s: sinais das diferenças de energia entre
+  bandas vizinhas e entre quadros seguidos (não mudam com ganho nem codec)
+- Alinhamento por correlação cruzada (FFT), que tolera cortes diferentes no
+  começo e no fim e devolve o deslocamento entre as duas linhas do tempo
+"""
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+class ImpressaoAudio:
+    """Classe para calcular e comparar impressões digitais de áudio"""
+    
+    # Sobe quando o cálculo muda: impressões de outra versão são ignoradas
+    VERSAO = 1
+    
+    TAXA_AMOSTRAGEM = 4000
+    JANELA = 2048     # 0,512s por quadro
+    PASSO = 400       # 0,1s entre quadros (resolução do alinhamento)
+    BANDAS = 32       # 31 bits de diferença entre bandas + 1 bit de som
+    FREQUENCIA_MIN = 250
+    FREQUENCIA_MAX = 1800
+    
+    # Quadros mais baixos que isto não contam na comparação (silêncio
+    # digital daria bits iguais em gravações diferentes)
+    LIMIAR_SILENCIO_DB = -60
+    BIT_SOM = 1 << 31
+    
+    # Mesmo áudio: no máximo 35% de bits diferentes no melhor alinhamento,
+    # cobrindo 98% do arquivo novo e pelo menos 10s com som
+    LIMIAR_ERRO_BITS = 0.35
+    COBERTURA_MINIMA = 0.98
+    QUADROS_MINIMOS = 100
+    
+    # A gravação de referência pode ser até duas vezes mais longa
+    RAZAO_DURACAO_MAXIMA = 2.0
+    
+    # Quadros por FFT: limita a memória em arquivos longos
+    QUADROS_POR_BLOCO = 2048
+    
+    @classmethod
+    def calcular(cls, audio):
+        """
+        Calcula a impressão de um áudio
+        
+        Args:
+            audio: Array float32 mono a TAXA_AMOSTRAGEM Hz
+        
+        Returns:
+            np.ndarray: Um uint32 por quadro (bits 0-30: diferenças de
+                energia; bit 31: quadro com som)
+        """
+        if len(audio) < cls.JANELA + cls.PASSO:
+            return np.zeros(0, dtype=np.uint32)
+        
+        quadros = sliding_window_view(audio, cls.JANELA)[::cls.PASSO]
+        janela = np.hanning(cls.JANELA).astype(np.float32)
+        frequencias = np.fft.rfftfreq(cls.JANELA, 1 / cls.TAXA_AMOSTRAGEM)
+        limites = np.searchsorted(frequencias,
+                                  np.geomspace(cls.FREQUENCIA_MIN, cls.FREQUENCIA_MAX, cls.BANDAS + 1))
+        
+        energias = []
+        potencias = []
+        for inicio in range(0, len(quadros), cls.QUADROS_POR_BLOCO):
+            bloco = quadros[inicio:inicio + cls.QUADROS_POR_BLOCO]
+            espectro = np.abs(np.fft.rfft(bloco * janela, axis=1)) ** 2
+            energias.append(np.add.reduceat(espectro[:, :limites[-1]], limites[:-1], axis=1))
+            potencias.append(np.mean(bloco ** 2, axis=1))
+        energias = np.concatenate(energias)
+        potencias = np.concatenate(potencias)
+        
+        # Bit = sinal da variação, de um quadro para o seguinte, da diferença
+        # de energia entre duas bandas vizinhas
+        diferencas = energias[:, :-1] - energias[:, 1:]
+        bits = (diferencas[1:] - diferencas[:-1]) > 0
+        pesos = np.left_shift(np.uint32(1), np.arange(cls.BANDAS - 1, dtype=np.uint32))
+        impressao = (bits * pesos).sum(axis=1, dtype=np.uint32)
+        
+        com_som = 10 * np.log10(potencias[1:] + 1e-12) > cls.LIMIAR_SILENCIO_DB
+        impressao[com_som] |= np.uint32(cls.BIT_SOM)
+        return impressao
+    
+    @classmethod
+    def duracoes_comparaveis(cls, duracao):
+        """
+        Faixa de duração das gravações em que um arquivo pode estar contido
+        
+        Returns:
+            tuple: (duração mínima, duração máxima) em segundos
+        """
+        return duracao * cls.COBERTURA_MINIMA, duracao * cls.RAZAO_DURACAO_MAXIMA
+    
+    @classmethod
+    def _sinais(cls, impressao):
+        """Bits como +1/-1 (0 nos quadros sem som) e a máscara de som"""
+        som = ((impressao >> 31) & 1).astype(np.float64)
+        bits = (impressao[None, :] >> np.arange(cls.BANDAS - 1, dtype=np.uint32)[:, None]) & 1
+        return (2.0 * bits - 1.0) * som, som
+    
+    @classmethod
+    def alinhar(cls, nova, referencia):
+        """
+        Procura a impressão nova dentro da de referência
+        
+        Testa todos os deslocamentos de uma vez: a concordância dos bits em
+        cada deslocamento é uma correlação cruzada, calculada por FFT.
+        
+        Args:
+            nova: Impressão do arquivo a transcrever
+            referencia: Impressão de uma gravação já transcrita
+        
+        Returns:
+            dict: deslocamento_s (tempo na referência - tempo no arquivo
+                novo), erro_bits e cobertura do melhor alinhamento; None se
+                não for o mesmo áudio
+        """
+        n, m = len(nova), len(referencia)
+        if n == 0 or m == 0:
+            return None
+        
+        sinais_nova, som_nova = cls._sinais(nova)
+        sinais_ref, som_ref = cls._sinais(referencia)
+        tamanho = 1 << (n + m - 1).bit_length()
+        
+        espectro = (np.conj(np.fft.rfft(sinais_nova, tamanho)) * np.fft.rfft(sinais_ref, tamanho)).sum(axis=0)
+        concordancia = np.fft.irfft(espectro, tamanho)
+        com_som = np.fft.irfft(np.conj(np.fft.rfft(som_nova, tamanho)) * np.fft.rfft(som_ref, tamanho),
+                               tamanho)
+        
+        # Deslocamento d: quadro i do arquivo novo = quadro i + d da referência
+        deslocamentos = np.arange(-(n - 1), m)
+        concordancia = concordancia[deslocamentos % tamanho]
+        com_som = np.rint(com_som[deslocamentos % tamanho])
+        cobertura = (np.minimum(n, m - deslocamentos) - np.maximum(0, -deslocamentos)) / n
+        
+        possiveis = (cobertura >= cls.COBERTURA_MINIMA) & (com_som >= cls.QUADROS_MINIMOS)
+        if not possiveis.any():
+            return None
+        erro = np.ones(len(deslocamentos))
+        erro[possiveis] = (1 - concordancia[possiveis] / ((cls.BANDAS - 1) * com_som[possiveis])) / 2
+        
+        melhor = int(np.argmin(erro))
+        if erro[melhor] > cls.LIMIAR_ERRO_BITS:
+            return None
+        return {
+            'deslocamento_s': round(float(deslocamentos[melhor]) * cls.PASSO / cls.TAXA_AMOSTRAGEM, 3),
+            'erro_bits': round(float(erro[melhor]), 4),
+            'cobertura': round(float(min(cobertura[melhor], 1.0)), 4),
+        }
+    
+    @staticmethod
+    def deslocar_resultado(result, deslocamento_s, duracao):
+        """
+        Traz o resultado da gravação de referência para a linha do tempo do
+        arquivo novo
+        
+        Segmentos fora do arquivo novo são descartados; os que cruzam as
+        bordas são cortados nelas. O relatório do VAD ('vad') é o da outra
+        gravação e não vai para o resultado.
+        
+        Args:
+            result: Resultado no formato do Whisper da referência
+            deslocamento_s: Devolvido por alinhar
+            duracao: Duração do arquivo novo em segundos
+        
+        Returns:
+            dict: Novo resultado (text, segments, language e extras, sem 'vad')
+        """
+        segmentos = []
+        for segmento in result['segments']:
+            inicio = segmento['start'] - deslocamento_s
+            fim = segmento['end'] - deslocamento_s
+            if fim <= 0 or inicio >= duracao:
+                continue
+            segmentos.append(dict(segmento,
+                                  id=len(segmentos),
+                                  start=round(max(inicio, 0.0), 3),
+                                  end=round(min(fim, duracao), 3)))
+        
+        novo = {chave: valor for chave, valor in result.items() if chave != 'vad'}
+        return dict(novo,
+                    text=''.join(segmento['text'] for segmento in segmentos),
+                    segments=segmentos)
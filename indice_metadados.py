@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+🗂️ Índice de Metadados de Mídia
+Autor: Diego Sottani
+
+Índice SQLite com o resultado do ffprobe de cada arquivo:
+- Chave: caminho + tamanho + data de modificação
+- Arquivos sem alteração não chamam o ffprobe de novo
+- Um único índice por usuário serve para todas as pastas
+- Também guarda o idioma detectado de cada arquivo (--idioma auto)
+- E a impressão digital do áudio de cada arquivo (--deduplicar)
+"""
+
+import os
+import json
+import sqlite3
+from contextlib import closing
+from datetime import datetime
+
+
+class IndiceMetadados:
+    """Classe para guardar e consultar metadados do ffprobe por arquivo"""
+    
+    CAMINHO_PADRAO = os.path.join(os.path.expanduser('~'), '.cache',
+                                  'transcricao_local', 'indice_metadados.sqlite')
+    
+    def __init__(self, caminho=None):
+        """
+        Abre (ou cria) o índice
+        
+        Args:
+            caminho: Arquivo SQLite do índice (padrão: ~/.cache/transcricao_local/)
+        """
+        self.caminho = caminho or self.CAMINHO_PADRAO
+        os.makedirs(os.path.dirname(os.path.abspath(self.caminho)), exist_ok=True)
+        
+        with closing(self._conectar()) as conexao, conexao:
+            conexao.execute("""
+                CREATE TABLE IF NOT EXISTS metadados (
+                    caminho TEXT PRIMARY KEY,
+                    tamanho INTEGER,
+                    mtime_ns INTEGER,
+                    info TEXT,
+                    atualizado_em TEXT
+                )
+            """)
+            conexao.execute("""
+                CREATE TABLE IF NOT EXISTS idiomas (
+                    caminho TEXT PRIMARY KEY,
+                    tamanho INTEGER,
+                    mtime_ns INTEGER,
+                    idioma TEXT,
+                    probabilidade REAL,
+                    atualizado_em TEXT
+                )
+            """)
+            conexao.execute("""
+                CREATE TABLE IF NOT EXISTS impressoes (
+                    caminho TEXT PRIMARY KEY,
+                    tamanho INTEGER,
+                    mtime_ns INTEGER,
+                    versao INTEGER,
+                    duracao REAL,
+                    impressao BLOB,
+                    atualizado_em TEXT
+                )
+            """)
+    
+    def _conectar(self):
+        """Abre uma conexão; vários processos podem usar o mesmo índice"""
+        conexao = sqlite3.connect(self.caminho, timeout=30)
+        conexao.execute('PRAGMA journal_mode=WAL')
+        return conexao
+    
+    def buscar(self, arquivos):
+        """
+        Busca os metadados guardados de vários arquivos de uma vez
+        
+        Só valem entradas cujo tamanho e data de modificação ainda batem com
+        o arquivo no disco.
+        
+        Args:
+            arquivos: Caminhos dos arquivos
+        
+        Returns:
+            dict: {caminho: metadados} dos arquivos encontrados no índice
+        """
+        encontrados = {}
+        with closing(self._conectar()) as conexao:
+            for arquivo in arquivos:
+                try:
+                    stat = os.stat(arquivo)
+                except OSError:
+                    continue
+                linha = conexao.execute(
+                    "SELECT info FROM metadados WHERE caminho = ? AND tamanho = ? AND mtime_ns = ?",
+                    (os.path.abspath(arquivo), stat.st_size, stat.st_mtime_ns)
+                ).fetchone()
+                if linha:
+                    encontrados[arquivo] = json.loads(linha[0])
+        return encontrados
+    
+    def salvar(self, itens):
+        """
+        Guarda os metadados de vários arquivos em uma única transação
+        
+        Args:
+            itens: {caminho: metadados}
+        """
+        agora = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        linhas = []
+        for arquivo, info in itens.items():
+            stat = os.stat(arquivo)
+            linhas.append((os.path.abspath(arquivo), stat.st_size, stat.st_mtime_ns,
+                           json.dumps(info, ensure_ascii=False), agora))
+        
+        with closing(self._conectar()) as conexao, conexao:
+            conexao.executemany(
+                "INSERT OR REPLACE INTO metadados VALUES (?, ?, ?, ?, ?)",
+                linhas
+            )
+    
+    def buscar_idioma(self, arquivo):
+        """
+        Idioma detectado antes para o arquivo, se ele não mudou desde então
+        
+        Returns:
+            str: Código do idioma ou None
+        """
+        try:
+            stat = os.stat(arquivo)
+        except OSError:
+            return None
+        with closing(self._conectar()) as conexao:
+            linha = conexao.execute(
+                "SELECT idioma FROM idiomas WHERE caminho = ? AND tamanho = ? AND mtime_ns = ?",
+                (os.path.abspath(arquivo), stat.st_size, stat.st_mtime_ns)
+            ).fetchone()
+        return linha[0] if linha else None
+    
+    def salvar_idioma(self, arquivo, idioma, probabilidade):
+        """
+        Guarda o idioma detectado de um arquivo
+        
+        Args:
+            arquivo: Caminho do arquivo
+            idioma: Código do idioma
+            probabilidade: Probabilidade média do idioma nas janelas analisadas
+        """
+        stat = os.stat(arquivo)
+        with closing(self._conectar()) as conexao, conexao:
+            conexao.execute(
+                "INSERT OR REPLACE INTO idiomas VALUES (?, ?, ?, ?, ?, ?)",
+                (os.path.abspath(arquivo), stat.st_size, stat.st_mtime_ns, idioma,
+                 probabilidade, datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+            )
+    
+    def buscar_impressao(self, arquivo, versao):
+        """
+        Impressão do áudio calculada antes, se o arquivo não mudou desde então
+        
+        Args:
+            arquivo: Caminho do arquivo
+            versao: Versão do cálculo (ImpressaoAudio.VERSAO)
+        
+        Returns:
+            tuple: (duração em segundos, bytes da impressão) ou None
+        """
+        try:
+            stat = os.stat(arquivo)
+        except OSError:
+            return None
+        with closing(self._conectar()) as conexao:
+            return conexao.execute(
+                "SELECT duracao, impressao FROM impressoes "
+                "WHERE caminho = ? AND tamanho = ? AND mtime_ns = ? AND versao = ?",
+                (os.path.abspath(arquivo), stat.st_size, stat.st_mtime_ns, versao)
+            ).fetchone()
+    
+    def salvar_impressao(self, arquivo, versao, duracao, impressao):
+        """
+        Guarda a impressão do áudio de um arquivo
+        
+        Args:
+            arquivo: Caminho do arquivo
+            versao: Versão do cálculo (ImpressaoAudio.VERSAO)
+            duracao: Duração do áudio em segundos
+            impressao: Bytes da impressão
+        """
+        stat = os.stat(arquivo)
+        with closing(self._conectar()) as conexao, conexao:
+            conexao.execute(
+                "INSERT OR REPLACE INTO impressoes VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (os.path.abspath(arquivo), stat.st_size, stat.st_mtime_ns, versao,
+                 duracao, impressao, datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+            )
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+📦 Inferência em Lote para Arquivos Curtos
+Autor: Diego Sottani
+
+Transcreve muitos áudios curtos juntando janelas de arquivos diferentes em
+uma mesma passada do modelo:
+- Os log-mel de vários arquivos formam um lote para o encoder e o decoder
+- Arquivos com mais de uma janela avançam em rodadas, como no transcribe do
+  Whisper (cada rodada processa a próxima janela de quem ainda tem áudio)
+- Mesmos critérios do Whisper para segmentos, silêncio e fallback de
+  temperatura (o fallback, raro em fala real, roda janela a janela)
+- Cada arquivo recebe o seu resultado no formato do Whisper
+"""
+
+import torch
+import whisper
+from whisper.audio import N_FRAMES, HOP_LENGTH, SAMPLE_RATE
+from whisper.tokenizer import get_tokenizer
+
+
+class DecodificadorLotes:
+    """Classe para transcrever vários áudios curtos com passadas em lote"""
+    
+    # Mesmos padrões do whisper.transcribe
+    TEMPERATURAS = (0.0, 0.2, 0.4, 0.6, 0.8, 1.0)
+    LIMIAR_COMPRESSAO = 2.4
+    LIMIAR_LOGPROB = -1.0
+    LIMIAR_SEM_FALA = 0.6
+    MELHOR_DE = 5
+    
+    def __init__(self, model, idioma=None, tamanho_lote=16):
+        """
+        Prepara o decodificador
+        
+        Args:
+            model: Modelo Whisper já carregado
+            idioma: Código do idioma ou None para detectar em cada arquivo
+            tamanho_lote: Janelas de 30s por passada do modelo
+        """
+        self.model = model
+        self.idioma = idioma
+        self.tamanho_lote = max(1, tamanho_lote)
+        self.tokenizer = get_tokenizer(model.is_multilingual, num_languages=model.num_languages,
+                                       task='transcribe')
+        
+        passo_entrada = N_FRAMES // model.dims.n_audio_ctx
+        self.precisao_tempo = passo_entrada * HOP_LENGTH / SAMPLE_RATE
+        self.passo_entrada = passo_entrada
+    
+    def transcrever(self, audios, idiomas=None):
+        """
+        Transcreve uma lista de áudios
+        
+        Args:
+            audios: Arrays float32 a 16 kHz
+            idiomas: Idioma conhecido de cada áudio (None = usar self.idioma
+                ou detectar na primeira janela)
+        
+        Returns:
+            list: Um resultado no formato do Whisper (text, segments,
+                language) por áudio, na mesma ordem
+        """
+        estados = []
+        for i, audio in enumerate(audios):
+            mel = whisper.log_mel_spectrogram(audio, self.model.dims.n_mels,
+                                              padding=whisper.audio.N_SAMPLES)
+            estados.append({
+                'mel': mel,
+                'quadros': mel.shape[-1] - N_FRAMES,
+                'seek': 0,
+                'idioma': (idiomas[i] if idiomas else None) or self.idioma,
+                'segmentos': [],
+            })
+        
+        # Uma rodada = a próxima janela de cada áudio que ainda não acabou
+        while True:
+            pendentes = [e for e in estados if e['seek'] < e['quadros']]
+            if not pendentes:
+                break
+            # O idioma vai nas opções do lote: juntam-se só janelas do mesmo idioma
+            pendentes.sort(key=lambda e: e['idioma'] or '')
+            for inicio in range(0, len(pendentes), self.tamanho_lote):
+                lote = pendentes[inicio:inicio + self.tamanho_lote]
+                por_idioma = {}
+                for estado in lote:
+                    por_idioma.setdefault(estado['idioma'], []).append(estado)
+                for idioma, grupo in por_idioma.items():
+                    self._processar_janelas(grupo, idioma)
+        
+        return [self._resultado(estado) for estado in estados]
+    
+    def _processar_janelas(self, estados, idioma):
+        """Decodifica a janela atual de cada estado e avança o seek de cada um"""
+        tamanhos = [min(N_FRAMES, e['quadros'] - e['seek']) for e in estados]
+        mel = torch.stack([
+            whisper.pad_or_trim(e['mel'][:, e['seek']:e['seek'] + tamanho], N_FRAMES)
+            for e, tamanho in zip(estados, tamanhos)
+        ]).to(self.model.device)
+        
+        resultados = self._decodificar_com_fallback(mel, idioma)
+        
+        for estado, tamanho, resultado in zip(estados, tamanhos, resultados):
+            if estado['idioma'] is None:
+                estado['idioma'] = resultado.language
+                estado['probabilidade'] = (resultado.language_probs or {}).get(resultado.language)
+            
+            # Janela sem fala: pula para a próxima
+            if (resultado.no_speech_prob > self.LIMIAR_SEM_FALA
+                    and resultado.avg_logprob <= self.LIMIAR_LOGPROB):
+                estado['seek'] += tamanho
+                continue
+            
+            self._segmentar(estado, tamanho, resultado)
+    
+    def _decodificar_com_fallback(self, mel, idioma):
+        """
+        Decodifica o lote; as janelas repetitivas ou improváveis são
+        decodificadas de novo na temperatura seguinte
+        
+        Returns:
+            list: DecodingResult de cada janela
+        """
+        resultados = [None] * mel.shape[0]
+        restantes = list(range(mel.shape[0]))
+        fp16 = self.model.device.type == 'cuda'
+        
+        for temperatura in self.TEMPERATURAS:
+            opcoes = whisper.DecodingOptions(
+                task='transcribe',
+                language=idioma,
+                temperature=temperatura,
+                best_of=self.MELHOR_DE if temperatura > 0 else None,
+                fp16=fp16
+            )
+            with torch.inference_mode():
+                if temperatura == 0:
+                    decodificados = whisper.decode(self.model, mel[restantes], opcoes)
+                else:
+                    # O best-of-n do Whisper só aceita uma janela por chamada
+                    # (não repete as features do áudio para cada amostra)
+                    decodificados = [whisper.decode(self.model, mel[i], opcoes) for i in restantes]
+            
+            proximos = []
+            for i, resultado in zip(restantes, decodificados):
+                resultados[i] = resultado
+                if self._precisa_fallback(resultado):
+                    proximos.append(i)
+            if not proximos:
+                break
+            restantes = proximos
+        return resultados
+    
+    def _precisa_fallback(self, resultado):
+        """Critério do whisper.transcribe para tentar outra temperatura"""
+        ruim = (resultado.compression_ratio > self.LIMIAR_COMPRESSAO
+                or resultado.avg_logprob < self.LIMIAR_LOGPROB)
+        silencio = (resultado.no_speech_prob > self.LIMIAR_SEM_FALA
+                    and resultado.avg_logprob < self.LIMIAR_LOGPROB)
+        return ruim and not silencio
+    
+    def _segmentar(self, estado, tamanho, resultado):
+        """
+        Separa os tokens em segmentos pelos timestamps e avança o seek
+        (mesma regra do whisper.transcribe)
+        """
+        inicio_ts = self.tokenizer.timestamp_begin
+        tokens = torch.tensor(resultado.tokens)
+        deslocamento = estado['seek'] * HOP_LENGTH / SAMPLE_RATE
+        
+        eh_timestamp = tokens.ge(inicio_ts)
+        termina_com_um = eh_timestamp[-2:].tolist() == [False, True]
+        consecutivos = (torch.where(eh_timestamp[:-1] & eh_timestamp[1:])[0] + 1).tolist()
+        
+        if consecutivos:
+            cortes = consecutivos + ([len(tokens)] if termina_com_um else [])
+            anterior = 0
+            for corte in cortes:
+                trecho = tokens[anterior:corte]
+                self._novo_segmento(
+                    estado, resultado, trecho,
+                    deslocamento + (trecho[0].item() - inicio_ts) * self.precisao_tempo,
+                    deslocamento + (trecho[-1].item() - inicio_ts) * self.precisao_tempo
+                )
+                anterior = corte
+            
+            if termina_com_um:
+                estado['seek'] += tamanho
+            else:
+                # Segmento inacabado: a próxima janela começa no último timestamp
+                avanco = (tokens[anterior - 1].item() - inicio_ts) * self.passo_entrada
+                estado['seek'] += avanco or tamanho
+        else:
+            duracao = tamanho * HOP_LENGTH / SAMPLE_RATE
+            timestamps = tokens[eh_timestamp.nonzero().flatten()]
+            if len(timestamps) and timestamps[-1].item() != inicio_ts:
+                duracao = (timestamps[-1].item() - inicio_ts) * self.precisao_tempo
+            self._novo_segmento(estado, resultado, tokens, deslocamento, deslocamento + duracao)
+            estado['seek'] += tamanho
+    
+    def _novo_segmento(self, estado, resultado, tokens, inicio, fim):
+        """Acrescenta um segmento no formato do Whisper (vazios são descartados)"""
+        tokens = tokens.tolist()
+        texto = self.tokenizer.decode([t for t in tokens if t < self.tokenizer.eot])
+        if inicio == fim or not texto.strip():
+            return
+        estado['segmentos'].append({
+            'id': len(estado['segmentos']),
+            'seek': estado['seek'],
+            'start': round(inicio, 3),
+            'end': round(fim, 3),
+            'text': texto,
+            'tokens': tokens,
+            'temperature': resultado.temperature,
+            'avg_logprob': resultado.avg_logprob,
+            'compression_ratio': resultado.compression_ratio,
+            'no_speech_prob': resultado.no_speech_prob,
+        })
+    
+    def _resultado(self, estado):
+        """Resultado de um áudio no formato do whisper.transcribe"""
+        result = {
+            'text': ''.join(segmento['text'] for segmento in estado['segmentos']),
+            'segments': estado['segmentos'],
+            'language': estado['idioma'],
+        }
+        if estado.get('probabilidade') is not None:
+            result['probabilidade_idioma'] = estado['probabilidade']
+        return result
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+📈 Instrumentação de Desempenho
+Autor: Diego Sottani
+
+Mede o custo de cada etapa da transcrição e exporta os números:
+- Tempo de parede, tempo de CPU (incluindo FFmpeg e workers) e pico de memória
+  (valores do processo: com várias etapas simultâneas em threads, como no
+  serve, incluem o trabalho das outras)
+- Fator de tempo real por arquivo
+- Exportação em texto do Prometheus ou JSON lines
+"""
+
+import sys
+import json
+import time
+import resource
+import threading
+from contextlib import contextmanager
+
+
+def _rss_mb(kb_ou_bytes):
+    """ru_maxrss vem em KB no Linux e em bytes no macOS"""
+    divisor = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return round(kb_ou_bytes / divisor, 1)
+
+
+def _zerar_pico_memoria():
+    """
+    Zera o pico de memória do processo (só Linux)
+    
+    Returns:
+        bool: True se o pico passou a valer só a partir de agora
+    """
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def _pico_memoria_mb():
+    """Pico de memória do processo (VmHWM no Linux, ru_maxrss nos demais)"""
+    try:
+        with open('/proc/self/status') as f:
+            for linha in f:
+                if linha.startswith('VmHWM:'):
+                    return round(int(linha.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    return _rss_mb(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+
+
+class MedidorEtapas:
+    """Classe para medir tempo, CPU e memória de cada etapa de um arquivo"""
+    
+    # Etapas em andamento no processo (todos os medidores, todas as threads)
+    _em_andamento = 0
+    _trava = threading.Lock()
+    
+    def __init__(self):
+        self.etapas = {}
+        self.duracao_audio = None
+    
+    @contextmanager
+    def etapa(self, nome):
+        """
+        Mede o bloco como a etapa `nome`
+        
+        A CPU inclui processos filhos já encerrados (FFmpeg, workers). Se a
+        mesma etapa ocorrer mais de uma vez, tempos são somados e o pico de
+        memória é o maior.
+        
+        CPU e pico de memória são do processo inteiro: com outras etapas
+        rodando ao mesmo tempo em outras threads (instâncias do serve), os
+        números incluem o trabalho delas. O pico só é zerado quando nenhuma
+        outra etapa está em andamento, para não apagar o pico de outra.
+        """
+        with MedidorEtapas._trava:
+            if MedidorEtapas._em_andamento == 0:
+                _zerar_pico_memoria()
+            MedidorEtapas._em_andamento += 1
+        proprio = resource.getrusage(resource.RUSAGE_SELF)
+        filhos = resource.getrusage(resource.RUSAGE_CHILDREN)
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            parede = time.perf_counter() - inicio
+            with MedidorEtapas._trava:
+                MedidorEtapas._em_andamento -= 1
+            proprio_depois = resource.getrusage(resource.RUSAGE_SELF)
+            filhos_depois = resource.getrusage(resource.RUSAGE_CHILDREN)
+            cpu = ((proprio_depois.ru_utime - proprio.ru_utime)
+                   + (proprio_depois.ru_stime - proprio.ru_stime)
+                   + (filhos_depois.ru_utime - filhos.ru_utime)
+                   + (filhos_depois.ru_stime - filhos.ru_stime))
+            pico = max(_pico_memoria_mb(), _rss_mb(filhos_depois.ru_maxrss))
+            
+            anterior = self.etapas.get(nome, {'parede_s': 0.0, 'cpu_s': 0.0, 'pico_rss_mb': 0.0})
+            self.etapas[nome] = {
+                'parede_s': round(anterior['parede_s'] + parede, 4),
+                'cpu_s': round(anterior['cpu_s'] + cpu, 4),
+                'pico_rss_mb': max(anterior['pico_rss_mb'], pico),
+            }
+    
+    def somar_parcela(self, outro, fracao):
+        """
+        Soma a este medidor uma fração das etapas de outro
+        
+        Para etapas que atendem vários arquivos de uma vez (inferência em
+        lote): cada arquivo fica com a parte proporcional ao seu áudio.
+        """
+        for nome, etapa in outro.etapas.items():
+            anterior = self.etapas.get(nome, {'parede_s': 0.0, 'cpu_s': 0.0, 'pico_rss_mb': 0.0})
+            self.etapas[nome] = {
+                'parede_s': round(anterior['parede_s'] + etapa['parede_s'] * fracao, 4),
+                'cpu_s': round(anterior['cpu_s'] + etapa['cpu_s'] * fracao, 4),
+                'pico_rss_mb': max(anterior['pico_rss_mb'], etapa['pico_rss_mb']),
+            }
+    
+    def resumo(self):
+        """
+        Resumo das etapas medidas até agora
+        
+        Returns:
+            dict: etapas, totais e fator de tempo real (tempo / duração do áudio)
+        """
+        parede = sum(e['parede_s'] for e in self.etapas.values())
+        return {
+            'etapas': dict(self.etapas),
+            'parede_total_s': round(parede, 4),
+            'cpu_total_s': round(sum(e['cpu_s'] for e in self.etapas.values()), 4),
+            'pico_rss_mb': max((e['pico_rss_mb'] for e in self.etapas.values()), default=0.0),
+            'duracao_audio_s': round(self.duracao_audio, 2) if self.duracao_audio else None,
+            'fator_tempo_real': round(parede / self.duracao_audio, 4) if self.duracao_audio else None,
+        }
+
+
+def resumir_lote(metricas, parede_lote):
+    """
+    Agrega as métricas dos arquivos de um lote
+    
+    Args:
+        metricas: {arquivo: resumo do MedidorEtapas}
+        parede_lote: Tempo de parede do lote inteiro em segundos
+    
+    Returns:
+        dict: Totais por etapa, fator de tempo real do lote e arquivos mais lentos
+    """
+    etapas = {}
+    for resumo in metricas.values():
+        for nome, medidas in resumo['etapas'].items():
+            total = etapas.setdefault(nome, {'parede_s': 0.0, 'cpu_s': 0.0, 'pico_rss_mb': 0.0})
+            total['parede_s'] = round(total['parede_s'] + medidas['parede_s'], 4)
+            total['cpu_s'] = round(total['cpu_s'] + medidas['cpu_s'], 4)
+            total['pico_rss_mb'] = max(total['pico_rss_mb'], medidas['pico_rss_mb'])
+    
+    duracao_audio = sum(r['duracao_audio_s'] or 0 for r in metricas.values())
+    com_fator = [(arquivo, r['fator_tempo_real']) for arquivo, r in metricas.items()
+                 if r['fator_tempo_real'] is not None]
+    
+    return {
+        'arquivos_medidos': len(metricas),
+        'parede_lote_s': round(parede_lote, 2),
+        'duracao_audio_s': round(duracao_audio, 2),
+        'fator_tempo_real_lote': round(parede_lote / duracao_audio, 4) if duracao_audio else None,
+        'etapas': etapas,
+        'mais_lentos': [
+            {'arquivo': arquivo, 'fator_tempo_real': fator}
+            for arquivo, fator in sorted(com_fator, key=lambda x: x[1], reverse=True)[:5]
+        ],
+    }
+
+
+def _rotulo(valor):
+    """Escapa um valor de rótulo no formato de texto do Prometheus"""
+    return str(valor).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def exportar_metricas(caminho, metricas, resumo_lote=None):
+    """
+    Exporta as métricas em texto do Prometheus (.prom) ou JSON lines
+    
+    Args:
+        caminho: Arquivo de destino; a extensão .prom escolhe o Prometheus
+        metricas: {arquivo: resumo do MedidorEtapas}
+        resumo_lote: Resultado de resumir_lote (opcional)
+    """
+    if caminho.endswith('.prom'):
+        linhas = []
+        series = [
+            ('transcricao_etapa_parede_segundos', 'Tempo de parede por etapa', 'parede_s', 1),
+            ('transcricao_etapa_cpu_segundos', 'Tempo de CPU por etapa', 'cpu_s', 1),
+            ('transcricao_etapa_pico_memoria_bytes', 'Pico de memória por etapa', 'pico_rss_mb', 1024 * 1024),
+        ]
+        for nome, ajuda, chave, escala in series:
+            linhas += [f"# HELP {nome} {ajuda}", f"# TYPE {nome} gauge"]
+            for arquivo, resumo in metricas.items():
+                for etapa, medidas in resumo['etapas'].items():
+                    linhas.append(f'{nome}{{arquivo="{_rotulo(arquivo)}",etapa="{etapa}"}} '
+                                  f'{medidas[chave] * escala:g}')
+        
+        linhas += ["# HELP transcricao_fator_tempo_real Tempo de processamento / duração do áudio",
+                   "# TYPE transcricao_fator_tempo_real gauge"]
+        for arquivo, resumo in metricas.items():
+            if resumo['fator_tempo_real'] is not None:
+                linhas.append(f'transcricao_fator_tempo_real{{arquivo="{_rotulo(arquivo)}"}} '
+                              f'{resumo["fator_tempo_real"]:g}')
+        
+        if resumo_lote:
+            linhas += ["# HELP transcricao_lote_parede_segundos Tempo de parede do lote",
+                       "# TYPE transcricao_lote_parede_segundos gauge",
+                       f"transcricao_lote_parede_segundos {resumo_lote['parede_lote_s']:g}"]
+            if resumo_lote['fator_tempo_real_lote'] is not None:
+                linhas += ["# HELP transcricao_lote_fator_tempo_real Fator de tempo real do lote",
+                           "# TYPE transcricao_lote_fator_tempo_real gauge",
+                           f"transcricao_lote_fator_tempo_real {resumo_lote['fator_tempo_real_lote']:g}"]
+        
+        conteudo = '\n'.join(linhas) + '\n'
+        with open(caminho, 'w', encoding='utf-8') as f:
+            f.write(conteudo)
+    else:
+        with open(caminho, 'a', encoding='utf-8') as f:
+            for arquivo, resumo in metricas.items():
+                f.write(json.dumps({'tipo': 'arquivo', 'arquivo': arquivo, **resumo},
+                                   ensure_ascii=False) + '\n')
+            if resumo_lote:
+                f.write(json.dumps({'tipo': 'lote', **resumo_lote}, ensure_ascii=False) + '\n')
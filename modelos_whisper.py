@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+🧠 Gerenciamento de Modelos Whisper
+Autor: Diego Sottani
+
+Camada única de carga dos modelos:
+- Registro por processo: transcritores com o mesmo modelo usam uma só cópia
+- Cache local opcional de carga rápida (modelo já montado, lido via mmap)
+- Quantização dinâmica int8 opcional das camadas lineares (CPU)
+- Tempo de carga informado a cada carga
+"""
+
+import os
+import time
+import warnings
+import threading
+from pathlib import Path
+
+import torch
+import whisper
+from torch import nn
+
+
+class RegistroModelos:
+    """Classe para carregar cada modelo Whisper uma vez por processo"""
+    
+    DIRETORIO_CACHE = os.path.join(os.path.expanduser('~'), '.cache',
+                                   'transcricao_local', 'modelos')
+    
+    # Modelos compartilhados deste processo: {(nome, quantizado): modelo}
+    _modelos = {}
+    _trava = threading.Lock()
+    
+    @classmethod
+    def obter(cls, nome, compartilhado=True, cache_rapido=False, quantizar=False):
+        """
+        Devolve o modelo, carregando-o só na primeira vez
+        
+        Args:
+            nome: Nome do modelo Whisper (tiny, base...) ou caminho de um checkpoint
+            compartilhado: Usa o registro do processo. Quem roda inferências
+                ao mesmo tempo em threads (servidor) precisa de cópias próprias.
+            cache_rapido: Usa (e cria, se faltar) a cópia de carga rápida
+            quantizar: Converte as camadas lineares para int8 (só em CPU)
+        
+        Returns:
+            whisper.model.Whisper: Modelo pronto para transcrever
+        """
+        if not compartilhado:
+            return cls._carregar(nome, cache_rapido, quantizar)
+        
+        chave = (nome, quantizar)
+        with cls._trava:
+            if chave in cls._modelos:
+                print(f"♻️  Modelo Whisper '{nome}' já carregado neste processo")
+            else:
+                cls._modelos[chave] = cls._carregar(nome, cache_rapido, quantizar)
+            return cls._modelos[chave]
+    
+    @classmethod
+    def descarregar(cls, nome=None):
+        """Remove um modelo (ou todos) do registro para liberar memória"""
+        with cls._trava:
+            for chave in list(cls._modelos):
+                if nome is None or chave[0] == nome:
+                    del cls._modelos[chave]
+    
+    @classmethod
+    def caminho_cache(cls, nome):
+        """Arquivo de carga rápida de um modelo (depende da versão do Whisper)"""
+        return os.path.join(cls.DIRETORIO_CACHE,
+                            f"{Path(nome).stem}-whisper{whisper.__version__}.pt")
+    
+    @classmethod
+    def _carregar(cls, nome, cache_rapido, quantizar=False):
+        """Carrega um modelo do cache rápido ou pelo caminho normal do Whisper"""
+        print(f"🔄 Carregando modelo Whisper '{nome}'...")
+        inicio = time.perf_counter()
+        
+        caminho = cls.caminho_cache(nome)
+        modelo = None
+        if cache_rapido and os.path.exists(caminho):
+            modelo = cls._carregar_rapido(caminho)
+        origem = 'cache rápido' if modelo is not None else 'checkpoint do Whisper'
+        
+        if modelo is None:
+            modelo = whisper.load_model(nome)
+            if cache_rapido:
+                cls._salvar_rapido(modelo, caminho)
+        
+        # O cache rápido guarda o modelo em fp32; a quantização leva poucos
+        # segundos e é refeita a cada carga
+        if quantizar:
+            modelo = cls.quantizar(modelo)
+        
+        print(f"✅ Modelo carregado em {time.perf_counter() - inicio:.1f}s ({origem})")
+        return modelo
+    
+    @classmethod
+    def quantizar(cls, modelo):
+        """
+        Aplica quantização dinâmica int8 às camadas lineares do modelo
+        
+        Os pesos das camadas lineares (atenção e MLP, quase todo o modelo)
+        passam a int8; as ativações são quantizadas a cada chamada. Só vale
+        para CPU: em GPU o modelo volta sem alteração.
+        
+        Args:
+            modelo: Modelo Whisper em CPU
+        
+        Returns:
+            whisper.model.Whisper: Modelo quantizado
+        """
+        if next(modelo.parameters()).device.type != 'cpu':
+            print("⚠️  Quantização int8 só é aplicada em CPU; usando o modelo original")
+            return modelo
+        
+        antes = cls.tamanho_mb(modelo)
+        # O Whisper usa uma subclasse de nn.Linear, que o quantize_dynamic
+        # não reconhece: troca por nn.Linear com os mesmos pesos
+        for modulo in list(modelo.modules()):
+            for nome, filho in modulo.named_children():
+                if isinstance(filho, nn.Linear) and type(filho) is not nn.Linear:
+                    linear = nn.Linear(filho.in_features, filho.out_features,
+                                       bias=filho.bias is not None)
+                    linear.weight = filho.weight
+                    linear.bias = filho.bias
+                    setattr(modulo, nome, linear)
+        
+        with warnings.catch_warnings():
+            # Aviso de API depreciada do PyTorch, repetido a cada camada
+            warnings.simplefilter('ignore', UserWarning)
+            modelo = torch.ao.quantization.quantize_dynamic(modelo, {nn.Linear}, dtype=torch.qint8)
+        depois = cls.tamanho_mb(modelo)
+        print(f"🗜️  Modelo quantizado (int8): {antes:.0f} MB → {depois:.0f} MB "
+              f"({1 - depois / antes:.0%} menor)")
+        return modelo
+    
+    @staticmethod
+    def tamanho_mb(modelo):
+        """Memória ocupada pelos pesos do modelo (inclui os pesos int8 empacotados)"""
+        total = 0
+        for valor in modelo.state_dict().values():
+            # Camadas quantizadas guardam (peso, bias) empacotados
+            tensores = valor if isinstance(valor, tuple) else (valor,)
+            for tensor in tensores:
+                if isinstance(tensor, torch.Tensor):
+                    total += tensor.nelement() * tensor.element_size()
+        return total / (1024 * 1024)
+    
+    @classmethod
+    def _carregar_rapido(cls, caminho):
+        """
+        Lê o modelo já montado do cache rápido
+        
+        O arquivo guarda o módulo inteiro: não há inicialização aleatória
+        dos pesos nem cópia do checkpoint para o modelo, e o mmap só lê do
+        disco o que for usado.
+        
+        Returns:
+            whisper.model.Whisper: Modelo, ou None se o arquivo não servir
+        """
+        try:
+            # Arquivo criado por este programa, por isso weights_only=False
+            modelo = torch.load(caminho, map_location='cpu', mmap=True, weights_only=False)
+        except Exception as e:
+            print(f"⚠️  Cache rápido inválido ({e}); carregando o checkpoint")
+            return None
+        
+        dispositivo = 'cuda' if torch.cuda.is_available() else 'cpu'
+        return modelo.to(dispositivo)
+    
+    @classmethod
+    def _salvar_rapido(cls, modelo, caminho):
+        """Grava o modelo no formato de carga rápida"""
+        os.makedirs(os.path.dirname(caminho), exist_ok=True)
+        temporario = caminho + '.parcial'
+        torch.save(modelo, temporario)
+        os.replace(temporario, caminho)
+        print(f"💾 Cache rápido do modelo salvo: {caminho}")
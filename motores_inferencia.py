@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+⚙️ Motores de Inferência
+Autor: Diego Sottani
+
+Interface única entre o TranscritorVideos e a biblioteca que roda o modelo:
+- carregar: devolve o modelo pronto (um por processo, como o RegistroModelos)
+- transcrever: devolve o resultado no formato do whisper.transcribe
+  (text, segments, language), o mesmo que gera os .txt/.json/.md
+- descarregar: libera o modelo do registro do processo
+
+Motores disponíveis:
+- whisper: openai-whisper (PyTorch), o padrão
+- faster-whisper: CTranslate2, com int8 em CPU pelo --quantizar
+"""
+
+import time
+import threading
+
+import torch
+
+from modelos_whisper import RegistroModelos
+
+
+class MotorWhisper:
+    """Motor padrão: openai-whisper em PyTorch"""
+    
+    NOME = 'whisper'
+    
+    @classmethod
+    def carregar(cls, nome, compartilhado=True, cache_rapido=False, quantizar=False,
+                 threads=None):
+        """
+        Carrega o modelo pelo RegistroModelos
+        
+        Args:
+            nome: Nome do modelo Whisper (tiny, base...)
+            compartilhado: Reaproveita a cópia já carregada neste processo
+            cache_rapido: Usa a cópia local de carga rápida
+            quantizar: Quantização dinâmica int8 das camadas lineares (CPU)
+            threads: Não usado (as threads do torch são definidas pelo
+                OrcamentoCPU antes da carga)
+        
+        Returns:
+            whisper.model.Whisper: Modelo pronto para transcrever
+        """
+        return RegistroModelos.obter(nome, compartilhado=compartilhado,
+                                     cache_rapido=cache_rapido, quantizar=quantizar)
+    
+    @classmethod
+    def transcrever(cls, modelo, audio, idioma=None, prompt=None, verbose=False, **opcoes):
+        """
+        Transcreve um array de áudio
+        
+        Args:
+            modelo: Modelo devolvido por carregar
+            audio: Array float32 a 16 kHz
+            idioma: Código do idioma ou None para detectar
+            prompt: Texto inicial (contexto) para o decodificador
+            verbose: True mostra os segmentos, None não mostra nada
+            **opcoes: condition_on_previous_text, temperature
+        
+        Returns:
+            dict: Resultado do whisper.transcribe
+        """
+        return modelo.transcribe(audio, language=idioma, verbose=verbose,
+                                 initial_prompt=prompt, **opcoes)
+    
+    @classmethod
+    def descarregar(cls, nome):
+        """Remove o modelo do registro do processo"""
+        RegistroModelos.descarregar(nome)
+
+
+class MotorFasterWhisper:
+    """Motor faster-whisper (CTranslate2): mesmo modelo, outra implementação"""
+    
+    NOME = 'faster-whisper'
+    
+    # Mesma decodificação do whisper.transcribe: gulosa em temperatura 0 e
+    # best-of-5 no fallback (o faster-whisper usa beam search 5 por padrão)
+    TAMANHO_FEIXE = 1
+    
+    # Modelos compartilhados deste processo: {(nome, compute_type, threads): modelo}
+    _modelos = {}
+    _trava = threading.Lock()
+    
+    @classmethod
+    def carregar(cls, nome, compartilhado=True, cache_rapido=False, quantizar=False,
+                 threads=None):
+        """
+        Carrega o modelo convertido para o CTranslate2
+        
+        Args:
+            nome: Nome do modelo (tiny, base... baixado do Hugging Face na
+                primeira vez) ou pasta de um modelo já convertido
+            compartilhado: Reaproveita a cópia já carregada neste processo
+            cache_rapido: Não usado (o CTranslate2 já lê o modelo convertido
+                direto do disco)
+            quantizar: Pesos e cálculos em int8 (compute_type int8)
+            threads: Threads do CTranslate2 (None = padrão da biblioteca)
+        
+        Returns:
+            faster_whisper.WhisperModel: Modelo pronto para transcrever
+        
+        Raises:
+            ImportError: Se o faster-whisper não estiver instalado
+        """
+        try:
+            from faster_whisper import WhisperModel
+        except ImportError:
+            raise ImportError("O motor faster-whisper precisa do pacote: "
+                              "pip install faster-whisper")
+        
+        dispositivo = 'cuda' if torch.cuda.is_available() else 'cpu'
+        if quantizar:
+            tipo = 'int8_float16' if dispositivo == 'cuda' else 'int8'
+        else:
+            tipo = 'float16' if dispositivo == 'cuda' else 'float32'
+        
+        def carregar_modelo():
+            print(f"🔄 Carregando modelo faster-whisper '{nome}' ({tipo})...")
+            inicio = time.perf_counter()
+            modelo = WhisperModel(nome, device=dispositivo, compute_type=tipo,
+                                  cpu_threads=threads or 0)
+            print(f"✅ Modelo carregado em {time.perf_counter() - inicio:.1f}s")
+            return modelo
+        
+        if not compartilhado:
+            return carregar_modelo()
+        
+        chave = (nome, tipo, threads)
+        with cls._trava:
+            if chave in cls._modelos:
+                print(f"♻️  Modelo faster-whisper '{nome}' já carregado neste processo")
+            else:
+                cls._modelos[chave] = carregar_modelo()
+            return cls._modelos[chave]
+    
+    @classmethod
+    def transcrever(cls, modelo, audio, idioma=None, prompt=None, verbose=False, **opcoes):
+        """
+        Transcreve um array de áudio e converte para o formato do Whisper
+        
+        Args:
+            modelo: Modelo devolvido por carregar
+            audio: Array float32 a 16 kHz
+            idioma: Código do idioma ou None para detectar
+            prompt: Texto inicial (contexto) para o decodificador
+            verbose: True mostra os segmentos, None não mostra nada
+            **opcoes: condition_on_previous_text, temperature
+        
+        Returns:
+            dict: text, segments e language como no whisper.transcribe
+        """
+        # Os segmentos são gerados sob demanda: a transcrição acontece no laço
+        gerador, info = modelo.transcribe(audio, language=idioma, initial_prompt=prompt,
+                                          beam_size=cls.TAMANHO_FEIXE, **opcoes)
+        
+        segmentos = []
+        for i, segmento in enumerate(gerador):
+            if verbose:
+                print(f"[{segmento.start:.3f} --> {segmento.end:.3f}] {segmento.text}")
+            segmentos.append({
+                'id': i,
+                'seek': segmento.seek,
+                'start': segmento.start,
+                'end': segmento.end,
+                'text': segmento.text,
+                'tokens': list(segmento.tokens),
+                'temperature': segmento.temperature,
+                'avg_logprob': segmento.avg_logprob,
+                'compression_ratio': segmento.compression_ratio,
+                'no_speech_prob': segmento.no_speech_prob,
+            })
+        
+        return {
+            'text': ''.join(segmento['text'] for segmento in segmentos),
+            'segments': segmentos,
+            'language': info.language,
+        }
+    
+    @classmethod
+    def descarregar(cls, nome):
+        """Remove o modelo do registro do processo"""
+        with cls._trava:
+            for chave in list(cls._modelos):
+                if chave[0] == nome:
+                    del cls._modelos[chave]
+
+
+MOTORES = {motor.NOME: motor for motor in (MotorWhisper, MotorFasterWhisper)}
+
+
+def obter_motor(nome):
+    """
+    Devolve a classe de um motor pelo nome
+    
+    Raises:
+        ValueError: Se o motor não existir
+    """
+    if nome not in MOTORES:
+        raise ValueError(f"Motor desconhecido: {nome} (disponíveis: {', '.join(MOTORES)})")
+    return MOTORES[nome]
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+🧮 Orçamento de CPU
+Autor: Diego Sottani
+
+Divide os núcleos da máquina entre os processos de transcrição:
+- Threads do torch (intra/inter-op) e do numba por processo
+- Mesmo número de threads para o FFmpeg de cada processo
+- Modo automático: mede o modelo com 1, 2, 4... threads e escolhe a
+  combinação processos x threads de maior vazão
+"""
+
+import os
+import json
+import time
+
+import numpy as np
+import torch
+import whisper
+
+from modelos_whisper import RegistroModelos
+
+
+class OrcamentoCPU:
+    """Classe para dividir os núcleos entre processos e threads"""
+    
+    ARQUIVO_CALIBRACAO = os.path.join(os.path.expanduser('~'), '.cache',
+                                      'transcricao_local', 'calibracao_threads.json')
+    
+    # Passos de decodificação medidos na calibração (~ tokens de uma janela de 30s)
+    PASSOS_DECODIFICACAO = 64
+    
+    # Entre combinações com vazão até 5% menor que a melhor, fica a de menos
+    # processos (menos cópias do modelo na memória)
+    TOLERANCIA_VAZAO = 0.05
+    
+    @staticmethod
+    def cpus_disponiveis():
+        """Núcleos que este processo pode usar (respeita taskset/cgroups de afinidade)"""
+        if hasattr(os, 'sched_getaffinity'):
+            return len(os.sched_getaffinity(0))
+        return os.cpu_count() or 1
+    
+    @classmethod
+    def threads_por_processo(cls, processos, threads=None):
+        """
+        Threads de cada processo
+        
+        Args:
+            processos: Processos (ou instâncias do modelo) rodando ao mesmo tempo
+            threads: Valor fixo pedido pelo usuário (None = dividir os núcleos)
+        
+        Returns:
+            int: Threads por processo, no mínimo 1
+        """
+        if threads:
+            return threads
+        return max(1, cls.cpus_disponiveis() // max(1, processos))
+    
+    @staticmethod
+    def aplicar(threads):
+        """
+        Limita as threads do torch e do numba neste processo
+        
+        Args:
+            threads: Threads de computação (intra-op) do processo
+        """
+        torch.set_num_threads(threads)
+        try:
+            # Só pode ser definido antes do primeiro uso do pool inter-op;
+            # a inferência do Whisper roda as operações em sequência
+            torch.set_num_interop_threads(1)
+        except RuntimeError:
+            pass
+        
+        try:
+            import numba
+            numba.set_num_threads(min(threads, numba.config.NUMBA_NUM_THREADS))
+        except (ImportError, ValueError):
+            pass
+    
+    @classmethod
+    def calibrar(cls, modelo, chave, max_processos=None):
+        """
+        Escolhe a divisão processos x threads de maior vazão
+        
+        As medidas por número de threads ficam guardadas por chave (modelo,
+        quantização, núcleos e versão do torch); só a escolha é refeita.
+        
+        Args:
+            modelo: Função que devolve o modelo Whisper carregado (só é
+                chamada se a chave ainda não foi medida)
+            chave: Identificação da configuração medida
+            max_processos: Limite de processos (None = limitado só pelos
+                núcleos e pela memória)
+        
+        Returns:
+            tuple: (processos, threads por processo)
+        """
+        cpus = cls.cpus_disponiveis()
+        chave = f"{chave}|cpus={cpus}|torch={torch.__version__}"
+        calibracoes = cls._ler_calibracoes()
+        
+        medidas = calibracoes.get(chave)
+        if medidas:
+            print(f"🧮 Calibração de threads reaproveitada ({cls.ARQUIVO_CALIBRACAO})")
+        else:
+            print(f"🧮 Calibrando threads ({cpus} núcleos)...")
+            medidas = cls._medir(modelo(), cpus)
+            calibracoes[chave] = medidas
+            cls._salvar_calibracoes(calibracoes)
+        
+        limite = min(cpus, max_processos or cpus, medidas['max_processos_memoria'])
+        # Vazão estimada: processos independentes, cada um com `threads` threads
+        opcoes = []
+        for threads, segundos in medidas['segundos_por_threads'].items():
+            processos = min(cpus // int(threads), limite)
+            if processos >= 1:
+                opcoes.append((processos / segundos, processos, int(threads)))
+        
+        melhor = max(vazao for vazao, _, _ in opcoes)
+        vazao, processos, threads = min(
+            (opcao for opcao in opcoes if opcao[0] >= melhor * (1 - cls.TOLERANCIA_VAZAO)),
+            key=lambda opcao: (opcao[1], -opcao[0])
+        )
+        
+        print(f"{'Threads':>9}{'Janela (s)':>12}{'Processos':>11}{'Janelas/min':>13}")
+        for vazao_opcao, processos_opcao, threads_opcao in sorted(opcoes, key=lambda o: o[2]):
+            marca = ' ✅' if threads_opcao == threads else ''
+            print(f"{threads_opcao:>9}{medidas['segundos_por_threads'][str(threads_opcao)]:>12.2f}"
+                  f"{processos_opcao:>11}{60 * vazao_opcao:>13.1f}{marca}")
+        print(f"🧮 Orçamento: {processos} processos x {threads} threads")
+        return processos, threads
+    
+    @classmethod
+    def _medir(cls, modelo, cpus):
+        """
+        Mede uma janela de 30s (encoder + passos do decoder) com 1, 2, 4...
+        threads até o total de núcleos
+        
+        Returns:
+            dict: Segundos por janela para cada número de threads e o limite
+                de processos pela memória
+        """
+        candidatos = sorted({2 ** i for i in range(cpus.bit_length()) if 2 ** i <= cpus} | {cpus})
+        
+        anteriores = torch.get_num_threads()
+        segundos = {}
+        try:
+            for threads in candidatos:
+                torch.set_num_threads(threads)
+                segundos[str(threads)] = round(cls.medir_janela(modelo), 4)
+        finally:
+            torch.set_num_threads(anteriores)
+        
+        return {
+            'segundos_por_threads': segundos,
+            'max_processos_memoria': cls._max_processos_memoria(modelo),
+        }
+    
+    @classmethod
+    def medir_janela(cls, modelo):
+        """
+        Segundos para processar uma janela de 30s com as threads atuais
+        
+        Returns:
+            float: Tempo da segunda execução (a primeira é aquecimento)
+        """
+        mel = whisper.log_mel_spectrogram(
+            np.zeros(whisper.audio.N_SAMPLES, dtype=np.float32), modelo.dims.n_mels
+        ).to(modelo.device)[None]
+        cls._janela(modelo, mel)
+        inicio = time.perf_counter()
+        cls._janela(modelo, mel)
+        return time.perf_counter() - inicio
+    
+    @classmethod
+    def _janela(cls, modelo, mel):
+        """Processa uma janela como o Whisper: encoder e decodificação token a token"""
+        with torch.inference_mode():
+            audio = modelo.embed_audio(mel)
+            cache, ganchos = modelo.install_kv_cache_hooks()
+            try:
+                tokens = torch.zeros((1, 1), dtype=torch.long, device=mel.device)
+                for _ in range(cls.PASSOS_DECODIFICACAO):
+                    modelo.decoder(tokens, audio, kv_cache=cache)
+            finally:
+                for gancho in ganchos:
+                    gancho.remove()
+    
+    @staticmethod
+    def _max_processos_memoria(modelo):
+        """
+        Processos que cabem em 80% da memória física (estimativa: pesos +
+        50% de ativações + 500 MB por processo)
+        """
+        try:
+            memoria_mb = os.sysconf('SC_PHYS_PAGES') * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+        except (ValueError, OSError, AttributeError):
+            return os.cpu_count() or 1
+        pesos_mb = RegistroModelos.tamanho_mb(modelo)
+        return max(1, int(0.8 * memoria_mb / (1.5 * pesos_mb + 500)))
+    
+    @classmethod
+    def _ler_calibracoes(cls):
+        """Calibrações guardadas: {chave: medidas}"""
+        try:
+            with open(cls.ARQUIVO_CALIBRACAO, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    @classmethod
+    def _salvar_calibracoes(cls, calibracoes):
+        """Grava as calibrações de forma atômica"""
+        os.makedirs(os.path.dirname(cls.ARQUIVO_CALIBRACAO), exist_ok=True)
+        temporario = cls.ARQUIVO_CALIBRACAO + '.tmp'
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump(calibracoes, f, ensure_ascii=False, indent=2)
+        os.replace(temporario, cls.ARQUIVO_CALIBRACAO)
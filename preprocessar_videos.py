@@ -11,35 +11,179 @@ Ferramentas para preparar vídeos antes da transcrição:
 """
 
 import os
+import re
+import csv
+import shutil
+import sqlite3
+import tempfile
+import threading
 import subprocess
 import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 import json
 
+import numpy as np
+
+from indice_metadados import IndiceMetadados
+from impressao_audio import ImpressaoAudio
+
 
 class PreProcessadorVideo:
     """Classe para pré-processar vídeos antes da transcrição"""
     
     EXTENSOES_VIDEO = {'.mp4', '.avi', '.mov', '.mkv', '.flv', '.wmv', '.webm'}
-    EXTENSOES_AUDIO = {'.mp3', '.wav', '.m4a', '.flac', '.ogg'}
+    EXTENSOES_AUDIO = {'.mp3', '.wav', '.m4a', '.flac', '.ogg', '.opus'}
     
-    @staticmethod
-    def verificar_ffmpeg():
-        """Verifica se FFmpeg está instalado"""
+    # Filtros usados por limpar_audio e pela decodificação em memória
+    FILTRO_LIMPEZA = 'highpass=f=200,lowpass=f=3000,loudnorm'
+    
+    # Resultado de verificar_ffmpeg, guardado na primeira chamada do processo
+    _ffmpeg_disponivel = None
+    
+    # Saídas são gravadas com este sufixo e renomeadas só quando o FFmpeg termina
+    SUFIXO_TEMPORARIO = '.parcial'
+    
+    # Muxer do FFmpeg para cada formato de saída (padrão: o próprio nome)
+    MUXERS = {'m4a': 'ipod'}
+    
+    # Formatos das partes só com áudio e as opções de codificação de cada um
+    FORMATOS_PARTES_AUDIO = {
+        'wav': [],
+        'flac': ['-c:a', 'flac'],
+        'opus': ['-c:a', 'libopus', '-b:a', '32k'],
+    }
+    
+    def __init__(self, caminho_indice=None, usar_indice=True, threads=None):
+        """
+        Inicializa o pré-processador
+        
+        Args:
+            caminho_indice: Arquivo do índice de metadados do ffprobe
+                (padrão: ~/.cache/transcricao_local/indice_metadados.sqlite)
+            usar_indice: Guarda e reaproveita os resultados do ffprobe
+            threads: Threads de cada processo FFmpeg (decodificação, filtros
+                e codificação); None deixa o FFmpeg decidir
+        """
+        self.caminho_indice = caminho_indice
+        self.usar_indice = usar_indice
+        self.threads = threads
+        self._indice = None
+        
+        # Processos FFmpeg em andamento, para cancelar um lote no Ctrl+C
+        self._processos = set()
+        self._trava = threading.Lock()
+        self._cancelado = threading.Event()
+    
+    @classmethod
+    def verificar_ffmpeg(cls):
+        """Verifica se FFmpeg está instalado (uma vez por processo)"""
+        if cls._ffmpeg_disponivel is not None:
+            return cls._ffmpeg_disponivel
+        
         try:
             subprocess.run(['ffmpeg', '-version'], 
                          capture_output=True, 
                          check=True)
-            return True
+            cls._ffmpeg_disponivel = True
         except (subprocess.CalledProcessError, FileNotFoundError):
             print("❌ FFmpeg não encontrado! Instale com:")
             print("   Ubuntu/Debian: sudo apt install ffmpeg")
             print("   Mac: brew install ffmpeg")
             print("   Windows: https://ffmpeg.org/download.html")
-            return False
+            cls._ffmpeg_disponivel = False
+        return cls._ffmpeg_disponivel
+    
+    def _executar_ffmpeg(self, cmd, temporario=None, timeout=None):
+        """
+        Roda um comando FFmpeg que grava em `temporario`
+        
+        Se o FFmpeg falhar, estourar o tempo limite ou for cancelado, o
+        temporário é apagado; quem chama só renomeia a saída quando dá certo.
+        
+        Args:
+            cmd: Comando completo
+            temporario: Arquivo ou diretório de saída do comando (None se
+                o comando não grava nada)
+            timeout: Tempo máximo em segundos (None = sem limite)
+            
+        Returns:
+            tuple: (sucesso, mensagens de erro do FFmpeg)
+        """
+        # Verificar, iniciar e registrar sob a trava: um cancelar() no meio
+        # não deixa escapar um FFmpeg que ninguém vai matar
+        with self._trava:
+            if self._cancelado.is_set():
+                return False, 'cancelado'
+            processo = subprocess.Popen(self._com_threads(cmd),
+                                        stdin=subprocess.DEVNULL,
+                                        stdout=subprocess.DEVNULL,
+                                        stderr=subprocess.PIPE,
+                                        text=True)
+            self._processos.add(processo)
+        
+        try:
+            _, erros = processo.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            processo.kill()
+            processo.communicate()
+            erros = f"tempo limite de {timeout}s excedido"
+        except BaseException:
+            # Ctrl+C com um único arquivo: nada de saída pela metade
+            processo.kill()
+            processo.wait()
+            self._remover(temporario)
+            raise
+        finally:
+            with self._trava:
+                self._processos.discard(processo)
+        
+        if processo.returncode != 0 or self._cancelado.is_set():
+            self._remover(temporario)
+            return False, erros if not self._cancelado.is_set() else 'cancelado'
+        return True, erros
+    
+    def _com_threads(self, cmd):
+        """
+        Acrescenta o limite de threads a um comando FFmpeg
+        
+        -threads antes do -i vale para o decodificador e antes da saída
+        (último argumento) para o codificador; -filter_threads para os filtros.
+        """
+        if not self.threads:
+            return cmd
+        n = str(self.threads)
+        return [cmd[0], '-filter_threads', n, '-threads', n, *cmd[1:-1], '-threads', n, cmd[-1]]
+    
+    def _remover(self, caminho):
+        """Apaga um arquivo ou diretório temporário, se existir"""
+        if caminho is None:
+            return
+        if os.path.isdir(caminho):
+            shutil.rmtree(caminho, ignore_errors=True)
+        elif os.path.exists(caminho):
+            os.remove(caminho)
+    
+    def cancelar(self):
+        """Interrompe os processos FFmpeg em andamento e os que ainda iam começar"""
+        self._cancelado.set()
+        with self._trava:
+            processos = list(self._processos)
+        for processo in processos:
+            processo.kill()
+    
+    def _abrir_indice(self):
+        """Abre o índice de metadados, ou None se estiver desativado ou inacessível"""
+        if self._indice is None and self.usar_indice:
+            try:
+                self._indice = IndiceMetadados(self.caminho_indice)
+            except (OSError, sqlite3.Error) as e:
+                print(f"⚠️  Índice de metadados indisponível ({e}); usando só o ffprobe")
+                self.usar_indice = False
+        return self._indice
     
     def extrair_audio(self, video_path, output_dir, formato='wav', 
-                     sample_rate=16000, mono=True):
+                     sample_rate=16000, mono=True, timeout=None):
         """
         Extrai áudio de vídeo otimizado para Whisper
         
@@ -49,6 +193,7 @@ class PreProcessadorVideo:
             formato: Formato do áudio (wav, mp3)
             sample_rate: Taxa de amostragem (16000 Hz é ideal para Whisper)
             mono: Converter para mono (True recomendado)
+            timeout: Tempo máximo do FFmpeg em segundos (None = sem limite)
         """
         if not self.verificar_ffmpeg():
             return False
@@ -58,6 +203,7 @@ class PreProcessadorVideo:
             
             nome_arquivo = Path(video_path).stem
             output_path = os.path.join(output_dir, f"{nome_arquivo}.{formato}")
+            temporario = output_path + self.SUFIXO_TEMPORARIO
             
             print(f"🎵 Extraindo áudio de: {os.path.basename(video_path)}")
             
@@ -67,26 +213,26 @@ class PreProcessadorVideo:
                 '-vn',  # Sem vídeo
                 '-ar', str(sample_rate),  # Sample rate
                 '-ac', '1' if mono else '2',  # Canais
+                '-f', self.MUXERS.get(formato, formato),  # O temporário não tem a extensão
                 '-y',  # Sobrescrever sem perguntar
-                output_path
+                temporario
             ]
             
-            result = subprocess.run(cmd, 
-                                  capture_output=True, 
-                                  text=True)
+            ok, erros = self._executar_ffmpeg(cmd, temporario, timeout)
             
-            if result.returncode == 0:
+            if ok:
+                os.replace(temporario, output_path)
                 print(f"✅ Áudio extraído: {output_path}")
                 return True
             else:
-                print(f"❌ Erro ao extrair áudio: {result.stderr}")
+                print(f"❌ Erro ao extrair áudio: {erros}")
                 return False
                 
         except Exception as e:
             print(f"❌ Erro: {str(e)}")
             return False
     
-    def limpar_audio(self, audio_path, output_dir):
+    def limpar_audio(self, audio_path, output_dir, timeout=None):
         """
         Limpa e normaliza áudio para melhor transcrição
         
@@ -94,6 +240,11 @@ class PreProcessadorVideo:
         - Remoção de ruído de fundo
         - Normalização de volume
         - Filtro passa-alta/passa-baixa
+        
+        Args:
+            audio_path: Caminho do áudio
+            output_dir: Diretório de saída
+            timeout: Tempo máximo do FFmpeg em segundos (None = sem limite)
         """
         if not self.verificar_ffmpeg():
             return False
@@ -103,51 +254,131 @@ class PreProcessadorVideo:
             
             nome_arquivo = Path(audio_path).stem
             output_path = os.path.join(output_dir, f"{nome_arquivo}_limpo.wav")
+            temporario = output_path + self.SUFIXO_TEMPORARIO
             
             print(f"🧹 Limpando áudio: {os.path.basename(audio_path)}")
             
             # Comando FFmpeg com filtros
             cmd = [
                 'ffmpeg', '-i', audio_path,
-                '-af', 'highpass=f=200,lowpass=f=3000,loudnorm',
+                '-af', self.FILTRO_LIMPEZA,
                 '-ar', '16000',
                 '-ac', '1',
+                '-f', 'wav',
                 '-y',
-                output_path
+                temporario
             ]
             
-            result = subprocess.run(cmd, 
-                                  capture_output=True, 
-                                  text=True)
+            ok, erros = self._executar_ffmpeg(cmd, temporario, timeout)
             
-            if result.returncode == 0:
+            if ok:
+                os.replace(temporario, output_path)
                 print(f"✅ Áudio limpo: {output_path}")
                 return True
             else:
-                print(f"❌ Erro ao limpar áudio: {result.stderr}")
+                print(f"❌ Erro ao limpar áudio: {erros}")
                 return False
                 
         except Exception as e:
             print(f"❌ Erro: {str(e)}")
             return False
     
-    def dividir_video(self, video_path, output_dir, duracao_chunk=30):
+    def carregar_audio(self, video_path, limpar=False, sample_rate=16000):
+        """
+        Decodifica o áudio direto para a memória, sem arquivos intermediários
+        
+        Um único processo FFmpeg extrai o áudio, aplica os filtros de
+        limpeza (opcional) e envia PCM float32 mono pelo pipe.
+        
+        Args:
+            video_path: Caminho do vídeo ou áudio
+            limpar: Aplicar os mesmos filtros de limpar_audio
+            sample_rate: Taxa de amostragem (16000 Hz é o que o Whisper usa)
+            
+        Returns:
+            np.ndarray: Amostras float32 entre -1 e 1
+            
+        Raises:
+            RuntimeError: Se o FFmpeg falhar ao decodificar o arquivo
+        """
+        cmd = [
+            'ffmpeg', '-nostdin',
+            '-loglevel', 'error',
+            '-i', video_path,
+            '-vn',
+        ]
+        if limpar:
+            cmd += ['-af', self.FILTRO_LIMPEZA]
+        cmd += [
+            '-ar', str(sample_rate),
+            '-ac', '1',
+            '-f', 'f32le',
+            '-'
+        ]
+        
+        # Erros vão para um arquivo temporário: num pipe, um arquivo
+        # danificado (uma linha por quadro) enche o buffer e trava o FFmpeg
+        with tempfile.TemporaryFile() as saida_erros:
+            processo = subprocess.Popen(self._com_threads(cmd),
+                                        stdout=subprocess.PIPE,
+                                        stderr=saida_erros)
+            
+            # bytearray cresce sem cópias extras e dá um array NumPy gravável
+            buffer = bytearray()
+            while True:
+                bloco = processo.stdout.read(1 << 20)
+                if not bloco:
+                    break
+                buffer += bloco
+            processo.wait()
+            
+            saida_erros.seek(0)
+            erros = saida_erros.read().decode('utf-8', errors='replace')
+        
+        if processo.returncode != 0:
+            raise RuntimeError(f"FFmpeg falhou ao decodificar {video_path}: {erros}")
+        
+        return np.frombuffer(buffer, dtype=np.float32)
+    
+    def dividir_video(self, video_path, output_dir, duracao_chunk=30, timeout=None,
+                      formato_audio=None):
         """
         Divide vídeo em chunks menores
         
+        As partes são gravadas em um diretório temporário e só vão para
+        output_dir quando o FFmpeg termina com sucesso.
+        
         Args:
             video_path: Caminho do vídeo
             output_dir: Diretório de saída
             duracao_chunk: Duração de cada chunk em minutos
+            timeout: Tempo máximo do FFmpeg em segundos (None = sem limite)
+            formato_audio: Gera partes só com áudio (16 kHz mono) neste
+                formato (wav, flac, opus) em vez de copiar o vídeo inteiro
         """
         if not self.verificar_ffmpeg():
             return False
         
+        if formato_audio:
+            print(f"✂️  Dividindo áudio em partes de {duracao_chunk} minutos ({formato_audio})")
+            try:
+                return self._dividir_audio(video_path, output_dir,
+                                           ['-segment_time', str(duracao_chunk * 60)],
+                                           formato_audio,
+                                           {'modo': 'fixo', 'duracao_chunk_minutos': duracao_chunk},
+                                           timeout)
+            except Exception as e:
+                print(f"❌ Erro: {str(e)}")
+                return False
+        
         try:
             os.makedirs(output_dir, exist_ok=True)
             
             nome_arquivo = Path(video_path).stem
-            output_pattern = os.path.join(output_dir, f"{nome_arquivo}_parte_%03d.mp4")
+            temporario = os.path.join(output_dir, f".{nome_arquivo}_partes{self.SUFIXO_TEMPORARIO}")
+            self._remover(temporario)
+            os.makedirs(temporario)
+            output_pattern = os.path.join(temporario, f"{nome_arquivo}_parte_%03d.mp4")
             
             print(f"✂️  Dividindo vídeo em chunks de {duracao_chunk} minutos")
             
@@ -163,33 +394,299 @@ class PreProcessadorVideo:
                 output_pattern
             ]
             
-            result = subprocess.run(cmd, 
-                                  capture_output=True, 
-                                  text=True)
+            ok, erros = self._executar_ffmpeg(cmd, temporario, timeout)
             
-            if result.returncode == 0:
-                # Contar quantos arquivos foram criados
-                chunks = list(Path(output_dir).glob(f"{nome_arquivo}_parte_*.mp4"))
+            if ok:
+                # Mover as partes prontas para a pasta de saída
+                chunks = sorted(Path(temporario).glob(f"{nome_arquivo}_parte_*.mp4"))
+                for chunk in chunks:
+                    os.replace(chunk, os.path.join(output_dir, chunk.name))
+                os.rmdir(temporario)
                 print(f"✅ Vídeo dividido em {len(chunks)} partes")
                 return True
             else:
-                print(f"❌ Erro ao dividir vídeo: {result.stderr}")
+                print(f"❌ Erro ao dividir vídeo: {erros}")
                 return False
                 
         except Exception as e:
             print(f"❌ Erro: {str(e)}")
             return False
     
+    def encontrar_silencios_arquivo(self, video_path, limiar_db=-40, duracao_min=0.3,
+                                    timeout=None):
+        """
+        Encontra silêncios direto no arquivo, com o filtro silencedetect
+        
+        Uma passada do FFmpeg em áudio mono de 8 kHz; nada é carregado na
+        memória, então serve para arquivos de muitas horas.
+        
+        Args:
+            video_path: Caminho do vídeo ou áudio
+            limiar_db: Energia (dBFS) abaixo da qual o áudio é silêncio
+            duracao_min: Duração mínima de um silêncio em segundos
+            timeout: Tempo máximo do FFmpeg em segundos (None = sem limite)
+            
+        Returns:
+            tuple: (silencios, duracao) com tuplas (inicio, fim) em segundos,
+                ou None se o FFmpeg falhar
+        """
+        cmd = [
+            'ffmpeg', '-nostdin', '-nostats',
+            '-i', video_path,
+            '-vn', '-ac', '1', '-ar', '8000',
+            '-af', f'silencedetect=noise={limiar_db}dB:d={duracao_min}',
+            '-f', 'null', '-'
+        ]
+        ok, saida = self._executar_ffmpeg(cmd, timeout=timeout)
+        if not ok:
+            print(f"❌ Erro ao analisar silêncios: {saida}")
+            return None
+        
+        duracao = re.search(r'Duration: (\d+):(\d+):(\d+(?:\.\d+)?)', saida)
+        if duracao:
+            horas, minutos, segundos = duracao.groups()
+            duracao = int(horas) * 3600 + int(minutos) * 60 + float(segundos)
+        else:
+            info = self.obter_info_video(video_path)
+            duracao = info['duracao_segundos'] if info else 0.0
+        
+        inicios = [float(t) for t in re.findall(r'silence_start: (-?[\d.]+)', saida)]
+        fins = [float(t) for t in re.findall(r'silence_end: ([\d.]+)', saida)]
+        # Um silêncio que vai até o fim do arquivo não tem silence_end
+        fins += [duracao] * (len(inicios) - len(fins))
+        
+        silencios = [(max(0.0, inicio), fim) for inicio, fim in zip(inicios, fins)]
+        return silencios, duracao
+    
+    def dividir_em_silencios(self, video_path, output_dir, duracao_chunk=30,
+                             tolerancia=60, timeout=None, formato_audio='wav'):
+        """
+        Divide o áudio em partes cortadas em silêncios
+        
+        Uma passada do silencedetect escolhe os cortes (o silêncio mais
+        próximo de cada múltiplo de duracao_chunk, dentro da tolerância) e
+        uma segunda passada grava as partes só com áudio (16 kHz mono), junto
+        com um manifesto com o início de cada parte no arquivo original.
+        
+        Args:
+            video_path: Caminho do vídeo ou áudio
+            output_dir: Diretório de saída
+            duracao_chunk: Duração desejada de cada parte em minutos
+            tolerancia: Distância máxima (segundos) entre o corte e o alvo
+            timeout: Tempo máximo de cada FFmpeg em segundos (None = sem limite)
+            formato_audio: Formato das partes (wav, flac, opus)
+        """
+        if not self.verificar_ffmpeg():
+            return False
+        
+        try:
+            print(f"🔇 Procurando silêncios em: {os.path.basename(video_path)}")
+            analise = self.encontrar_silencios_arquivo(video_path, timeout=timeout)
+            if analise is None:
+                return False
+            silencios, duracao = analise
+            
+            cortes = self.escolher_pontos_corte(silencios, duracao, duracao_chunk * 60,
+                                                tolerancia)
+            print(f"✂️  {len(silencios)} silêncios encontrados; "
+                  f"{len(cortes) + 1} partes (alvo: {duracao_chunk} min cada)")
+            
+            if cortes:
+                segmentacao = ['-segment_times', ','.join(f"{corte:.3f}" for corte in cortes)]
+            else:
+                # Arquivo menor que uma parte: uma parte só
+                segmentacao = ['-segment_time', str(int(duracao) + 1)]
+            
+            return self._dividir_audio(video_path, output_dir, segmentacao, formato_audio,
+                                       {'modo': 'silencio', 'duracao_chunk_minutos': duracao_chunk,
+                                        'tolerancia_segundos': tolerancia},
+                                       timeout)
+        
+        except Exception as e:
+            print(f"❌ Erro: {str(e)}")
+            return False
+    
+    def _dividir_audio(self, video_path, output_dir, segmentacao, formato, manifesto,
+                       timeout=None):
+        """
+        Grava as partes só com áudio (16 kHz mono) em uma única passada
+        
+        O segment muxer do FFmpeg informa o início e o fim reais de cada
+        parte, que vão para o manifesto `<nome>_manifesto.json`.
+        
+        Args:
+            video_path: Caminho do vídeo ou áudio
+            output_dir: Diretório de saída
+            segmentacao: Opções do segment muxer (-segment_times ou -segment_time)
+            formato: Extensão das partes (wav, flac, opus)
+            manifesto: Campos extras do manifesto (modo e parâmetros)
+            timeout: Tempo máximo do FFmpeg em segundos (None = sem limite)
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        
+        nome_arquivo = Path(video_path).stem
+        temporario = os.path.join(output_dir, f".{nome_arquivo}_partes{self.SUFIXO_TEMPORARIO}")
+        self._remover(temporario)
+        os.makedirs(temporario)
+        lista = os.path.join(temporario, 'partes.csv')
+        
+        cmd = [
+            'ffmpeg', '-nostdin',
+            '-i', video_path,
+            '-vn', '-ac', '1', '-ar', '16000',
+            *self.FORMATOS_PARTES_AUDIO[formato],
+            '-f', 'segment',
+            *segmentacao,
+            '-segment_format', self.MUXERS.get(formato, formato),
+            '-segment_list', lista,
+            '-segment_list_type', 'csv',
+            '-reset_timestamps', '1',
+            '-y',
+            os.path.join(temporario, f"{nome_arquivo}_parte_%03d.{formato}")
+        ]
+        
+        ok, erros = self._executar_ffmpeg(cmd, temporario, timeout)
+        if not ok:
+            print(f"❌ Erro ao dividir áudio: {erros}")
+            return False
+        
+        # Linhas do CSV: arquivo, início, fim (segundos no arquivo original)
+        with open(lista, newline='', encoding='utf-8') as f:
+            partes = [
+                {'arquivo': arquivo, 'inicio': round(float(inicio), 3),
+                 'fim': round(float(fim), 3), 'duracao': round(float(fim) - float(inicio), 3)}
+                for arquivo, inicio, fim in csv.reader(f)
+            ]
+        # Com duração múltipla exata da parte, o muxer pode abrir uma última
+        # parte vazia (só o atraso do codificador); ela fica no temporário
+        partes = [parte for parte in partes if parte['duracao'] >= 0.05] or partes[:1]
+        
+        for parte in partes:
+            os.replace(os.path.join(temporario, parte['arquivo']),
+                       os.path.join(output_dir, parte['arquivo']))
+        self._remover(temporario)
+        
+        manifesto_path = os.path.join(output_dir, f"{nome_arquivo}_manifesto.json")
+        with open(manifesto_path + self.SUFIXO_TEMPORARIO, 'w', encoding='utf-8') as f:
+            json.dump({
+                'origem': os.path.abspath(video_path),
+                **manifesto,
+                'formato': formato,
+                'sample_rate': 16000,
+                'partes': partes
+            }, f, ensure_ascii=False, indent=2)
+        os.replace(manifesto_path + self.SUFIXO_TEMPORARIO, manifesto_path)
+        
+        print(f"✅ Áudio dividido em {len(partes)} partes")
+        print(f"📋 Manifesto: {manifesto_path}")
+        return True
+    
+    def idioma_guardado(self, video_path):
+        """Idioma detectado antes para o arquivo (índice de metadados), ou None"""
+        indice = self._abrir_indice()
+        if indice is None:
+            return None
+        try:
+            return indice.buscar_idioma(video_path)
+        except sqlite3.Error:
+            return None
+    
+    def guardar_idioma(self, video_path, idioma, probabilidade):
+        """Guarda o idioma detectado no índice de metadados (se disponível)"""
+        indice = self._abrir_indice()
+        if indice is None:
+            return
+        try:
+            indice.salvar_idioma(video_path, idioma, probabilidade)
+        except (OSError, sqlite3.Error) as e:
+            print(f"⚠️  Não foi possível guardar o idioma no índice: {e}")
+    
+    def impressao_audio(self, video_path):
+        """
+        Impressão digital do áudio de um arquivo (ver ImpressaoAudio)
+        
+        Calculada de uma decodificação a 4 kHz e guardada no índice de
+        metadados; o arquivo só é decodificado de novo se mudar.
+        
+        Returns:
+            tuple: (duração em segundos, impressão como np.ndarray uint32)
+        
+        Raises:
+            RuntimeError: Se o FFmpeg falhar ao decodificar o arquivo
+        """
+        indice = self._abrir_indice()
+        if indice is not None:
+            try:
+                guardada = indice.buscar_impressao(video_path, ImpressaoAudio.VERSAO)
+            except sqlite3.Error:
+                guardada = None
+            if guardada:
+                return guardada[0], np.frombuffer(guardada[1], dtype=np.uint32)
+        
+        audio = self.carregar_audio(video_path, sample_rate=ImpressaoAudio.TAXA_AMOSTRAGEM)
+        duracao = len(audio) / ImpressaoAudio.TAXA_AMOSTRAGEM
+        impressao = ImpressaoAudio.calcular(audio)
+        
+        if indice is not None:
+            try:
+                indice.salvar_impressao(video_path, ImpressaoAudio.VERSAO, duracao,
+                                        impressao.tobytes())
+            except (OSError, sqlite3.Error) as e:
+                print(f"⚠️  Não foi possível guardar a impressão no índice: {e}")
+        return duracao, impressao
+    
     def obter_info_video(self, video_path):
         """
         Obtém informações detalhadas do vídeo
         
+        Usa o índice de metadados quando o arquivo não mudou desde o último
+        ffprobe.
+        
         Returns:
             dict: Metadados do vídeo
         """
-        if not self.verificar_ffmpeg():
-            return None
+        return self.obter_info_lote([video_path]).get(video_path)
+    
+    def obter_info_lote(self, arquivos, threads=None):
+        """
+        Obtém as informações de vários arquivos
+        
+        Arquivos já presentes no índice (mesmo caminho, tamanho e data de
+        modificação) não chamam o ffprobe; os demais são consultados em
+        paralelo e gravados no índice de uma vez.
+        
+        Args:
+            arquivos: Caminhos dos arquivos
+            threads: Chamadas simultâneas ao ffprobe (padrão: núcleos + 4, até 32)
+            
+        Returns:
+            dict: {arquivo: metadados}; arquivos que o ffprobe não conseguiu
+                ler ficam de fora
+        """
+        if not arquivos:
+            return {}
         
+        indice = self._abrir_indice()
+        infos = indice.buscar(arquivos) if indice else {}
+        faltando = [arquivo for arquivo in arquivos if arquivo not in infos]
+        if not faltando or not self.verificar_ffmpeg():
+            return infos
+        
+        # O ffprobe passa a maior parte do tempo esperando o disco
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            novos = {
+                arquivo: info
+                for arquivo, info in zip(faltando, executor.map(self._executar_ffprobe, faltando))
+                if info
+            }
+        
+        if indice and novos:
+            indice.salvar(novos)
+        infos.update(novos)
+        return infos
+    
+    def _executar_ffprobe(self, video_path):
+        """Chama o ffprobe e extrai os metadados usados pelo projeto"""
         try:
             cmd = [
                 'ffprobe', '-v', 'quiet',
@@ -234,6 +731,114 @@ class PreProcessadorVideo:
             print(f"❌ Erro: {str(e)}")
             return None
     
+    def encontrar_silencios(self, audio, sample_rate=16000, limiar_db=-40,
+                            duracao_min=0.3):
+        """
+        Encontra trechos de silêncio em um áudio já decodificado
+        
+        Mede a energia RMS em janelas de 30 ms e agrupa janelas consecutivas
+        abaixo do limiar.
+        
+        Args:
+            audio: Array NumPy float32 mono (amostras entre -1 e 1)
+            sample_rate: Taxa de amostragem do array
+            limiar_db: Energia (dBFS) abaixo da qual a janela é silêncio
+            duracao_min: Duração mínima de um silêncio em segundos
+            
+        Returns:
+            list: Tuplas (inicio, fim) em segundos
+        """
+        janela = int(sample_rate * 0.03)
+        n_janelas = len(audio) // janela
+        if n_janelas == 0:
+            return []
+        
+        quadros = audio[:n_janelas * janela].reshape(n_janelas, janela)
+        rms = np.sqrt(np.mean(quadros.astype(np.float64) ** 2, axis=1))
+        silencioso = 20 * np.log10(rms + 1e-10) < limiar_db
+        
+        # Bordas das sequências de janelas silenciosas
+        bordas = np.diff(np.concatenate(([0], silencioso.astype(np.int8), [0])))
+        inicios = np.flatnonzero(bordas == 1)
+        fins = np.flatnonzero(bordas == -1)
+        
+        duracao_janela = janela / sample_rate
+        return [
+            (inicio * duracao_janela, fim * duracao_janela)
+            for inicio, fim in zip(inicios, fins)
+            if (fim - inicio) * duracao_janela >= duracao_min
+        ]
+    
+    def detectar_fala(self, audio, sample_rate=16000, limiar_db=-40,
+                      silencio_min=0.5, margem=0.2):
+        """
+        Detecta trechos com fala (VAD por energia)
+        
+        Tudo o que não for silêncio de pelo menos silencio_min segundos é
+        considerado fala. Cada trecho ganha uma margem para não cortar o
+        início e o fim das palavras.
+        
+        Args:
+            audio: Array NumPy float32 mono
+            sample_rate: Taxa de amostragem do array
+            limiar_db: Energia (dBFS) abaixo da qual a janela é silêncio
+            silencio_min: Menor pausa (segundos) que é removida
+            margem: Áudio (segundos) mantido antes e depois de cada trecho
+            
+        Returns:
+            list: Tuplas (inicio, fim) em segundos, sem sobreposição
+        """
+        duracao = len(audio) / sample_rate
+        silencios = self.encontrar_silencios(audio, sample_rate, limiar_db, silencio_min)
+        
+        trechos = []
+        inicio = 0.0
+        for inicio_silencio, fim_silencio in silencios + [(duracao, duracao)]:
+            if inicio_silencio > inicio:
+                trecho = (max(0.0, inicio - margem), min(duracao, inicio_silencio + margem))
+                # Margens podem encostar no trecho anterior
+                if trechos and trecho[0] <= trechos[-1][1]:
+                    trechos[-1] = (trechos[-1][0], trecho[1])
+                else:
+                    trechos.append(trecho)
+            inicio = fim_silencio
+        
+        return trechos
+    
+    @staticmethod
+    def escolher_pontos_corte(silencios, duracao_total, duracao_chunk,
+                              tolerancia=60):
+        """
+        Escolhe pontos de corte próximos de cada múltiplo de duracao_chunk
+        
+        Para cada corte desejado, usa o meio do silêncio mais próximo dentro
+        da janela de tolerância; sem silêncio na janela, corta no ponto exato.
+        
+        Args:
+            silencios: Tuplas (inicio, fim) em segundos
+            duracao_total: Duração do áudio em segundos
+            duracao_chunk: Duração desejada de cada parte em segundos
+            tolerancia: Distância máxima (segundos) entre o corte e o alvo
+            
+        Returns:
+            list: Instantes de corte em segundos, em ordem crescente
+        """
+        meios = [(inicio + fim) / 2 for inicio, fim in silencios]
+        cortes = []
+        ultimo = 0.0
+        
+        while duracao_total - ultimo > duracao_chunk:
+            alvo = ultimo + duracao_chunk
+            candidatos = [m for m in meios
+                          if abs(m - alvo) <= tolerancia and m > ultimo]
+            corte = min(candidatos, key=lambda m: abs(m - alvo)) if candidatos else alvo
+            if corte >= duracao_total:
+                break
+            cortes.append(corte)
+            ultimo = corte
+        
+        return cortes
+    
     def _formatar_duracao(self, segundos):
         """Formata segundos em HH:MM:SS"""
         horas = int(segundos // 3600)
@@ -241,7 +846,9 @@ class PreProcessadorVideo:
         segs = int(segundos % 60)
         return f"{horas:02d}:{minutos:02d}:{segs:02d}"
     
-    def processar_lote(self, input_dir, output_dir, operacao='extrair'):
+    def processar_lote(self, input_dir, output_dir, operacao='extrair', jobs=1,
+                       timeout=None, duracao_chunk=30, silencio=False, tolerancia=60,
+                       formato_audio=None):
         """
         Processa múltiplos vídeos em lote
         
@@ -249,6 +856,17 @@ class PreProcessadorVideo:
             input_dir: Diretório com vídeos
             output_dir: Diretório de saída
             operacao: 'extrair', 'limpar', 'dividir', 'info'
+            jobs: Processos FFmpeg simultâneos
+            timeout: Tempo máximo de cada FFmpeg em segundos (None = sem limite)
+            duracao_chunk: Duração das partes em minutos (apenas para 'dividir')
+            silencio: Divide em silêncios, gerando partes só com áudio (apenas
+                para 'dividir')
+            tolerancia: Distância máxima do corte ao alvo com silencio=True
+            formato_audio: Partes só com áudio neste formato (wav, flac, opus)
+                em vez de cópias do vídeo (apenas para 'dividir')
+        
+        Ctrl+C interrompe os FFmpeg em andamento e descarta as saídas
+        incompletas; os arquivos que já terminaram ficam.
         """
         # Buscar vídeos/áudios
         arquivos = []
@@ -268,20 +886,12 @@ class PreProcessadorVideo:
         
         sucesso = 0
         
-        for i, arquivo in enumerate(arquivos, 1):
-            print(f"\n📊 Progresso: {i}/{len(arquivos)}")
-            
-            if operacao == 'extrair':
-                if self.extrair_audio(str(arquivo), output_dir):
-                    sucesso += 1
-            elif operacao == 'limpar':
-                if self.limpar_audio(str(arquivo), output_dir):
-                    sucesso += 1
-            elif operacao == 'dividir':
-                if self.dividir_video(str(arquivo), output_dir):
-                    sucesso += 1
-            elif operacao == 'info':
-                info = self.obter_info_video(str(arquivo))
+        if operacao == 'info':
+            # Metadados de todos os arquivos de uma vez (índice + ffprobe em paralelo)
+            infos = self.obter_info_lote([str(arquivo) for arquivo in arquivos])
+            for i, arquivo in enumerate(arquivos, 1):
+                print(f"\n📊 Progresso: {i}/{len(arquivos)}")
+                info = infos.get(str(arquivo))
                 if info:
                     print(f"\n📹 {info['arquivo']}")
                     print(f"   Tamanho: {info['tamanho_mb']} MB")
@@ -289,6 +899,39 @@ class PreProcessadorVideo:
                     print(f"   Resolução: {info['resolucao']}")
                     print(f"   Áudio: {info['codec_audio']} @ {info['sample_rate']} Hz")
                     sucesso += 1
+        else:
+            if operacao == 'extrair':
+                tarefa = lambda arquivo: self.extrair_audio(arquivo, output_dir, timeout=timeout)
+            elif operacao == 'limpar':
+                tarefa = lambda arquivo: self.limpar_audio(arquivo, output_dir, timeout=timeout)
+            elif silencio:
+                tarefa = lambda arquivo: self.dividir_em_silencios(arquivo, output_dir, duracao_chunk,
+                                                                   tolerancia, timeout=timeout,
+                                                                   formato_audio=formato_audio or 'wav')
+            else:
+                tarefa = lambda arquivo: self.dividir_video(arquivo, output_dir, duracao_chunk,
+                                                            timeout=timeout,
+                                                            formato_audio=formato_audio)
+            
+            if jobs > 1:
+                print(f"⚙️  {jobs} processos FFmpeg simultâneos")
+            
+            self._cancelado.clear()
+            executor = ThreadPoolExecutor(max_workers=max(1, jobs))
+            futuros = [executor.submit(tarefa, str(arquivo)) for arquivo in arquivos]
+            try:
+                for i, futuro in enumerate(as_completed(futuros), 1):
+                    if futuro.result():
+                        sucesso += 1
+                    print(f"\n📊 Progresso: {i}/{len(arquivos)}")
+            except KeyboardInterrupt:
+                print(f"\n⛔ Cancelando: interrompendo os FFmpeg em andamento...")
+                self.cancelar()
+                executor.shutdown(wait=True, cancel_futures=True)
+                print(f"⛔ Cancelado; saídas incompletas foram descartadas")
+                print(f"✅ {sucesso}/{len(arquivos)} arquivos concluídos antes do cancelamento")
+                return
+            executor.shutdown()
         
         print(f"\n{'='*60}")
         print(f"✅ {sucesso}/{len(arquivos)} arquivos processados com sucesso")
@@ -316,8 +959,20 @@ Exemplos de uso:
   # Dividir vídeo longo em chunks de 20 minutos
   python preprocessar_videos.py dividir --input video_longo.mp4 --output chunks/ --duracao 20
 
+  # Dividir em partes de áudio FLAC de 20 minutos (sem o vídeo)
+  python preprocessar_videos.py dividir --input video_longo.mp4 --output chunks/ --duracao 20 --audio flac
+
+  # Dividir em silêncios, gerando partes só com áudio e um manifesto
+  python preprocessar_videos.py dividir --input video_longo.mp4 --output chunks/ --duracao 20 --silencio
+
   # Obter informações de vídeos
   python preprocessar_videos.py info --input video.mp4
+
+  # Extrair áudio de uma pasta com 8 FFmpeg simultâneos
+  python preprocessar_videos.py extrair --input pasta_videos/ --output audios/ --jobs 8
+
+  # 4 FFmpeg simultâneos com 2 threads cada
+  python preprocessar_videos.py extrair --input pasta_videos/ --output audios/ --jobs 4 --threads 2
         """
     )
     
@@ -345,6 +1000,50 @@ Exemplos de uso:
         help='Duração dos chunks em minutos (apenas para "dividir")'
     )
     
+    parser.add_argument(
+        '--silencio',
+        action='store_true',
+        help='Em "dividir", corta nos silêncios e gera partes só com áudio '
+             '(16 kHz mono) e um manifesto com o início de cada parte'
+    )
+    
+    parser.add_argument(
+        '--tolerancia',
+        type=int,
+        default=60,
+        help='Com --silencio, distância máxima (segundos) entre o corte e a '
+             'duração pedida (padrão: 60)'
+    )
+    
+    parser.add_argument(
+        '--audio',
+        choices=sorted(PreProcessadorVideo.FORMATOS_PARTES_AUDIO),
+        help='Em "dividir", gera partes só com áudio (16 kHz mono) neste '
+             'formato em vez de copiar o vídeo; o transcrever.py lê essas '
+             'partes direto'
+    )
+    
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        default=1,
+        help='Processos FFmpeg simultâneos ao processar uma pasta (padrão: 1)'
+    )
+    
+    parser.add_argument(
+        '--timeout',
+        type=int,
+        help='Tempo máximo de cada FFmpeg em segundos; '
+             'arquivos que passarem disso contam como erro'
+    )
+    
+    parser.add_argument(
+        '--threads', '-t',
+        type=int,
+        help='Threads de cada FFmpeg (padrão: núcleos divididos entre os --jobs; '
+             'com um único job, o FFmpeg decide)'
+    )
+    
     args = parser.parse_args()
     
     # Validar entrada
@@ -358,19 +1057,35 @@ Exemplos de uso:
         print(f"❌ Erro: --output é obrigatório para operação '{args.operacao}'")
         return
     
+    # Vários FFmpeg simultâneos dividem os núcleos em vez de cada um usar todos
+    threads = args.threads
+    if not threads and input_path.is_dir() and args.jobs > 1:
+        threads = max(1, (os.cpu_count() or 1) // args.jobs)
+    
     # Inicializar processador
-    processador = PreProcessadorVideo()
+    processador = PreProcessadorVideo(threads=threads)
     
     # Executar operação
     if input_path.is_file():
         # Arquivo único
-        if args.operacao == 'extrair':
-            processador.extrair_audio(str(input_path), args.output)
-        elif args.operacao == 'limpar':
-            processador.limpar_audio(str(input_path), args.output)
-        elif args.operacao == 'dividir':
-            processador.dividir_video(str(input_path), args.output, args.duracao)
-        elif args.operacao == 'info':
+        try:
+            if args.operacao == 'extrair':
+                processador.extrair_audio(str(input_path), args.output, timeout=args.timeout)
+            elif args.operacao == 'limpar':
+                processador.limpar_audio(str(input_path), args.output, timeout=args.timeout)
+            elif args.operacao == 'dividir' and args.silencio:
+                processador.dividir_em_silencios(str(input_path), args.output, args.duracao,
+                                                 args.tolerancia, timeout=args.timeout,
+                                                 formato_audio=args.audio or 'wav')
+            elif args.operacao == 'dividir':
+                processador.dividir_video(str(input_path), args.output, args.duracao,
+                                          timeout=args.timeout, formato_audio=args.audio)
+        except KeyboardInterrupt:
+            # O FFmpeg já foi interrompido e a saída incompleta apagada
+            print(f"\n⛔ Cancelado")
+            return
+        
+        if args.operacao == 'info':
             info = processador.obter_info_video(str(input_path))
             if info:
                 print(f"\n{'='*60}")
@@ -383,7 +1098,12 @@ Exemplos de uso:
         if args.operacao == 'info':
             processador.processar_lote(str(input_path), None, args.operacao)
         else:
-            processador.processar_lote(str(input_path), args.output, args.operacao)
+            processador.processar_lote(str(input_path), args.output, args.operacao,
+                                       jobs=args.jobs, timeout=args.timeout,
+                                       duracao_chunk=args.duracao,
+                                       silencio=args.silencio,
+                                       tolerancia=args.tolerancia,
+                                       formato_audio=args.audio)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+📝 Gravação Incremental das Transcrições
+Autor: Diego Sottani
+
+Grava .md, .txt e .json à medida que os segmentos saem do Whisper:
+- Arquivos .parcial que podem ser acompanhados com tail -f
+- Memória constante, independente do tamanho da transcrição
+- Arquivos finais montados por cópia em blocos e trocados de uma vez (os.replace)
+- Checkpoints para retomar uma transcrição interrompida
+"""
+
+import os
+import json
+import zlib
+import shutil
+from pathlib import Path
+
+from instrumentacao import MedidorEtapas
+
+
+class EscritorTranscricao:
+    """Classe para gravar as saídas de uma transcrição aos poucos"""
+    
+    SUFIXO_PARCIAL = '.parcial'
+    SUFIXO_CHECKPOINT = '.checkpoint.json'
+    
+    def __init__(self, transcritor, video_path, output_dir, checkpoint=None):
+        """
+        Abre os arquivos parciais de uma transcrição
+        
+        Args:
+            transcritor: TranscritorVideos que formata o markdown e os metadados
+            video_path: Caminho do vídeo de origem
+            output_dir: Diretório para salvar transcrições
+            checkpoint: Checkpoint lido com carregar_checkpoint; os parciais
+                voltam ao ponto do checkpoint e continuam dali. Sem ele, os
+                parciais e um checkpoint antigo são descartados.
+        """
+        self.transcritor = transcritor
+        self.video_path = video_path
+        self.nome_arquivo = Path(video_path).stem
+        
+        os.makedirs(output_dir, exist_ok=True)
+        base = os.path.join(output_dir, self.nome_arquivo)
+        self.md_path = f"{base}.md"
+        self.txt_path = f"{base}.txt"
+        self.json_path = f"{base}.json"
+        
+        # .md.parcial só tem os segmentos com timestamps; o cabeçalho depende
+        # dos metadados, que só existem no fim
+        self._parciais = {
+            'md': self.md_path + self.SUFIXO_PARCIAL,
+            'txt': self.txt_path + self.SUFIXO_PARCIAL,
+            'jsonl': f"{base}.jsonl{self.SUFIXO_PARCIAL}",
+        }
+        self.checkpoint_path = f"{base}{self.SUFIXO_CHECKPOINT}"
+        
+        self.idioma = None
+        self.fim = 0
+        self.total_segmentos = 0
+        self.dados_cache = None
+        
+        if checkpoint:
+            # Descarta o que foi gravado depois do último checkpoint
+            for tipo, caminho in self._parciais.items():
+                os.truncate(caminho, checkpoint['tamanhos'][tipo])
+            self.idioma = checkpoint['idioma']
+            self.fim = checkpoint['fim']
+            self.total_segmentos = checkpoint['total_segmentos']
+        elif os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
+        
+        modo = 'a' if checkpoint else 'w'
+        self._arquivos = {
+            tipo: open(caminho, modo, encoding='utf-8')
+            for tipo, caminho in self._parciais.items()
+        }
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        # Em caso de erro os .parcial ficam no disco com o que já foi transcrito
+        self._fechar()
+        return False
+    
+    def _fechar(self):
+        """Fecha os arquivos parciais que ainda estiverem abertos"""
+        for arquivo in self._arquivos.values():
+            arquivo.close()
+    
+    def adicionar(self, result):
+        """
+        Acrescenta um resultado parcial e descarrega os arquivos no disco
+        
+        Args:
+            result: Resultado no formato do Whisper (text, segments, language)
+        """
+        if self.idioma is None:
+            self.idioma = result.get('language')
+        
+        md = self._arquivos['md']
+        jsonl = self._arquivos['jsonl']
+        for segmento in result['segments']:
+            md.write(self.transcritor._markdown_segmento(segmento))
+            jsonl.write(json.dumps(segmento, ensure_ascii=False) + '\n')
+            self.fim = segmento['end']
+            self.total_segmentos += 1
+        self._arquivos['txt'].write(result['text'])
+        
+        for arquivo in self._arquivos.values():
+            arquivo.flush()
+    
+    @classmethod
+    def carregar_checkpoint(cls, video_path, output_dir):
+        """
+        Lê o checkpoint de uma transcrição interrompida
+        
+        Returns:
+            dict: Checkpoint (identidade, progresso e estado dos parciais) ou
+                None se não houver um checkpoint utilizável
+        """
+        base = os.path.join(output_dir, Path(video_path).stem)
+        try:
+            with open(f"{base}{cls.SUFIXO_CHECKPOINT}", encoding='utf-8') as f:
+                checkpoint = json.load(f)
+        except (OSError, ValueError):
+            return None
+        
+        # Os parciais precisam ter pelo menos o que o checkpoint registrou
+        parciais = {
+            'md': f"{base}.md{cls.SUFIXO_PARCIAL}",
+            'txt': f"{base}.txt{cls.SUFIXO_PARCIAL}",
+            'jsonl': f"{base}.jsonl{cls.SUFIXO_PARCIAL}",
+        }
+        for tipo, caminho in parciais.items():
+            if not os.path.exists(caminho) or os.path.getsize(caminho) < checkpoint['tamanhos'][tipo]:
+                return None
+        return checkpoint
+    
+    def salvar_checkpoint(self, identidade, progresso):
+        """
+        Grava o ponto atual: parciais em disco e o progresso da transcrição
+        
+        Args:
+            identidade: Arquivo de origem e opções; um checkpoint só é
+                retomado se a identidade ainda for a mesma
+            progresso: Estado do modo em partes (parte, offset, prompt...)
+        """
+        tamanhos = {}
+        for tipo, arquivo in self._arquivos.items():
+            arquivo.flush()
+            os.fsync(arquivo.fileno())
+            tamanhos[tipo] = arquivo.tell()
+        
+        checkpoint = {
+            'identidade': identidade,
+            'progresso': progresso,
+            'tamanhos': tamanhos,
+            'idioma': self.idioma,
+            'fim': self.fim,
+            'total_segmentos': self.total_segmentos,
+        }
+        temporario = self.checkpoint_path + '.tmp'
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump(checkpoint, f, ensure_ascii=False)
+        os.replace(temporario, self.checkpoint_path)
+    
+    def finalizar(self, vad=None, medidor=None, para_cache=False):
+        """
+        Monta os arquivos finais a partir dos parciais
+        
+        Args:
+            vad: Relatório do VAD para os metadados (opcional)
+            medidor: MedidorEtapas da transcrição; o resumo vai para os
+                metadados do .json como 'desempenho'. A etapa 'escrita'
+                cobre o .md e o .txt, gravados antes do .json.
+            para_cache: Montar também, dos parciais, o resultado comprimido
+                para o CacheTranscricoes (self.dados_cache)
+        
+        Returns:
+            dict: Metadados gerados
+        """
+        medidor = medidor or MedidorEtapas()
+        self._fechar()
+        metadados = self.transcritor._gerar_metadados(
+            self.video_path, self.idioma, self.fim, self.total_segmentos, vad
+        )
+        
+        with medidor.etapa('escrita'):
+            # 1. Markdown formatado: cabeçalho + texto + segmentos + rodapé
+            temporario = self.md_path + '.tmp'
+            with open(temporario, 'w', encoding='utf-8') as f:
+                f.write(self.transcritor._markdown_cabecalho(self.nome_arquivo, metadados))
+                self._copiar(self._parciais['txt'], f)
+                f.write(self.transcritor.MARKDOWN_TIMESTAMPS)
+                self._copiar(self._parciais['md'], f)
+                f.write(self.transcritor._markdown_rodape(self.nome_arquivo))
+            os.replace(temporario, self.md_path)
+            print(f"✅ Markdown salvo: {self.md_path}")
+            
+            # 2. Texto puro
+            os.replace(self._parciais['txt'], self.txt_path)
+            print(f"✅ Texto puro salvo: {self.txt_path}")
+        
+        if medidor.etapas:
+            metadados['desempenho'] = medidor.resumo()
+        
+        # 3. JSON com dados completos
+        temporario = self.json_path + '.tmp'
+        with open(temporario, 'w', encoding='utf-8') as f:
+            self._escrever_json(f, metadados)
+        os.replace(temporario, self.json_path)
+        print(f"✅ JSON salvo: {self.json_path}")
+        
+        if para_cache:
+            self.dados_cache = self._comprimir_resultado(vad)
+        
+        os.remove(self._parciais['md'])
+        os.remove(self._parciais['jsonl'])
+        if os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
+        return metadados
+    
+    def _comprimir_resultado(self, vad=None):
+        """
+        Resultado no formato guardado pelo CacheTranscricoes (JSON com zlib),
+        montado do .txt e do .jsonl.parcial sem ter a transcrição em memória
+        
+        Returns:
+            bytes: {text, segments, language e 'vad'} em JSON comprimido
+        """
+        compressor = zlib.compressobj()
+        blocos = [compressor.compress(b'{"text": "')]
+        
+        with open(self.txt_path, encoding='utf-8') as origem:
+            for bloco in iter(lambda: origem.read(64 * 1024), ''):
+                blocos.append(compressor.compress(
+                    json.dumps(bloco, ensure_ascii=False)[1:-1].encode('utf-8')))
+        
+        blocos.append(compressor.compress(b'", "segments": ['))
+        separador = b''
+        with open(self._parciais['jsonl'], encoding='utf-8') as origem:
+            for linha in origem:
+                blocos.append(compressor.compress(separador + linha.rstrip('\n').encode('utf-8')))
+                separador = b', '
+        
+        final = {'language': self.idioma or self.transcritor.idioma}
+        if vad is not None:
+            final['vad'] = vad
+        blocos.append(compressor.compress(
+            b'], ' + json.dumps(final, ensure_ascii=False)[1:].encode('utf-8')))
+        blocos.append(compressor.flush())
+        return b''.join(blocos)
+    
+    def _copiar(self, caminho, destino):
+        """Copia um arquivo parcial para o destino em blocos"""
+        with open(caminho, encoding='utf-8') as origem:
+            shutil.copyfileobj(origem, destino)
+    
+    def _escrever_json(self, f, metadados):
+        """
+        Grava o .json no mesmo formato de json.dump(..., indent=2), lendo o
+        texto e os segmentos dos parciais em vez de tê-los em memória
+        """
+        blocos = json.dumps(metadados, ensure_ascii=False, indent=2).replace('\n', '\n  ')
+        f.write('{\n  "metadados": ' + blocos + ',\n  "texto_completo": "')
+        
+        # Neste ponto o .txt final já está no lugar
+        with open(self.txt_path, encoding='utf-8') as origem:
+            for bloco in iter(lambda: origem.read(64 * 1024), ''):
+                f.write(json.dumps(bloco, ensure_ascii=False)[1:-1])
+        
+        f.write('",\n  "segmentos": [')
+        vazio = True
+        with open(self._parciais['jsonl'], encoding='utf-8') as origem:
+            for linha in origem:
+                segmento = json.dumps(json.loads(linha), ensure_ascii=False, indent=2)
+                f.write(('\n    ' if vazio else ',\n    ') + segmento.replace('\n', '\n    '))
+                vazio = False
+        f.write(']\n}' if vazio else '\n  ]\n}')
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+🎚️ Seleção Automática de Modelo por Prazo
+Autor: Diego Sottani
+
+Escolhe o modelo Whisper mais preciso que termina um lote dentro do prazo:
+- Fator de tempo real de cada modelo nesta máquina (tempo / duração do áudio)
+- Primeira estimativa por uma medição rápida do modelo; depois, a média das
+  transcrições reais, que vai sendo atualizada a cada arquivo
+- Plano por arquivo: parte do lote pode subir para o modelo seguinte se
+  sobrar tempo
+"""
+
+import os
+import sqlite3
+from contextlib import closing
+
+import torch
+
+from modelos_whisper import RegistroModelos
+from orcamento_cpu import OrcamentoCPU
+
+
+class SeletorModelos:
+    """Classe para estimar o custo de cada modelo e planejar um lote"""
+    
+    CAMINHO_PADRAO = os.path.join(os.path.expanduser('~'), '.cache',
+                                  'transcricao_local', 'fatores_tempo_real.sqlite')
+    
+    # Fração do prazo usada no plano; o resto é folga para erros de estimativa
+    MARGEM_PRAZO = 0.9
+    
+    # Segundos de áudio de uma janela do Whisper (unidade da medição rápida)
+    SEGUNDOS_JANELA = 30
+    
+    def __init__(self, quantizar=False, threads=None, caminho=None):
+        """
+        Abre (ou cria) a tabela de fatores de tempo real
+        
+        Args:
+            quantizar: Os fatores valem para o modelo quantizado (int8)
+            threads: Threads de cada processo que vai transcrever
+            caminho: Arquivo SQLite dos fatores (padrão: ~/.cache/transcricao_local/)
+        """
+        self.quantizar = quantizar
+        self.threads = threads or OrcamentoCPU.threads_por_processo(1)
+        self.caminho = caminho or self.CAMINHO_PADRAO
+        os.makedirs(os.path.dirname(os.path.abspath(self.caminho)), exist_ok=True)
+        
+        with closing(self._conectar()) as conexao, conexao:
+            conexao.execute("""
+                CREATE TABLE IF NOT EXISTS fatores (
+                    chave TEXT PRIMARY KEY,
+                    calibrado REAL,
+                    segundos REAL DEFAULT 0,
+                    duracao REAL DEFAULT 0
+                )
+            """)
+    
+    def _conectar(self):
+        """Abre uma conexão; os workers registram medidas ao mesmo tempo"""
+        conexao = sqlite3.connect(self.caminho, timeout=30)
+        conexao.execute('PRAGMA journal_mode=WAL')
+        return conexao
+    
+    def _chave(self, modelo):
+        """Os fatores dependem do modelo, da quantização e das threads por processo"""
+        return (f"{modelo}|quantizar={self.quantizar}|threads={self.threads}"
+                f"|torch={torch.__version__}")
+    
+    def registrar(self, modelo, duracao_audio, segundos):
+        """
+        Soma uma transcrição real à média do modelo
+        
+        Args:
+            modelo: Nome do modelo usado
+            duracao_audio: Duração do áudio transcrito em segundos
+            segundos: Tempo de processamento do arquivo (sem a carga do modelo)
+        """
+        if not duracao_audio:
+            return
+        with closing(self._conectar()) as conexao, conexao:
+            conexao.execute("""
+                INSERT INTO fatores (chave, segundos, duracao) VALUES (?, ?, ?)
+                ON CONFLICT(chave) DO UPDATE SET
+                    segundos = segundos + excluded.segundos,
+                    duracao = duracao + excluded.duracao
+            """, (self._chave(modelo), segundos, duracao_audio))
+    
+    def fator(self, modelo):
+        """
+        Fator de tempo real do modelo nesta máquina
+        
+        Usa a média das transcrições reais; sem nenhuma, mede o modelo uma
+        vez (carregando-o, o que pode baixar o checkpoint) e guarda a medida.
+        
+        Returns:
+            float: Segundos de processamento por segundo de áudio
+        """
+        chave = self._chave(modelo)
+        with closing(self._conectar()) as conexao:
+            linha = conexao.execute(
+                "SELECT calibrado, segundos, duracao FROM fatores WHERE chave = ?", (chave,)
+            ).fetchone()
+        
+        if linha and linha[2]:
+            return linha[1] / linha[2]
+        if linha and linha[0]:
+            return linha[0]
+        
+        print(f"🎚️  Medindo o modelo '{modelo}' nesta máquina ({self.threads} threads)...")
+        calibrado = self._medir(modelo)
+        with closing(self._conectar()) as conexao, conexao:
+            conexao.execute("""
+                INSERT INTO fatores (chave, calibrado) VALUES (?, ?)
+                ON CONFLICT(chave) DO UPDATE SET calibrado = excluded.calibrado
+            """, (chave, calibrado))
+        return calibrado
+    
+    def _medir(self, modelo):
+        """Fator estimado a partir de uma janela de 30s (encoder + decodificação)"""
+        carregado = RegistroModelos.obter(modelo, compartilhado=False, quantizar=self.quantizar)
+        anteriores = torch.get_num_threads()
+        torch.set_num_threads(self.threads)
+        try:
+            segundos = OrcamentoCPU.medir_janela(carregado)
+        finally:
+            torch.set_num_threads(anteriores)
+        return segundos / self.SEGUNDOS_JANELA
+    
+    def planejar(self, duracoes, prazo_horas, processos, modelos):
+        """
+        Escolhe um modelo para cada arquivo de forma a terminar no prazo
+        
+        Todos os arquivos recebem o modelo mais preciso que cabe no prazo; se
+        sobrar tempo, os arquivos mais longos que ainda couberem sobem para o
+        modelo seguinte. Um arquivo sozinho também precisa caber no prazo, já
+        que não é dividido entre processos.
+        
+        Args:
+            duracoes: {arquivo: duração em segundos}
+            prazo_horas: Tempo disponível para o lote inteiro
+            processos: Processos transcrevendo ao mesmo tempo
+            modelos: Nomes dos modelos, do menos para o mais preciso
+        
+        Returns:
+            dict: {arquivo: modelo}
+        """
+        prazo = prazo_horas * 3600 * self.MARGEM_PRAZO
+        capacidade = prazo * processos
+        total = sum(duracoes.values())
+        maior = max(duracoes.values(), default=0)
+        
+        # Os modelos são medidos do mais rápido para o mais lento e a busca
+        # para no primeiro que não cabe: os seguintes são ainda mais lentos
+        fatores = {}
+        escolhido = None
+        proximo = None
+        for modelo in modelos:
+            fatores[modelo] = self.fator(modelo)
+            if total * fatores[modelo] <= capacidade and maior * fatores[modelo] <= prazo:
+                escolhido = modelo
+            else:
+                proximo = modelo
+                break
+        
+        if escolhido is None:
+            escolhido = modelos[0]
+            print(f"⚠️  Nem o modelo '{escolhido}' termina no prazo; usando-o mesmo assim")
+        plano = {arquivo: escolhido for arquivo in duracoes}
+        
+        if proximo and escolhido != proximo:
+            sobra = capacidade - total * fatores[escolhido]
+            diferenca = fatores[proximo] - fatores[escolhido]
+            for arquivo in sorted(duracoes, key=duracoes.get, reverse=True):
+                custo = duracoes[arquivo] * diferenca
+                if custo <= sobra and duracoes[arquivo] * fatores[proximo] <= prazo:
+                    plano[arquivo] = proximo
+                    sobra -= custo
+        
+        self._imprimir_plano(plano, duracoes, fatores, prazo_horas, processos)
+        return plano
+    
+    def _imprimir_plano(self, plano, duracoes, fatores, prazo_horas, processos):
+        """Mostra quantos arquivos e horas de áudio vão para cada modelo"""
+        print(f"\n🎚️  Plano para {prazo_horas:g}h com {processos} processo(s):")
+        print(f"{'Modelo':<10}{'Fator':>8}{'Arquivos':>10}{'Áudio (h)':>11}{'Estimado (h)':>14}")
+        estimado_total = 0.0
+        for modelo, fator in fatores.items():
+            arquivos = [a for a, m in plano.items() if m == modelo]
+            if not arquivos:
+                continue
+            audio = sum(duracoes[a] for a in arquivos)
+            estimado = audio * fator / processos
+            estimado_total += estimado
+            print(f"{modelo:<10}{fator:>8.3f}{len(arquivos):>10}{audio / 3600:>11.2f}"
+                  f"{estimado / 3600:>14.2f}")
+        print(f"⏱️  Estimativa: {estimado_total / 3600:.2f}h de {prazo_horas:g}h")
@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""
+🌐 Serviço HTTP Local de Transcrição
+Autor: Diego Sottani
+
+API HTTP pequena sobre o TranscritorVideos, com modelos sempre carregados:
+- POST /transcricoes            envia um arquivo (corpo) ou {"caminho": ...}
+- GET  /transcricoes/<id>       estado e resultado em JSON
+- GET  /transcricoes/<id>/eventos  estado e resultado via SSE
+- GET  /saude                   instâncias, fila e capacidade
+
+Uso:
+    python transcrever.py serve --modelo base --instancias 2 --fila 16
+"""
+
+import os
+import json
+import uuid
+import queue
+import shutil
+import argparse
+import tempfile
+import threading
+from collections import OrderedDict
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlparse, parse_qs
+
+from transcrever import TranscritorVideos
+from orcamento_cpu import OrcamentoCPU
+from motores_inferencia import MOTORES, MotorWhisper
+
+
+class ServicoTranscricao:
+    """Classe que mantém as instâncias do modelo e a fila de trabalhos"""
+    
+    # Trabalhos finalizados mantidos em memória para consulta
+    MAX_TRABALHOS_GUARDADOS = 1000
+    
+    def __init__(self, instancias=1, profundidade_fila=16, **opcoes):
+        """
+        Carrega as instâncias do modelo e inicia uma thread para cada uma
+        
+        Args:
+            instancias: Número de modelos carregados (trabalhos simultâneos)
+            profundidade_fila: Trabalhos aguardando além dos em execução;
+                acima disso novos pedidos recebem 429
+            **opcoes: Repassadas ao TranscritorVideos (modelo, idioma, ...)
+        """
+        self.instancias = max(1, instancias)
+        self.fila = queue.Queue(maxsize=max(1, profundidade_fila))
+        self.trabalhos = OrderedDict()
+        self.trava = threading.Lock()
+        self.mudou = threading.Condition(self.trava)
+        self.pasta_uploads = tempfile.mkdtemp(prefix='transcricao_uploads_')
+        
+        # As instâncias transcrevem ao mesmo tempo: dividem os núcleos
+        opcoes['threads'] = OrcamentoCPU.threads_por_processo(self.instancias,
+                                                              opcoes.get('threads'))
+        
+        for i in range(self.instancias):
+            transcritor = TranscritorVideos(usar_cache=False, **opcoes)
+            # Cada instância tem a sua cópia: as threads transcrevem ao mesmo tempo
+            transcritor._carregar_modelo(compartilhado=False)
+            threading.Thread(target=self._executar, args=(transcritor,),
+                             name=f"transcritor-{i + 1}", daemon=True).start()
+    
+    def enviar(self, caminho, temporario=False, nome=None):
+        """
+        Coloca um arquivo na fila
+        
+        Args:
+            caminho: Arquivo a transcrever
+            temporario: Apagar o arquivo ao terminar (uploads)
+            nome: Nome original do arquivo enviado
+            
+        Returns:
+            dict: Trabalho criado, ou None se a fila estiver cheia
+        """
+        trabalho = {
+            'id': uuid.uuid4().hex,
+            'arquivo': nome or os.path.basename(caminho),
+            'estado': 'na_fila',
+            'resultado': None,
+            'erro': None
+        }
+        with self.trava:
+            try:
+                self.fila.put_nowait((trabalho['id'], caminho, temporario))
+            except queue.Full:
+                return None
+            self.trabalhos[trabalho['id']] = trabalho
+            self._descartar_antigos()
+        return dict(trabalho)
+    
+    def _descartar_antigos(self):
+        """Esquece os trabalhos finalizados mais antigos (chamar com a trava)"""
+        excesso = len(self.trabalhos) - self.MAX_TRABALHOS_GUARDADOS
+        for trabalho_id in list(self.trabalhos):
+            if excesso <= 0:
+                break
+            if self.trabalhos[trabalho_id]['estado'] in ('concluido', 'erro'):
+                del self.trabalhos[trabalho_id]
+                excesso -= 1
+    
+    def consultar(self, trabalho_id):
+        """Cópia do estado atual de um trabalho, ou None se não existir"""
+        with self.trava:
+            trabalho = self.trabalhos.get(trabalho_id)
+            return dict(trabalho) if trabalho else None
+    
+    def aguardar_mudanca(self, trabalho_id, estado_atual, timeout=15):
+        """Bloqueia até o estado do trabalho mudar (ou o timeout acabar)"""
+        with self.mudou:
+            self.mudou.wait_for(
+                lambda: self.trabalhos.get(trabalho_id, {}).get('estado') != estado_atual,
+                timeout=timeout
+            )
+            trabalho = self.trabalhos.get(trabalho_id)
+            return dict(trabalho) if trabalho else None
+    
+    def _atualizar(self, trabalho_id, **campos):
+        """Atualiza um trabalho e acorda quem está esperando por ele"""
+        with self.mudou:
+            if trabalho_id in self.trabalhos:
+                self.trabalhos[trabalho_id].update(campos)
+            self.mudou.notify_all()
+    
+    def _executar(self, transcritor):
+        """Loop de uma instância: pega trabalhos da fila e transcreve"""
+        while True:
+            trabalho_id, caminho, temporario = self.fila.get()
+            self._atualizar(trabalho_id, estado='processando')
+            try:
+                result = transcritor.transcrever(caminho)
+                metadados = transcritor._metadados_resultado(caminho, result)
+                self._atualizar(trabalho_id, estado='concluido', resultado={
+                    'metadados': metadados,
+                    'texto_completo': result['text'],
+                    'segmentos': result['segments']
+                })
+            except Exception as e:
+                self._atualizar(trabalho_id, estado='erro', erro=str(e))
+            finally:
+                if temporario and os.path.exists(caminho):
+                    os.remove(caminho)
+                self.fila.task_done()
+    
+    def encerrar(self):
+        """Apaga a pasta de uploads (e os arquivos enviados que ficaram nela)"""
+        shutil.rmtree(self.pasta_uploads, ignore_errors=True)
+    
+    def saude(self):
+        """Resumo da capacidade do serviço"""
+        with self.trava:
+            em_execucao = sum(1 for t in self.trabalhos.values()
+                              if t['estado'] == 'processando')
+        return {
+            'instancias': self.instancias,
+            'em_execucao': em_execucao,
+            'na_fila': self.fila.qsize(),
+            'capacidade_fila': self.fila.maxsize
+        }
+
+
+class ManipuladorHTTP(BaseHTTPRequestHandler):
+    """Rotas HTTP do serviço"""
+    
+    servico = None
+    
+    def _responder_json(self, status, dados, cabecalhos=None):
+        """Envia uma resposta JSON completa"""
+        corpo = json.dumps(dados, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(corpo)))
+        for nome, valor in (cabecalhos or {}).items():
+            self.send_header(nome, valor)
+        self.end_headers()
+        self.wfile.write(corpo)
+    
+    def _erro(self, status, mensagem):
+        """Resposta de erro no formato {"erro": ...}"""
+        self._responder_json(status, {'erro': mensagem})
+    
+    def do_GET(self):
+        partes = urlparse(self.path).path.strip('/').split('/')
+        
+        if partes == ['saude']:
+            return self._responder_json(HTTPStatus.OK, self.servico.saude())
+        
+        if len(partes) in (2, 3) and partes[0] == 'transcricoes':
+            trabalho = self.servico.consultar(partes[1])
+            if trabalho is None:
+                return self._erro(HTTPStatus.NOT_FOUND, 'trabalho não encontrado')
+            if len(partes) == 2:
+                return self._responder_json(HTTPStatus.OK, trabalho)
+            if partes[2] == 'eventos':
+                return self._transmitir_eventos(trabalho)
+        
+        self._erro(HTTPStatus.NOT_FOUND, 'rota não encontrada')
+    
+    def _transmitir_eventos(self, trabalho):
+        """Server-Sent Events: um evento por mudança de estado até o fim"""
+        self.send_response(HTTPStatus.OK)
+        self.send_header('Content-Type', 'text/event-stream; charset=utf-8')
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        
+        try:
+            while True:
+                evento = 'resultado' if trabalho['estado'] in ('concluido', 'erro') else 'estado'
+                dados = json.dumps(trabalho, ensure_ascii=False)
+                self.wfile.write(f"event: {evento}\ndata: {dados}\n\n".encode('utf-8'))
+                self.wfile.flush()
+                if evento == 'resultado':
+                    return
+                
+                estado = trabalho['estado']
+                trabalho = self.servico.aguardar_mudanca(trabalho['id'], estado)
+                if trabalho is None:
+                    return
+                if trabalho['estado'] == estado:
+                    # Comentário SSE mantém a conexão viva
+                    self.wfile.write(b": aguardando\n\n")
+                    self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+    
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path.rstrip('/') != '/transcricoes':
+            return self._erro(HTTPStatus.NOT_FOUND, 'rota não encontrada')
+        
+        try:
+            tamanho = int(self.headers.get('Content-Length', 0))
+        except ValueError:
+            tamanho = -1
+        # Negativo faria rfile.read esperar até o cliente fechar a conexão
+        if tamanho < 0:
+            return self._erro(HTTPStatus.BAD_REQUEST, 'Content-Length inválido')
+        tipo = self.headers.get('Content-Type', '')
+        
+        if tipo.startswith('application/json'):
+            # Caminho de um arquivo local
+            try:
+                caminho = json.loads(self.rfile.read(tamanho))['caminho']
+            except (ValueError, KeyError, TypeError):
+                return self._erro(HTTPStatus.BAD_REQUEST, 'esperado {"caminho": "..."}')
+            if not os.path.isfile(caminho):
+                return self._erro(HTTPStatus.BAD_REQUEST, f"arquivo não encontrado: {caminho}")
+            if self.servico.fila.full():
+                return self._sobrecarga()
+            trabalho = self.servico.enviar(caminho)
+        else:
+            # Upload: o corpo é o próprio arquivo, ?nome=video.mp4 dá a extensão
+            nome = parse_qs(url.query).get('nome', ['upload'])[0]
+            if tamanho <= 0:
+                return self._erro(HTTPStatus.BAD_REQUEST, 'corpo vazio')
+            # Recusar antes de receber o arquivo inteiro
+            if self.servico.fila.full():
+                return self._sobrecarga()
+            caminho = os.path.join(self.servico.pasta_uploads,
+                                   f"{uuid.uuid4().hex}{Path(nome).suffix}")
+            with open(caminho, 'wb') as f:
+                restante = tamanho
+                while restante > 0:
+                    bloco = self.rfile.read(min(restante, 1 << 20))
+                    if not bloco:
+                        break
+                    f.write(bloco)
+                    restante -= len(bloco)
+            if restante > 0:
+                # Cliente desconectou no meio do envio: não transcrever pela metade
+                os.remove(caminho)
+                try:
+                    return self._erro(HTTPStatus.BAD_REQUEST,
+                                      f"corpo incompleto: faltaram {restante} de {tamanho} bytes")
+                except (BrokenPipeError, ConnectionResetError):
+                    return
+            trabalho = self.servico.enviar(caminho, temporario=True, nome=nome)
+            if trabalho is None:
+                os.remove(caminho)
+        
+        if trabalho is None:
+            return self._sobrecarga()
+        self._responder_json(HTTPStatus.ACCEPTED, trabalho,
+                             {'Location': f"/transcricoes/{trabalho['id']}"})
+    
+    def _sobrecarga(self):
+        """429 quando a fila está cheia, para manter a latência previsível"""
+        self._responder_json(HTTPStatus.TOO_MANY_REQUESTS,
+                             {'erro': 'fila cheia, tente novamente'},
+                             {'Retry-After': '5'})
+    
+    def log_message(self, formato, *args):
+        """Log de acesso no mesmo estilo do restante do sistema"""
+        print(f"🌐 {self.address_string()} - {formato % args}")
+
+
+def main(argv=None):
+    """Função principal - interface CLI do modo serve"""
+    
+    parser = argparse.ArgumentParser(
+        prog='transcrever.py serve',
+        description='🌐 Serviço HTTP local de transcrição com modelos carregados',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Exemplos de uso:
+  
+  # Iniciar com 2 modelos base carregados
+  python transcrever.py serve --modelo base --instancias 2
+  
+  # Enviar um arquivo local
+  curl -X POST localhost:8765/transcricoes \\
+       -H 'Content-Type: application/json' -d '{"caminho": "/dados/aula.mp4"}'
+  
+  # Enviar o próprio arquivo (upload)
+  curl -X POST 'localhost:8765/transcricoes?nome=aula.mp4' --data-binary @aula.mp4
+  
+  # Acompanhar o trabalho (SSE) ou consultar o resultado
+  curl -N localhost:8765/transcricoes/<id>/eventos
+  curl localhost:8765/transcricoes/<id>
+        """
+    )
+    
+    parser.add_argument('--host', default='127.0.0.1',
+                        help='Endereço de escuta (padrão: 127.0.0.1)')
+    parser.add_argument('--porta', '-p', type=int, default=8765,
+                        help='Porta HTTP (padrão: 8765)')
+    parser.add_argument('--modelo', '-m', default='base',
+                        choices=list(TranscritorVideos.MODELOS_DISPONIVEIS),
+                        help='Modelo Whisper a usar (padrão: base)')
+    parser.add_argument('--idioma', '-l', default='pt',
+                        help='Código do idioma (padrão: pt)')
+    parser.add_argument('--instancias', '-n', type=int, default=1,
+                        help='Modelos carregados = transcrições simultâneas (padrão: 1)')
+    parser.add_argument('--fila', type=int, default=16,
+                        help='Máximo de trabalhos aguardando; acima disso responde 429 (padrão: 16)')
+    parser.add_argument('--limpar', action='store_true',
+                        help='Aplica highpass/lowpass/loudnorm na decodificação')
+    parser.add_argument('--vad', action='store_true',
+                        help='Remove trechos sem fala antes do Whisper')
+    parser.add_argument('--cache-modelo', action='store_true',
+                        help='Carrega os modelos da cópia local de carga rápida')
+    parser.add_argument('--quantizar', action='store_true',
+                        help='Quantiza os modelos para int8 (CPU)')
+    parser.add_argument('--threads', '-t', type=int,
+                        help='Threads de cada instância (padrão: núcleos divididos entre as instâncias)')
+    parser.add_argument('--motor', choices=list(MOTORES), default=MotorWhisper.NOME,
+                        help='Biblioteca que roda o modelo (padrão: whisper)')
+    
+    args = parser.parse_args(argv)
+    
+    servico = ServicoTranscricao(instancias=args.instancias,
+                                 profundidade_fila=args.fila,
+                                 modelo=args.modelo,
+                                 idioma=args.idioma,
+                                 limpar=args.limpar,
+                                 vad=args.vad,
+                                 cache_modelo=args.cache_modelo,
+                                 quantizar=args.quantizar,
+                                 threads=args.threads,
+                                 motor=args.motor)
+    ManipuladorHTTP.servico = servico
+    
+    servidor = ThreadingHTTPServer((args.host, args.porta), ManipuladorHTTP)
+    servidor.daemon_threads = True
+    
+    print(f"\n{'='*60}")
+    print(f"🌐 Servindo em http://{args.host}:{args.porta}")
+    print(f"🧠 {args.instancias} instâncias do modelo '{args.modelo}' | fila: {args.fila}")
+    print(f"{'='*60}")
+    
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n🛑 Serviço encerrado")
+    finally:
+        servidor.server_close()
+        servico.encerrar()
+
+
+if __name__ == '__main__':
+    main()
@@ -9,12 +9,34 @@ Uso:
 """
 
 import whisper
+import numpy as np
 import os
+import sys
+import time
+import shutil
+import bisect
+import sqlite3
 import argparse
+import itertools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime, timedelta
 import json
 
+from preprocessar_videos import PreProcessadorVideo
+from cache_transcricoes import CacheTranscricoes
+from fila_trabalhos import FilaTrabalhos
+from instrumentacao import MedidorEtapas, resumir_lote, exportar_metricas
+from saidas_transcricao import EscritorTranscricao
+from modelos_whisper import RegistroModelos
+from orcamento_cpu import OrcamentoCPU
+from selecao_modelos import SeletorModelos
+from busca_transcricoes import IndiceBusca
+from inferencia_lotes import DecodificadorLotes
+from motores_inferencia import MOTORES, MotorWhisper, obter_motor
+from impressao_audio import ImpressaoAudio
+
 
 class TranscritorVideos:
     """Classe para gerenciar transcrição de vídeos com Whisper"""
@@ -28,42 +50,208 @@ class TranscritorVideos:
     }
     
     EXTENSOES_VIDEO = {'.mp4', '.avi', '.mov', '.mkv', '.flv', '.wmv', '.webm'}
-    EXTENSOES_AUDIO = {'.mp3', '.wav', '.m4a', '.flac', '.ogg'}
+    EXTENSOES_AUDIO = {'.mp3', '.wav', '.m4a', '.flac', '.ogg', '.opus'}
     EXTENSOES_SUPORTADAS = EXTENSOES_VIDEO | EXTENSOES_AUDIO
     
-    def __init__(self, modelo='base', idioma='pt'):
+    # Áudio extra (segundos) incluído em cada lado das partes no modo longo
+    SOBREPOSICAO_CHUNK = 1.0
+    
+    # Sem --duracao-chunk, arquivos mais longos que isto são transcritos em
+    # partes de no máximo estes minutos: cada parte vai para os parciais (e,
+    # com --retomar, para um checkpoint) assim que fica pronta
+    MINUTOS_PARTE = 10
+    
+    # Caracteres do fim do texto passados como prompt para a parte seguinte
+    TAMANHO_PROMPT = 200
+    
+    # Detecção de idioma (--idioma auto): modelo e janelas de 30s por arquivo
+    MODELO_IDIOMA = 'tiny'
+    JANELAS_IDIOMA = 3
+    
+    # Com lote_curtos, arquivos de até estes segundos são transcritos em lote
+    DURACAO_MAX_CURTO = 60
+    
+    # Entre o texto completo e os segmentos com timestamps no markdown
+    MARKDOWN_TIMESTAMPS = "\n\n---\n\n## ⏱️ Transcrição com Timestamps\n\n"
+    
+    def __init__(self, modelo='base', idioma='pt', workers=1, duracao_chunk=None,
+                 limpar=False, usar_cache=True, vad=False, arquivo_metricas=None,
+                 retomar=False, cache_modelo=False, quantizar=False, threads=None,
+                 prazo=None, lote_curtos=0, motor=MotorWhisper.NOME, deduplicar=False):
         """
         Inicializa o transcritor
         
         Args:
-            modelo: Nome do modelo Whisper a usar
-            idioma: Código do idioma (pt, en, es, etc)
+            modelo: Nome do modelo Whisper a usar, ou 'auto' para escolher
+                por arquivo o mais preciso que termina o lote no prazo
+            idioma: Código do idioma (pt, en, es, etc) ou 'auto' para detectar
+                o idioma de cada arquivo antes de transcrevê-lo
+            workers: Número de processos para lotes e para as partes do modo
+                longo. Cada processo carrega o seu próprio modelo.
+            duracao_chunk: Ativa o modo longo: arquivos maiores que este
+                valor (minutos) são divididos em silêncios e as partes
+                transcritas separadamente
+            limpar: Aplica os filtros de limpeza do PreProcessadorVideo na
+                mesma decodificação do áudio, sem gerar arquivos
+            usar_cache: Reaproveita transcrições guardadas no cache da pasta
+                de saída quando o conteúdo e as opções não mudaram
+            vad: Remove silêncios antes do Whisper (detecção de fala por
+                energia) e devolve os tempos na linha do tempo original
+            arquivo_metricas: Exporta tempo, CPU e memória por etapa para
+                este arquivo (.prom para Prometheus, senão JSON lines)
+            retomar: Grava um checkpoint a cada parte transcrita e continua
+                do último checkpoint quando o arquivo foi interrompido
+            cache_modelo: Carrega o modelo de uma cópia local de carga rápida
+                (criada na primeira vez)
+            quantizar: Quantização dinâmica int8 das camadas lineares do
+                modelo (CPU): mais rápido e menor, com pequena perda de precisão
+            threads: Threads de cada processo que transcreve (torch, numba e
+                FFmpeg). None deixa o padrão do torch em um processo único e
+                divide os núcleos entre os processos worker.
+            prazo: Horas disponíveis para o lote (usado com modelo='auto')
+            lote_curtos: Nos lotes, arquivos de até DURACAO_MAX_CURTO
+                segundos são transcritos juntos, com até este número de
+                janelas de 30s por passada do modelo (0 = desativado)
+            motor: Biblioteca que roda o modelo (ver motores_inferencia):
+                'whisper' (padrão) ou 'faster-whisper'. O lote_curtos, o
+                modelo 'auto' e a calibração de threads só existem no padrão.
+            deduplicar: Reconhece pela impressão digital do áudio gravações
+                já transcritas em outra codificação (ou repetidas no lote) e
+                reaproveita a transcrição, com os tempos alinhados. Precisa
+                do cache.
+        
+        O modelo só é carregado na primeira transcrição que precisar dele,
+        então arquivos atendidos pelo cache não pagam o custo de carga.
         """
+        self.modelo = modelo
         self.idioma = idioma
-        print(f"🔄 Carregando modelo Whisper '{modelo}'...")
-        self.model = whisper.load_model(modelo)
-        print(f"✅ Modelo carregado com sucesso!")
+        self.workers = max(1, workers)
+        self.duracao_chunk = duracao_chunk
+        self.limpar = limpar
+        self.usar_cache = usar_cache
+        self.vad = vad
+        self.arquivo_metricas = arquivo_metricas
+        self.retomar = retomar
+        self.cache_modelo = cache_modelo
+        self.quantizar = quantizar
+        self.threads = threads
+        self.prazo = prazo
+        self.lote_curtos = lote_curtos
+        self.motor = motor
+        self.motor_inferencia = obter_motor(motor)
+        self.deduplicar = deduplicar
+        self.processador = PreProcessadorVideo(threads=threads)
+        self.model = None
+        self.ultimo_erro = None
+        self.ultimas_metricas = None
+    
+    def _carregar_modelo(self, compartilhado=True):
+        """
+        Carrega o modelo Whisper neste processo
+        
+        Args:
+            compartilhado: Reaproveita a cópia já carregada por outro
+                transcritor do mesmo processo (ver RegistroModelos)
+        """
+        if self.threads:
+            OrcamentoCPU.aplicar(self.threads)
+        self.model = self.motor_inferencia.carregar(self.modelo, compartilhado=compartilhado,
+                                                    cache_rapido=self.cache_modelo,
+                                                    quantizar=self.quantizar,
+                                                    threads=self.threads)
+    
+    def _config_worker(self):
+        """Parâmetros para recriar este transcritor em um processo worker"""
+        return {
+            'modelo': self.modelo,
+            'idioma': self.idioma,
+            'workers': 1,
+            'duracao_chunk': self.duracao_chunk,
+            'limpar': self.limpar,
+            'usar_cache': self.usar_cache,
+            'vad': self.vad,
+            'retomar': self.retomar,
+            'cache_modelo': self.cache_modelo,
+            'quantizar': self.quantizar,
+            'threads': self.threads,
+            'lote_curtos': self.lote_curtos,
+            'motor': self.motor,
+            'deduplicar': self.deduplicar
+        }
+    
+    def _opcoes_cache(self):
+        """Opções que mudam o resultado e por isso fazem parte da chave do cache"""
+        opcoes = {
+            'modelo': self.modelo,
+            'idioma': self.idioma,
+            'duracao_chunk': self._duracao_partes(),
+            'limpar': self.limpar,
+            'vad': self.vad
+        }
+        # Opções fora do padrão só entram na chave quando ativas
+        if self.quantizar:
+            opcoes['quantizar'] = True
+        if self.motor != MotorWhisper.NOME:
+            opcoes['motor'] = self.motor
+        return opcoes
+    
+    def _abrir_cache(self, output_dir):
+        """Abre o cache da pasta de saída, ou None se estiver desativado"""
+        return CacheTranscricoes(output_dir) if self.usar_cache else None
+    
+    def _saida_em_dia(self, video_path, output_dir, modelos=None):
+        """
+        True se a saída deste arquivo já corresponde ao conteúdo e opções atuais
+        
+        Args:
+            modelos: Aceita a saída gerada por qualquer um destes modelos
+                (padrão: só o modelo atual)
+        """
+        cache = self._abrir_cache(output_dir)
+        if cache is None:
+            return False
+        json_path = os.path.join(output_dir, f"{Path(video_path).stem}.json")
+        opcoes = self._opcoes_cache()
+        return any(cache.saida_em_dia(json_path, cache.chave(video_path, dict(opcoes, modelo=modelo)))
+                   for modelo in modelos or [self.modelo])
         
     def _formatar_timestamp(self, segundos):
         """Converte segundos em formato HH:MM:SS"""
         return str(timedelta(seconds=int(segundos)))
     
-    def _gerar_metadados(self, video_path, result):
-        """Gera dicionário de metadados da transcrição"""
-        return {
+    def _gerar_metadados(self, video_path, idioma, fim, total_segmentos, vad=None):
+        """
+        Gera dicionário de metadados da transcrição
+        
+        Args:
+            video_path: Caminho do vídeo de origem
+            idioma: Idioma detectado
+            fim: Fim do último segmento em segundos (0 se não houver segmentos)
+            total_segmentos: Quantidade de segmentos
+            vad: Relatório do VAD (opcional)
+        """
+        metadados = {
             'arquivo': os.path.basename(video_path),
             'data_transcricao': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            'duracao_video': self._formatar_timestamp(result['segments'][-1]['end']),
-            'idioma_detectado': result.get('language', self.idioma),
-            'total_segmentos': len(result['segments']),
-            'modelo_usado': self.model.__class__.__name__
+            'duracao_video': self._formatar_timestamp(fim),
+            'idioma_detectado': idioma or self.idioma,
+            'total_segmentos': total_segmentos,
+            'modelo_usado': self.modelo
         }
+        if vad is not None:
+            metadados['vad'] = vad
+        return metadados
     
-    def _gerar_markdown(self, video_path, result, metadados):
-        """Gera arquivo markdown formatado para Obsidian"""
-        nome_arquivo = Path(video_path).stem
-        
-        markdown = f"""# 📹 {nome_arquivo}
+    def _metadados_resultado(self, video_path, result):
+        """Metadados de um resultado completo já em memória"""
+        # Sem fala detectada pelo VAD não há segmentos
+        fim = result['segments'][-1]['end'] if result['segments'] else 0
+        return self._gerar_metadados(video_path, result.get('language'), fim,
+                                     len(result['segments']), result.get('vad'))
+    
+    def _markdown_cabecalho(self, nome_arquivo, metadados):
+        """Início do markdown, até a abertura da transcrição completa"""
+        return f"""# 📹 {nome_arquivo}
 
 ---
 
@@ -76,28 +264,24 @@ class TranscritorVideos:
 | **Duração** | {metadados['duracao_video']} |
 | **Idioma** | {metadados['idioma_detectado']} |
 | **Segmentos** | {metadados['total_segmentos']} |
-| **Modelo** | {metadados['modelo_usado']} |
+| **Modelo** | {metadados['modelo_usado']} |{self._linha_vad(metadados)}
 
 ---
 
 ## 📝 Transcrição Completa
 
-{result['text']}
-
----
-
-## ⏱️ Transcrição com Timestamps
-
 """
-        # Adicionar segmentos com timestamps
-        for segment in result['segments']:
-            inicio = self._formatar_timestamp(segment['start'])
-            fim = self._formatar_timestamp(segment['end'])
-            texto = segment['text'].strip()
-            markdown += f"**[{inicio} → {fim}]**\n{texto}\n\n"
-        
-        # Adicionar tags e links
-        markdown += f"""---
+    
+    def _markdown_segmento(self, segment):
+        """Um segmento com timestamps no markdown"""
+        inicio = self._formatar_timestamp(segment['start'])
+        fim = self._formatar_timestamp(segment['end'])
+        texto = segment['text'].strip()
+        return f"**[{inicio} → {fim}]**\n{texto}\n\n"
+    
+    def _markdown_rodape(self, nome_arquivo):
+        """Tags e links no fim do markdown"""
+        return f"""---
 
 ## 🏷️ Tags
 
@@ -115,13 +299,492 @@ class TranscritorVideos:
 *Transcrição gerada automaticamente por Whisper Local*
 *Sistema criado por Diego Sottani - {datetime.now().year}*
 """
+    
+    def _gerar_markdown(self, video_path, result, metadados):
+        """Gera arquivo markdown formatado para Obsidian"""
+        nome_arquivo = Path(video_path).stem
         
-        return markdown
+        partes = [self._markdown_cabecalho(nome_arquivo, metadados), result['text'],
+                  self.MARKDOWN_TIMESTAMPS]
+        partes.extend(self._markdown_segmento(segment) for segment in result['segments'])
+        partes.append(self._markdown_rodape(nome_arquivo))
+        return ''.join(partes)
+    
+    def _linha_vad(self, metadados):
+        """Linha extra da tabela de metadados com o silêncio removido pelo VAD"""
+        if 'vad' not in metadados:
+            return ''
+        vad = metadados['vad']
+        return (f"\n| **Silêncio Ignorado** | "
+                f"{self._formatar_timestamp(vad['ignorado_segundos'])} "
+                f"({vad['ignorado_percentual']}%) |")
+    
+    def _remover_silencios(self, audio):
+        """
+        Mantém só os trechos com fala, concatenados
+        
+        Returns:
+            tuple: (audio_fala, mapa, relatorio), onde mapa tem tuplas
+                (inicio_no_audio_fala, inicio_original, duracao) em segundos
+        """
+        sample_rate = whisper.audio.SAMPLE_RATE
+        trechos = self.processador.detectar_fala(audio, sample_rate)
+        
+        mapa = []
+        pedacos = []
+        posicao = 0.0
+        for inicio, fim in trechos:
+            pedaco = audio[int(inicio * sample_rate):int(fim * sample_rate)]
+            duracao = len(pedaco) / sample_rate
+            mapa.append((posicao, inicio, duracao))
+            pedacos.append(pedaco)
+            posicao += duracao
+        
+        audio_fala = np.concatenate(pedacos) if pedacos else audio[:0]
+        duracao_original = len(audio) / sample_rate
+        ignorado = duracao_original - posicao
+        relatorio = {
+            'duracao_original_segundos': round(duracao_original, 2),
+            'duracao_fala_segundos': round(posicao, 2),
+            'ignorado_segundos': round(ignorado, 2),
+            'ignorado_percentual': round(100 * ignorado / duracao_original, 1) if duracao_original else 0.0,
+            'trechos_fala': len(trechos)
+        }
+        
+        print(f"🔇 VAD: {self._formatar_timestamp(ignorado)} de "
+              f"{self._formatar_timestamp(duracao_original)} sem fala ignorados "
+              f"({relatorio['ignorado_percentual']}%)")
+        
+        return audio_fala, mapa, relatorio
+    
+    def _tempo_original(self, mapa, inicios, tempo, fim=False):
+        """Converte um tempo do áudio só com fala para a linha do tempo original"""
+        # No fim de um segmento, um tempo exatamente na emenda pertence ao trecho anterior
+        if fim:
+            i = bisect.bisect_left(inicios, tempo) - 1
+        else:
+            i = bisect.bisect_right(inicios, tempo) - 1
+        posicao, inicio, duracao = mapa[max(i, 0)]
+        return inicio + min(max(tempo - posicao, 0.0), duracao)
+    
+    def _remapear_tempos(self, result, mapa):
+        """Leva os tempos dos segmentos de volta para a linha do tempo original"""
+        inicios = [posicao for posicao, _, _ in mapa]
+        for segmento in result['segments']:
+            segmento['start'] = round(self._tempo_original(mapa, inicios, segmento['start']), 3)
+            segmento['end'] = round(self._tempo_original(mapa, inicios, segmento['end'], fim=True), 3)
+        return result
+    
+    def _transcrever_audio(self, audio, verbose=False, prompt=None, idioma=None):
+        """
+        Transcreve um array de áudio com o modelo deste processo
+        
+        Args:
+            idioma: Idioma deste áudio (padrão: self.idioma). Com 'auto' sem
+                um idioma detectado, o próprio Whisper escolhe.
+        """
+        if self.model is None:
+            self._carregar_modelo()
+        idioma = idioma or self.idioma
+        return self.motor_inferencia.transcrever(
+            self.model,
+            audio,
+            idioma=None if idioma == 'auto' else idioma,
+            prompt=prompt,
+            verbose=verbose
+        )
+    
+    def _detectar_idioma(self, video_path, audio):
+        """
+        Detecta o idioma de um arquivo com o modelo pequeno (MODELO_IDIOMA)
+        
+        Analisa JANELAS_IDIOMA janelas de 30s espalhadas pelo áudio e fica
+        com o idioma de maior probabilidade média. O resultado é guardado no
+        índice de metadados; o arquivo só é analisado de novo se mudar.
+        
+        Args:
+            video_path: Arquivo de origem (chave do índice)
+            audio: Áudio já decodificado
+        
+        Returns:
+            str: Código do idioma
+        """
+        guardado = self.processador.idioma_guardado(video_path)
+        if guardado:
+            print(f"🌐 Idioma: {guardado} (detectado antes)")
+            return guardado
+        
+        modelo = RegistroModelos.obter(self.MODELO_IDIOMA, cache_rapido=self.cache_modelo)
+        sample_rate = whisper.audio.SAMPLE_RATE
+        janela = whisper.audio.N_SAMPLES
+        
+        # Janelas centradas em 1/4, 2/4 e 3/4 do áudio (uma só se for curto)
+        if len(audio) <= janela:
+            inicios = [0]
+        else:
+            centros = [len(audio) * (i + 1) // (self.JANELAS_IDIOMA + 1)
+                       for i in range(self.JANELAS_IDIOMA)]
+            inicios = [min(max(0, centro - janela // 2), len(audio) - janela) for centro in centros]
+        
+        medias = {}
+        for inicio in inicios:
+            trecho = whisper.pad_or_trim(audio[inicio:inicio + janela])
+            mel = whisper.log_mel_spectrogram(trecho, modelo.dims.n_mels).to(modelo.device)
+            _, probabilidades = modelo.detect_language(mel)
+            for codigo, probabilidade in probabilidades.items():
+                medias[codigo] = medias.get(codigo, 0.0) + probabilidade / len(inicios)
+        
+        idioma = max(medias, key=medias.get)
+        print(f"🌐 Idioma detectado: {idioma} ({medias[idioma]:.0%} em "
+              f"{len(inicios)} janela(s) de {janela // sample_rate}s)")
+        self.processador.guardar_idioma(video_path, idioma, round(medias[idioma], 4))
+        return idioma
+    
+    def _duracao_partes(self):
+        """
+        Tamanho máximo (minutos) das partes em que o áudio é dividido
+        
+        Sem --duracao-chunk, partes de MINUTOS_PARTE: um arquivo longo nunca
+        é transcrito de uma vez só, então os parciais (e os checkpoints do
+        --retomar) avançam ao longo do arquivo e a memória não cresce com a
+        transcrição.
+        """
+        return self.duracao_chunk or self.MINUTOS_PARTE
+    
+    def _transcrever_longo(self, audio, progresso):
+        """
+        Transcreve um áudio longo dividindo-o em partes cortadas em silêncios
+        
+        As partes são transcritas em paralelo quando há mais de um worker.
+        As partes já concluídas segundo `progresso` (retomada de um
+        checkpoint) são puladas.
+        
+        Yields:
+            dict: Resultado de cada parte, na ordem e com tempos absolutos
+        """
+        sample_rate = whisper.audio.SAMPLE_RATE
+        duracao = len(audio) / sample_rate
+        
+        silencios = self.processador.encontrar_silencios(audio, sample_rate)
+        cortes = self.processador.escolher_pontos_corte(
+            silencios, duracao, self._duracao_partes() * 60
+        )
+        limites = [0.0] + cortes + [duracao]
+        
+        # Cada parte leva um pouco de áudio dos vizinhos para não perder
+        # palavras na fronteira; a repetição é removida ao mesclar
+        partes = []
+        idioma = progresso.get('idioma')
+        for inicio, fim in zip(limites[:-1], limites[1:]):
+            inicio_audio = max(0.0, inicio - self.SOBREPOSICAO_CHUNK)
+            fim_audio = min(duracao, fim + self.SOBREPOSICAO_CHUNK)
+            trecho = audio[int(inicio_audio * sample_rate):int(fim_audio * sample_rate)]
+            partes.append((inicio_audio, inicio, fim, trecho))
+        
+        print(f"✂️  Áudio de {self._formatar_timestamp(duracao)} dividido em "
+              f"{len(partes)} partes")
+        
+        concluidas = progresso.get('parte', 0)
+        if concluidas >= len(partes):
+            # Interrompido depois do último checkpoint: só falta finalizar
+            print(f"⏩ Todas as {len(partes)} partes já estavam no checkpoint")
+            return
+        if concluidas:
+            print(f"⏩ Retomando da parte {concluidas + 1}/{len(partes)} "
+                  f"({self._formatar_timestamp(progresso['offset'])})")
+            partes = partes[concluidas:]
+        
+        trechos = [trecho for _, _, _, trecho in partes]
+        if self.workers > 1:
+            workers = min(self.workers, len(partes))
+            print(f"⚙️  Transcrevendo partes com {workers} processos")
+            # As partes rodam ao mesmo tempo: só a primeira tem texto anterior
+            # (o do checkpoint, numa retomada) para usar como prompt
+            prompts = [progresso.get('prompt')] + [None] * (len(trechos) - 1)
+            with self._criar_pool(workers) as executor:
+                # executor.map entrega os resultados na ordem das partes
+                yield from self._mesclar_resultados(
+                    partes,
+                    executor.map(_worker_transcrever_audio, trechos,
+                                 itertools.repeat(idioma), prompts),
+                    progresso
+                )
+        else:
+            yield from self._mesclar_resultados(
+                partes, self._transcrever_sequencial(trechos, progresso), progresso
+            )
+    
+    def _transcrever_sequencial(self, trechos, progresso):
+        """
+        Transcreve as partes uma a uma neste processo
+        
+        Cada parte recebe o final do texto já transcrito como prompt, para o
+        Whisper manter o contexto (nomes, pontuação) entre as partes.
+        """
+        inicio = progresso.get('parte', 0)
+        total = inicio + len(trechos)
+        for i, trecho in enumerate(trechos, inicio + 1):
+            print(f"🔄 Parte {i}/{total}")
+            yield self._transcrever_audio(trecho, prompt=progresso.get('prompt'),
+                                          idioma=progresso.get('idioma'))
+    
+    def _mesclar_resultados(self, partes, resultados, progresso):
+        """
+        Ajusta o resultado de cada parte para a linha do tempo original
+        
+        Os tempos são deslocados para a linha do tempo original. Cada parte
+        só fica com os segmentos cujo ponto médio cai no seu intervalo
+        [inicio, fim), o que descarta o texto repetido das sobreposições.
+        Só o último segmento aceito é lembrado entre as partes, então a
+        memória não cresce com o tamanho da transcrição.
+        
+        Args:
+            partes: Tuplas (deslocamento, inicio, fim, trecho) em segundos
+            resultados: Resultados do Whisper na mesma ordem das partes
+            progresso: Estado entre as partes (parte, offset, total,
+                anterior, prompt e idioma), atualizado após cada parte; é o
+                que vai para o checkpoint
+            
+        Yields:
+            dict: Resultado parcial (text, segments, language) de cada parte
+        """
+        anterior = progresso.get('anterior')
+        total = progresso.get('total', 0)
+        for (deslocamento, inicio, fim, _), resultado in zip(partes, resultados):
+            segmentos = []
+            for segmento in resultado['segments']:
+                segmento = dict(segmento)
+                segmento['start'] = round(segmento['start'] + deslocamento, 3)
+                segmento['end'] = round(segmento['end'] + deslocamento, 3)
+                segmento['seek'] = segmento.get('seek', 0) + int(deslocamento * 100)
+                
+                meio = (segmento['start'] + segmento['end']) / 2
+                if not inicio <= meio < fim:
+                    continue
+                # Mesma frase reconhecida nas duas partes vizinhas
+                if (anterior
+                        and segmento['text'].strip() == anterior['text'].strip()
+                        and segmento['start'] < anterior['end']):
+                    continue
+                
+                segmento['id'] = total
+                total += 1
+                segmentos.append(segmento)
+                anterior = {'text': segmento['text'], 'end': segmento['end']}
+            
+            texto = ''.join(segmento['text'] for segmento in segmentos)
+            progresso.update({
+                'parte': progresso.get('parte', 0) + 1,
+                'offset': fim,
+                'total': total,
+                'anterior': anterior,
+                'prompt': ((progresso.get('prompt') or '') + texto)[-self.TAMANHO_PROMPT:] or None
+            })
+            yield {
+                'text': texto,
+                'segments': segmentos,
+                'language': resultado.get('language', self.idioma)
+            }
+    
+    def _transcrever_partes(self, video_path, medidor, info, progresso=None):
+        """
+        Transcreve um arquivo gerando os resultados parciais à medida que saem
+        
+        No modo longo há um resultado por parte; nos demais casos, um só.
+        Os tempos já estão na linha do tempo original.
+        
+        Args:
+            video_path: Caminho do vídeo ou áudio
+            medidor: MedidorEtapas que recebe o custo de cada etapa
+            info: Dicionário que recebe o relatório do VAD em 'vad'
+            progresso: Estado do modo em partes, lido de um checkpoint e
+                atualizado a cada parte (opcional)
+            
+        Yields:
+            dict: Resultado parcial no formato do Whisper (text, segments, language)
+        """
+        sample_rate = whisper.audio.SAMPLE_RATE
+        
+        # Uma única decodificação (e limpeza) via pipe do FFmpeg
+        with medidor.etapa('decodificacao'):
+            audio = self.processador.carregar_audio(
+                video_path,
+                limpar=self.limpar,
+                sample_rate=sample_rate
+            )
+        medidor.duracao_audio = len(audio) / sample_rate
+        
+        mapa = None
+        if self.vad:
+            with medidor.etapa('preprocessamento'):
+                audio, mapa, info['vad'] = self._remover_silencios(audio)
+            if not mapa:
+                return
+        
+        # O idioma detectado vai no progresso: uma retomada usa o mesmo
+        progresso = {} if progresso is None else progresso
+        if self.idioma == 'auto' and not progresso.get('idioma'):
+            with medidor.etapa('deteccao_idioma'):
+                progresso['idioma'] = self._detectar_idioma(video_path, audio)
+        
+        duracao = len(audio) / sample_rate
+        duracao_partes = self._duracao_partes()
+        longo = duracao_partes and duracao > duracao_partes * 60
+        
+        # No modo longo com workers o modelo é carregado nos processos filhos
+        if self.model is None and not (longo and self.workers > 1):
+            with medidor.etapa('carga_modelo'):
+                self._carregar_modelo()
+        
+        if longo:
+            partes = self._transcrever_longo(audio, progresso)
+        else:
+            partes = (self._transcrever_audio(trecho, idioma=progresso.get('idioma'))
+                      for trecho in [audio])
+        
+        # Só o tempo de obter cada parte conta como inferência; o que o
+        # consumidor faz entre as partes (gravar em disco) fica de fora
+        while True:
+            with medidor.etapa('inferencia'):
+                result = next(partes, None)
+            if result is None:
+                break
+            if mapa:
+                result = self._remapear_tempos(result, mapa)
+            yield result
+    
+    def transcrever(self, video_path, medidor=None):
+        """
+        Transcreve um arquivo e devolve o resultado sem salvar nada
+        
+        Args:
+            video_path: Caminho do vídeo ou áudio
+            medidor: MedidorEtapas que recebe o custo de cada etapa (opcional)
+            
+        Returns:
+            dict: Resultado no formato do Whisper (text, segments, language)
+        """
+        info = {}
+        partes = list(self._transcrever_partes(video_path, medidor or MedidorEtapas(), info))
+        
+        result = {
+            'text': ''.join(parte['text'] for parte in partes),
+            'segments': [segmento for parte in partes for segmento in parte['segments']],
+            'language': partes[0].get('language', self.idioma) if partes else self.idioma
+        }
+        if 'vad' in info:
+            result['vad'] = info['vad']
+        return result
+    
+    def salvar_resultados(self, video_path, result, output_dir, medidor=None):
+        """
+        Grava .md, .txt e .json de uma transcrição já em memória
+        
+        Args:
+            video_path: Caminho do vídeo de origem
+            result: Resultado no formato do Whisper
+            output_dir: Diretório para salvar transcrições
+            medidor: MedidorEtapas da transcrição; o resumo vai para os
+                metadados do .json como 'desempenho'
+            
+        Returns:
+            dict: Metadados gerados
+        """
+        medidor = medidor or MedidorEtapas()
+        with EscritorTranscricao(self, video_path, output_dir) as escritor:
+            with medidor.etapa('escrita'):
+                escritor.adicionar(result)
+            return escritor.finalizar(result.get('vad'), medidor)
+    
+    def _identidade_checkpoint(self, video_path):
+        """Arquivo de origem e opções que um checkpoint precisa ter para ser retomado"""
+        stat = os.stat(video_path)
+        return {
+            'arquivo': os.path.abspath(video_path),
+            'tamanho': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'opcoes': self._opcoes_cache()
+        }
+    
+    def _transcrever_para_disco(self, video_path, output_dir, medidor, para_cache=False):
+        """
+        Transcreve gravando cada parte nos parciais assim que fica pronta
+        
+        Com --retomar, grava um checkpoint depois de cada parte e, se houver
+        um checkpoint do mesmo arquivo com as mesmas opções, continua dele.
+        
+        Args:
+            para_cache: Montar também o resultado comprimido para o cache
+                (escritor.dados_cache)
+        
+        Returns:
+            tuple: (metadados, escritor)
+        """
+        checkpoint = None
+        progresso = {}
+        if self.retomar:
+            identidade = self._identidade_checkpoint(video_path)
+            checkpoint = EscritorTranscricao.carregar_checkpoint(video_path, output_dir)
+            if checkpoint and checkpoint['identidade'] != identidade:
+                print(f"⚠️  Checkpoint de outra versão do arquivo ou de outras opções; "
+                      f"começando do zero")
+                checkpoint = None
+            if checkpoint:
+                progresso = checkpoint['progresso']
+                print(f"♻️  Checkpoint encontrado: {checkpoint['total_segmentos']} segmentos "
+                      f"até {self._formatar_timestamp(progresso['offset'])}")
+        
+        info = {}
+        with EscritorTranscricao(self, video_path, output_dir, checkpoint) as escritor:
+            for parte in self._transcrever_partes(video_path, medidor, info, progresso):
+                with medidor.etapa('escrita'):
+                    escritor.adicionar(parte)
+                    # Arquivos curtos (uma parte só) não têm o que retomar
+                    if self.retomar and progresso.get('parte'):
+                        escritor.salvar_checkpoint(identidade, progresso)
+            metadados = escritor.finalizar(info.get('vad'), medidor, para_cache)
+        return metadados, escritor
+    
+    def _transcricao_repetida(self, video_path, cache):
+        """
+        Transcrição de outra gravação com o mesmo áudio (--deduplicar)
+        
+        A impressão do arquivo também fica no cache da pasta de saída, para
+        os próximos arquivos serem comparados com este.
+        
+        Args:
+            video_path: Arquivo a transcrever
+            cache: CacheTranscricoes da pasta de saída
+        
+        Returns:
+            dict: Resultado da outra gravação com os tempos deste arquivo,
+                ou None
+        """
+        try:
+            duracao, impressao = self.processador.impressao_audio(video_path)
+            cache.salvar_impressao(video_path, duracao, impressao)
+            encontrada = cache.buscar_repetida(video_path, duracao, impressao,
+                                               self._opcoes_cache())
+        except (RuntimeError, sqlite3.Error) as e:
+            print(f"⚠️  Impressão do áudio indisponível: {e}")
+            return None
+        if encontrada is None:
+            return None
+        
+        result, alinhamento = encontrada
+        print(f"🧬 Mesmo áudio de {alinhamento['arquivo']} "
+              f"(deslocamento {alinhamento['deslocamento_s']:+.1f}s, "
+              f"{alinhamento['erro_bits']:.0%} de bits diferentes): reaproveitando a transcrição")
+        return ImpressaoAudio.deslocar_resultado(result, alinhamento['deslocamento_s'], duracao)
     
     def transcrever_video(self, video_path, output_dir):
         """
         Transcreve um único vídeo
         
+        Os segmentos vão para o disco (.md.parcial, .txt.parcial e
+        .jsonl.parcial) à medida que saem; os arquivos finais substituem os
+        anteriores de uma vez só, no fim.
+        
         Args:
             video_path: Caminho do vídeo
             output_dir: Diretório para salvar transcrições
@@ -129,60 +792,144 @@ class TranscritorVideos:
         Returns:
             bool: True se sucesso, False se erro
         """
+        self.ultimas_metricas = None
         try:
             nome_arquivo = Path(video_path).stem
+            medidor = MedidorEtapas()
             print(f"\n{'='*60}")
             print(f"🎬 Processando: {os.path.basename(video_path)}")
             print(f"{'='*60}")
             
-            # Transcrever
-            print(f"🔄 Transcrevendo... (pode demorar alguns minutos)")
-            result = self.model.transcribe(
-                video_path, 
-                language=self.idioma,
-                verbose=False  # Menos output durante transcrição
-            )
-            
-            # Gerar metadados
-            metadados = self._gerar_metadados(video_path, result)
+            json_path = os.path.join(output_dir, f"{nome_arquivo}.json")
+            cache = self._abrir_cache(output_dir)
+            chave = cache.chave(video_path, self._opcoes_cache()) if cache else None
             
-            # Criar diretório de saída se não existir
-            os.makedirs(output_dir, exist_ok=True)
+            if cache and cache.saida_em_dia(json_path, chave):
+                print(f"⏭️  Sem alterações desde a última transcrição (cache)")
+                return True
             
-            # Salvar arquivos
-            # 1. Markdown formatado
-            md_path = os.path.join(output_dir, f"{nome_arquivo}.md")
-            markdown = self._gerar_markdown(video_path, result, metadados)
-            with open(md_path, 'w', encoding='utf-8') as f:
-                f.write(markdown)
-            print(f"✅ Markdown salvo: {md_path}")
+            result = cache.buscar(chave) if cache else None
+            if result is not None:
+                # Mesmo conteúdo já transcrito (arquivo renomeado ou duplicado)
+                print(f"♻️  Reaproveitando transcrição do cache")
+            elif cache and self.deduplicar:
+                # Mesmo áudio em outra codificação
+                with medidor.etapa('impressao_audio'):
+                    result = self._transcricao_repetida(video_path, cache)
+                if result is not None:
+                    cache.salvar(chave, video_path, self._opcoes_cache(), result)
             
-            # 2. Texto puro
-            txt_path = os.path.join(output_dir, f"{nome_arquivo}.txt")
-            with open(txt_path, 'w', encoding='utf-8') as f:
-                f.write(result['text'])
-            print(f"✅ Texto puro salvo: {txt_path}")
+            if result is not None:
+                metadados = self.salvar_resultados(video_path, result, output_dir, medidor)
+            else:
+                # Transcrever, gravando cada parte assim que fica pronta
+                print(f"🔄 Transcrevendo... (pode demorar alguns minutos)")
+                metadados, escritor = self._transcrever_para_disco(video_path, output_dir, medidor,
+                                                                   para_cache=cache is not None)
+                self._registrar_fator(medidor)
+                if cache:
+                    cache.salvar_comprimido(chave, video_path, self._opcoes_cache(),
+                                            escritor.dados_cache)
             
-            # 3. JSON com dados completos
-            json_path = os.path.join(output_dir, f"{nome_arquivo}.json")
-            with open(json_path, 'w', encoding='utf-8') as f:
-                json.dump({
-                    'metadados': metadados,
-                    'texto_completo': result['text'],
-                    'segmentos': result['segments']
-                }, f, ensure_ascii=False, indent=2)
-            print(f"✅ JSON salvo: {json_path}")
+            if cache:
+                cache.registrar_saida(json_path, chave)
+            self.ultimas_metricas = metadados.get('desempenho')
             
             print(f"\n✨ Transcrição concluída com sucesso!")
-            print(f"📄 {len(result['segments'])} segmentos transcritos")
+            print(f"📄 {metadados['total_segmentos']} segmentos transcritos")
             print(f"⏱️  Duração: {metadados['duracao_video']}")
+            if self.ultimas_metricas and self.ultimas_metricas['fator_tempo_real'] is not None:
+                print(f"⚡ {self.ultimas_metricas['parede_total_s']:.1f}s de processamento "
+                      f"(fator de tempo real: {self.ultimas_metricas['fator_tempo_real']})")
             
             return True
             
         except Exception as e:
+            self.ultimo_erro = str(e)
             print(f"❌ Erro ao transcrever {video_path}: {str(e)}")
             return False
     
+    def _registrar_fator(self, medidor):
+        """
+        Guarda o custo real desta transcrição para as estimativas do --modelo auto
+        
+        Só vale quando este processo transcreveu sozinho: no modo longo com
+        workers o tempo medido é o de vários processos. Os fatores são do
+        motor padrão; os de outros motores não são guardados.
+        """
+        if self.workers > 1 or not medidor.duracao_audio or self.motor != MotorWhisper.NOME:
+            return
+        segundos = sum(etapa['parede_s'] for nome, etapa in medidor.etapas.items()
+                       if nome != 'carga_modelo')
+        try:
+            seletor = SeletorModelos(self.quantizar, OrcamentoCPU.threads_por_processo(1, self.threads))
+            seletor.registrar(self.modelo, medidor.duracao_audio, segundos)
+        except sqlite3.Error as e:
+            print(f"⚠️  Não foi possível guardar o fator de tempo real: {e}")
+    
+    def planejar_modelos(self, arquivos):
+        """
+        Divide os arquivos entre os modelos para terminar dentro de self.prazo
+        
+        Args:
+            arquivos: Arquivos do lote
+        
+        Returns:
+            dict: {modelo: [arquivos]}, do modelo mais preciso para o menos
+        """
+        infos = self.processador.obter_info_lote([str(arquivo) for arquivo in arquivos])
+        duracoes = {}
+        for arquivo in arquivos:
+            info = infos.get(str(arquivo))
+            if not info or not info['duracao_segundos']:
+                print(f"⚠️  Duração desconhecida, fora da estimativa: {os.path.basename(str(arquivo))}")
+            duracoes[arquivo] = info['duracao_segundos'] if info else 0
+        
+        processos = min(self.workers, len(arquivos))
+        seletor = SeletorModelos(self.quantizar,
+                                 OrcamentoCPU.threads_por_processo(processos, self.threads))
+        plano = seletor.planejar(duracoes, self.prazo, processos, list(self.MODELOS_DISPONIVEIS))
+        
+        grupos = {}
+        for modelo in reversed(list(self.MODELOS_DISPONIVEIS)):
+            grupo = [arquivo for arquivo in arquivos if plano[arquivo] == modelo]
+            if grupo:
+                grupos[modelo] = grupo
+        return grupos
+    
+    def _usar_modelo(self, modelo):
+        """Troca o modelo do transcritor, liberando o anterior da memória"""
+        if modelo == self.modelo:
+            return
+        if self.model is not None:
+            self.model = None
+            self.motor_inferencia.descarregar(self.modelo)
+        self.modelo = modelo
+    
+    def _ordenar_por_duracao(self, arquivos):
+        """
+        Ordena arquivos do mais longo para o mais curto
+        
+        Usa a duração do ffprobe; se não for possível obtê-la, usa o
+        tamanho do arquivo como estimativa.
+        """
+        infos = self.processador.obter_info_lote([str(arquivo) for arquivo in arquivos])
+        duracoes = {}
+        for arquivo in arquivos:
+            info = infos.get(str(arquivo))
+            if info and info['duracao_segundos']:
+                duracoes[arquivo] = (1, info['duracao_segundos'])
+            else:
+                duracoes[arquivo] = (0, arquivo.stat().st_size)
+        return sorted(arquivos, key=lambda a: duracoes[a], reverse=True)
+    
+    def _listar_midias(self, input_dir):
+        """Lista os arquivos de vídeo e áudio de um diretório"""
+        arquivos = []
+        for ext in self.EXTENSOES_SUPORTADAS:
+            arquivos.extend(Path(input_dir).glob(f"*{ext}"))
+        return arquivos
+    
     def transcrever_lote(self, input_dir, output_dir):
         """
         Transcreve todos os vídeos de um diretório
@@ -192,9 +939,7 @@ class TranscritorVideos:
             output_dir: Diretório para salvar transcrições
         """
         # Buscar vídeos e áudios
-        arquivos = []
-        for ext in self.EXTENSOES_SUPORTADAS:
-            arquivos.extend(Path(input_dir).glob(f"*{ext}"))
+        arquivos = self._listar_midias(input_dir)
 
         if not arquivos:
             print(f"❌ Nenhum arquivo de mídia encontrado em {input_dir}")
@@ -204,29 +949,595 @@ class TranscritorVideos:
         print(f"🎯 Encontrados {len(arquivos)} arquivos para transcrever")
         print(f"{'='*60}")
         
-        # Processar cada arquivo
+        inicio_lote = time.perf_counter()
+        
+        # Arquivos sem alteração nem chegam aos workers. Com --modelo auto
+        # vale a saída de qualquer modelo: o plano de uma execução anterior
+        # não é refeito (nem trocado por um modelo menor)
+        auto = self.modelo == 'auto'
+        modelos_aceitos = list(self.MODELOS_DISPONIVEIS) if auto else None
+        em_dia = [a for a in arquivos if self._saida_em_dia(str(a), output_dir, modelos_aceitos)]
+        if em_dia:
+            print(f"⏭️  {len(em_dia)} arquivos sem alterações (cache)")
+        pendentes = [a for a in arquivos if a not in em_dia]
+        
+        # Com --modelo auto cada grupo de arquivos usa um modelo; só os
+        # pendentes contam para o prazo
+        if auto:
+            grupos = self.planejar_modelos(pendentes) if pendentes else {}
+        else:
+            grupos = {self.modelo: pendentes}
+        
+        metricas = {}
         sucesso = 0
         falhas = 0
-
-        for i, arquivo in enumerate(arquivos, 1):
-            print(f"\n📊 Progresso: {i}/{len(arquivos)}")
-            if self.transcrever_video(str(arquivo), output_dir):
-                sucesso += 1
+        for modelo, grupo in grupos.items():
+            if len(grupos) > 1:
+                print(f"\n🎚️  Modelo '{modelo}': {len(grupo)} arquivos")
+            self._usar_modelo(modelo)
+            
+            # Gravações repetidas no lote: só depois da primeira, que já
+            # estará no cache para ser reaproveitada
+            repetidos = []
+            if self.deduplicar and self.usar_cache and grupo:
+                grupo, repetidos = self._separar_repetidos(grupo, em_dia, output_dir)
+            
+            # Arquivos curtos: várias janelas por passada do modelo
+            if self.lote_curtos and grupo:
+                curtos, grupo = self._separar_curtos(grupo)
+                if curtos:
+                    sucesso_curtos, falhas_curtos = self._transcrever_curtos(curtos, output_dir, metricas)
+                    sucesso += sucesso_curtos
+                    falhas += falhas_curtos
+            
+            # Processar cada arquivo
+            if self.workers > 1 and grupo:
+                sucesso_grupo, falhas_grupo = self._transcrever_paralelo(grupo, output_dir, metricas)
+                sucesso += sucesso_grupo
+                falhas += falhas_grupo
             else:
-                falhas += 1
+                for i, arquivo in enumerate(grupo, 1):
+                    print(f"\n📊 Progresso: {i}/{len(grupo)}")
+                    if self.transcrever_video(str(arquivo), output_dir):
+                        sucesso += 1
+                    else:
+                        falhas += 1
+                    if self.ultimas_metricas:
+                        metricas[arquivo.name] = self.ultimas_metricas
+            
+            for arquivo in repetidos:
+                if self.transcrever_video(str(arquivo), output_dir):
+                    sucesso += 1
+                else:
+                    falhas += 1
+                if self.ultimas_metricas:
+                    metricas[arquivo.name] = self.ultimas_metricas
         
         # Resumo final
         print(f"\n{'='*60}")
         print(f"🏁 PROCESSAMENTO CONCLUÍDO")
         print(f"{'='*60}")
-        print(f"✅ Sucessos: {sucesso}")
+        print(f"✅ Sucessos: {sucesso + len(em_dia)}")
         print(f"❌ Falhas: {falhas}")
         print(f"📁 Transcrições salvas em: {output_dir}")
+        
+        resumo_lote = resumir_lote(metricas, time.perf_counter() - inicio_lote)
+        self._imprimir_desempenho_lote(resumo_lote)
+        if self.arquivo_metricas:
+            exportar_metricas(self.arquivo_metricas, metricas, resumo_lote)
+            print(f"📈 Métricas exportadas: {self.arquivo_metricas}")
+        
+        self.atualizar_indice_busca(output_dir)
+    
+    @staticmethod
+    def atualizar_indice_busca(output_dir):
+        """
+        Indexa para o comando `buscar` só as transcrições novas ou alteradas
+        
+        Args:
+            output_dir: Diretório de saída das transcrições
+        """
+        try:
+            indexados, removidos = IndiceBusca(output_dir).atualizar()
+        except sqlite3.Error as e:
+            print(f"⚠️  Índice de busca não atualizado: {e}")
+            return
+        if indexados or removidos:
+            print(f"🔎 Índice de busca: {indexados} transcrições indexadas, {removidos} removidas")
+    
+    def _imprimir_desempenho_lote(self, resumo_lote):
+        """Mostra o custo agregado do lote por etapa e os arquivos mais lentos"""
+        if not resumo_lote['arquivos_medidos']:
+            return
+        
+        print(f"\n⏱️  Tempo total: {self._formatar_timestamp(resumo_lote['parede_lote_s'])} "
+              f"para {self._formatar_timestamp(resumo_lote['duracao_audio_s'])} de áudio "
+              f"(fator de tempo real: {resumo_lote['fator_tempo_real_lote']})")
+        for etapa, medidas in resumo_lote['etapas'].items():
+            print(f"   {etapa:<17} {medidas['parede_s']:>9.1f}s parede "
+                  f"{medidas['cpu_s']:>9.1f}s CPU {medidas['pico_rss_mb']:>8.0f} MB")
+        if resumo_lote['mais_lentos']:
+            print(f"🐢 Mais lentos (fator de tempo real):")
+            for item in resumo_lote['mais_lentos']:
+                print(f"   {item['fator_tempo_real']:>8}  {item['arquivo']}")
+    
+    def vigiar_pasta(self, input_dir, output_dir, intervalo=5, max_tentativas=3):
+        """
+        Vigia uma pasta e transcreve cada arquivo novo que aparecer
+        
+        O modelo fica carregado durante toda a execução. Um arquivo só entra
+        na fila depois que o tamanho para de mudar entre duas verificações
+        (upload concluído). A fila fica em disco na pasta de saída, então
+        trabalhos concluídos não são refeitos depois de um reinício e os
+        interrompidos são retomados. Arquivos que falham max_tentativas
+        vezes são movidos para input_dir/falhas.
+        
+        Args:
+            input_dir: Diretório vigiado
+            output_dir: Diretório para salvar transcrições
+            intervalo: Segundos entre verificações da pasta
+            max_tentativas: Tentativas antes de desistir de um arquivo
+        """
+        fila = FilaTrabalhos(output_dir)
+        pasta_falhas = os.path.join(input_dir, 'falhas')
+        
+        if self.model is None:
+            self._carregar_modelo()
+        
+        print(f"\n{'='*60}")
+        print(f"👀 Vigiando {input_dir} (a cada {intervalo}s) - Ctrl+C para parar")
+        print(f"{'='*60}")
+        
+        # Último (tamanho, mtime) visto de cada arquivo ainda não enfileirado
+        vistos = {}
+        
+        try:
+            while True:
+                for arquivo in self._listar_midias(input_dir):
+                    try:
+                        stat = arquivo.stat()
+                    except FileNotFoundError:
+                        continue
+                    assinatura = (stat.st_size, stat.st_mtime_ns)
+                    
+                    # Estável entre duas verificações: upload concluído
+                    if vistos.get(arquivo) == assinatura:
+                        if fila.adicionar(str(arquivo)):
+                            print(f"📥 Na fila: {arquivo.name}")
+                        vistos.pop(arquivo)
+                    elif stat.st_size > 0:
+                        vistos[arquivo] = assinatura
+                
+                trabalho = fila.proximo()
+                while trabalho is not None:
+                    self._processar_trabalho(fila, trabalho, output_dir,
+                                             pasta_falhas, max_tentativas)
+                    trabalho = fila.proximo()
+                
+                time.sleep(intervalo)
+        
+        except KeyboardInterrupt:
+            resumo = fila.resumo()
+            print(f"\n{'='*60}")
+            print(f"🛑 Vigilância encerrada")
+            print(f"{'='*60}")
+            print(f"✅ Concluídos: {resumo.get(FilaTrabalhos.CONCLUIDO, 0)}")
+            print(f"⏳ Pendentes: {resumo.get(FilaTrabalhos.PENDENTE, 0) + resumo.get(FilaTrabalhos.PROCESSANDO, 0)}")
+            print(f"❌ Falhas definitivas: {resumo.get(FilaTrabalhos.FALHOU, 0)}")
+    
+    def _processar_trabalho(self, fila, trabalho, output_dir, pasta_falhas,
+                            max_tentativas):
+        """Transcreve um trabalho da fila e registra o resultado"""
+        caminho = trabalho['caminho']
+        print(f"\n📬 Trabalho #{trabalho['id']} "
+              f"(tentativa {trabalho['tentativas']}/{max_tentativas})")
+        
+        if not os.path.exists(caminho):
+            self.ultimo_erro = 'arquivo removido antes da transcrição'
+            ok = False
+        else:
+            self.ultimo_erro = None
+            ok = self.transcrever_video(caminho, output_dir)
+        
+        if ok:
+            fila.concluir(trabalho['id'])
+            self.atualizar_indice_busca(output_dir)
+            return
+        
+        if not fila.falhar(trabalho['id'], self.ultimo_erro, max_tentativas):
+            print(f"🔁 Nova tentativa em {fila.espera(trabalho['tentativas'])}s")
+        else:
+            print(f"☠️  Desistindo após {max_tentativas} tentativas: {caminho}")
+            if os.path.exists(caminho):
+                os.makedirs(pasta_falhas, exist_ok=True)
+                destino = os.path.join(pasta_falhas, os.path.basename(caminho))
+                if os.path.exists(destino):
+                    # Outra falha com o mesmo nome: não sobrescrever
+                    destino = os.path.join(pasta_falhas,
+                                           f"{Path(caminho).stem}.{trabalho['id']}{Path(caminho).suffix}")
+                shutil.move(caminho, destino)
+                print(f"📁 Movido para: {destino}")
+    
+    def _criar_pool(self, workers):
+        """Cria um pool de processos; cada um carrega o modelo uma única vez"""
+        # Os núcleos são divididos entre os processos: cada um com todos
+        # os núcleos disputaria a CPU com os demais
+        config = self._config_worker()
+        config['threads'] = OrcamentoCPU.threads_por_processo(workers, self.threads)
+        print(f"🧮 {config['threads']} threads por processo")
+        
+        # 'spawn' evita herdar estado do torch/CUDA do processo principal
+        contexto = multiprocessing.get_context('spawn')
+        return ProcessPoolExecutor(max_workers=workers,
+                                   mp_context=contexto,
+                                   initializer=_inicializar_worker,
+                                   initargs=(config,))
+    
+    def calibrar_threads(self, max_workers=None):
+        """
+        Escolhe processos e threads por processo medindo o modelo nesta máquina
+        
+        A medida fica guardada (ver OrcamentoCPU.calibrar); nas execuções
+        seguintes o modelo nem precisa ser carregado para isso.
+        
+        Args:
+            max_workers: Limite de processos (None = sem limite além dos
+                núcleos e da memória)
+        """
+        def modelo():
+            if self.model is None:
+                self._carregar_modelo()
+            return self.model
+        
+        chave = f"{self.modelo}|quantizar={self.quantizar}"
+        self.workers, self.threads = OrcamentoCPU.calibrar(modelo, chave, max_workers)
+        self.processador.threads = self.threads
+        
+        if self.workers > 1:
+            # O modelo vai ser carregado nos workers; a cópia deste processo sobra
+            self.model = None
+            RegistroModelos.descarregar(self.modelo)
+        else:
+            OrcamentoCPU.aplicar(self.threads)
+    
+    def _transcrever_paralelo(self, arquivos, output_dir, metricas):
+        """
+        Distribui os arquivos entre processos worker, mais longos primeiro
+        
+        As métricas de cada arquivo transcrito são guardadas em `metricas`.
+        
+        Returns:
+            tuple: (sucessos, falhas)
+        """
+        workers = min(self.workers, len(arquivos))
+        arquivos = self._ordenar_por_duracao(arquivos)
+        print(f"⚙️  Usando {workers} processos (arquivos mais longos primeiro)")
+        
+        sucesso = 0
+        falhas = 0
+        
+        with self._criar_pool(workers) as executor:
+            futuros = {
+                executor.submit(_worker_transcrever_video, str(arquivo), output_dir): arquivo
+                for arquivo in arquivos
+            }
+            for i, futuro in enumerate(as_completed(futuros), 1):
+                arquivo = futuros[futuro]
+                try:
+                    ok, metricas_arquivo = futuro.result()
+                except Exception as e:
+                    print(f"❌ Erro no worker ao processar {arquivo}: {str(e)}")
+                    ok, metricas_arquivo = False, None
+                
+                if metricas_arquivo:
+                    metricas[arquivo.name] = metricas_arquivo
+                
+                if ok:
+                    sucesso += 1
+                else:
+                    falhas += 1
+                print(f"\n📊 Progresso: {i}/{len(arquivos)}")
+        
+        return sucesso, falhas
+    
+    def _separar_repetidos(self, arquivos, em_dia, output_dir):
+        """
+        Separa as gravações repetidas dentro do lote (mesmo áudio em outra
+        codificação), que só devem ser processadas depois da primeira
+        
+        As impressões de todos os arquivos, inclusive os que já estão em
+        dia, vão para o cache da pasta de saída: servem de histórico para
+        os arquivos deste e dos próximos lotes.
+        
+        Args:
+            arquivos: Arquivos a transcrever
+            em_dia: Arquivos do lote que não precisam ser transcritos
+            output_dir: Diretório de saída (cache)
+        
+        Returns:
+            tuple: (arquivos a transcrever agora, repetidos para depois)
+        """
+        cache = self._abrir_cache(output_dir)
+        
+        def calcular(arquivo):
+            try:
+                duracao, impressao = self.processador.impressao_audio(str(arquivo))
+                cache.salvar_impressao(str(arquivo), duracao, impressao)
+                return duracao, impressao
+            except (RuntimeError, sqlite3.Error) as e:
+                print(f"⚠️  Impressão do áudio indisponível para {arquivo}: {e}")
+                return None
+        
+        # Um FFmpeg por arquivo, vários ao mesmo tempo (cada um é um processo)
+        with ThreadPoolExecutor(max_workers=self.threads or OrcamentoCPU.cpus_disponiveis()) as executor:
+            impressoes = dict(zip(arquivos + em_dia, executor.map(calcular, arquivos + em_dia)))
+        
+        # Do mais longo para o mais curto: a gravação mais completa é a transcrita
+        primeiros = []
+        repetidos = []
+        referencias = []
+        for arquivo in sorted(arquivos, key=lambda a: impressoes[a][0] if impressoes[a] else 0,
+                              reverse=True):
+            impressao = impressoes[arquivo]
+            if impressao and any(ImpressaoAudio.alinhar(impressao[1], referencia)
+                                 for duracao, referencia in referencias
+                                 if duracao <= ImpressaoAudio.duracoes_comparaveis(impressao[0])[1]):
+                repetidos.append(arquivo)
+                continue
+            primeiros.append(arquivo)
+            if impressao:
+                referencias.append(impressao)
+        
+        if repetidos:
+            print(f"🧬 {len(repetidos)} gravações repetidas no lote: "
+                  f"reaproveitam a transcrição da primeira")
+        primeiros = set(primeiros)
+        return [arquivo for arquivo in arquivos if arquivo in primeiros], repetidos
+    
+    def _separar_curtos(self, arquivos):
+        """
+        Separa os arquivos de até DURACAO_MAX_CURTO segundos (duração do ffprobe)
+        
+        Returns:
+            tuple: (curtos do mais longo para o mais curto, demais arquivos)
+        """
+        infos = self.processador.obter_info_lote([str(arquivo) for arquivo in arquivos])
+        duracoes = {}
+        for arquivo in arquivos:
+            info = infos.get(str(arquivo))
+            if info and info['duracao_segundos'] and info['duracao_segundos'] <= self.DURACAO_MAX_CURTO:
+                duracoes[arquivo] = info['duracao_segundos']
+        
+        # Durações parecidas no mesmo lote: as rodadas extras (arquivos com
+        # mais de 30s) também saem em lotes cheios
+        curtos = sorted(duracoes, key=duracoes.get, reverse=True)
+        return curtos, [arquivo for arquivo in arquivos if arquivo not in duracoes]
+    
+    def _transcrever_curtos(self, arquivos, output_dir, metricas):
+        """
+        Transcreve os arquivos curtos em lotes de lote_curtos arquivos,
+        distribuindo os lotes entre processos worker se houver mais de um
+        
+        Returns:
+            tuple: (sucessos, falhas)
+        """
+        lotes = [arquivos[i:i + self.lote_curtos]
+                 for i in range(0, len(arquivos), self.lote_curtos)]
+        print(f"\n📦 {len(arquivos)} arquivos curtos em {len(lotes)} lotes de até "
+              f"{self.lote_curtos}")
+        
+        inicio = time.perf_counter()
+        sucesso = 0
+        falhas = 0
+        
+        if self.workers > 1 and len(lotes) > 1:
+            workers = min(self.workers, len(lotes))
+            print(f"⚙️  Usando {workers} processos")
+            with self._criar_pool(workers) as executor:
+                futuros = [
+                    executor.submit(_worker_transcrever_curtos, [str(a) for a in lote], output_dir)
+                    for lote in lotes
+                ]
+                for futuro in as_completed(futuros):
+                    try:
+                        sucesso_lote, falhas_lote, metricas_lote = futuro.result()
+                    except Exception as e:
+                        print(f"❌ Erro no worker ao processar um lote: {str(e)}")
+                        continue
+                    sucesso += sucesso_lote
+                    falhas += falhas_lote
+                    metricas.update(metricas_lote)
+        else:
+            for lote in lotes:
+                sucesso_lote, falhas_lote, metricas_lote = self.transcrever_curtos(lote, output_dir)
+                sucesso += sucesso_lote
+                falhas += falhas_lote
+                metricas.update(metricas_lote)
+        
+        parede = time.perf_counter() - inicio
+        print(f"\n📦 {len(arquivos)} arquivos curtos em {parede:.1f}s "
+              f"({60 * len(arquivos) / parede:.1f} arquivos/min)")
+        return sucesso, falhas
+    
+    def transcrever_curtos(self, arquivos, output_dir):
+        """
+        Transcreve um lote de arquivos curtos com passadas em lote do modelo
+        
+        O custo da decodificação e da inferência do lote é dividido entre os
+        arquivos proporcionalmente à duração de cada um.
+        
+        Args:
+            arquivos: Caminhos dos arquivos (até DURACAO_MAX_CURTO segundos)
+            output_dir: Diretório para salvar transcrições
+        
+        Returns:
+            tuple: (sucessos, falhas, {nome do arquivo: métricas})
+        """
+        sample_rate = whisper.audio.SAMPLE_RATE
+        cache = self._abrir_cache(output_dir)
+        sucesso = 0
+        falhas = 0
+        metricas = {}
+        
+        # Mesmo conteúdo já transcrito (renomeado, duplicado ou, com
+        # deduplicar, o mesmo áudio em outra codificação): não entra no lote
+        pendentes = []
+        for arquivo in map(str, arquivos):
+            chave = cache.chave(arquivo, self._opcoes_cache()) if cache else None
+            result = cache.buscar(chave) if cache else None
+            if result is not None:
+                print(f"♻️  Reaproveitando transcrição do cache: {os.path.basename(arquivo)}")
+            elif cache and self.deduplicar:
+                result = self._transcricao_repetida(arquivo, cache)
+                if result is not None:
+                    cache.salvar(chave, arquivo, self._opcoes_cache(), result)
+            if result is None:
+                pendentes.append((arquivo, chave))
+                continue
+            self.salvar_resultados(arquivo, result, output_dir)
+            cache.registrar_saida(os.path.join(output_dir, f"{Path(arquivo).stem}.json"), chave)
+            sucesso += 1
+        if not pendentes:
+            return sucesso, falhas, metricas
+        
+        lote = MedidorEtapas()
+        
+        # Um FFmpeg por arquivo, vários ao mesmo tempo (cada um é um processo)
+        def decodificar(arquivo):
+            try:
+                return self.processador.carregar_audio(arquivo, limpar=self.limpar,
+                                                       sample_rate=sample_rate)
+            except RuntimeError as e:
+                print(f"❌ Erro ao decodificar {arquivo}: {str(e)}")
+                return None
+        
+        with lote.etapa('decodificacao'):
+            with ThreadPoolExecutor(max_workers=self.threads or OrcamentoCPU.cpus_disponiveis()) as executor:
+                audios = list(executor.map(decodificar, [arquivo for arquivo, _ in pendentes]))
+        
+        falhas += sum(audio is None for audio in audios)
+        itens = [{'arquivo': arquivo, 'chave': chave, 'audio': audio,
+                  'duracao': len(audio) / sample_rate}
+                 for (arquivo, chave), audio in zip(pendentes, audios) if audio is not None]
+        
+        if self.vad:
+            with lote.etapa('preprocessamento'):
+                for item in itens:
+                    item['audio'], item['mapa'], item['vad'] = self._remover_silencios(item['audio'])
+        
+        if self.model is None:
+            self._carregar_modelo()
+        
+        com_fala = [item for item in itens if not self.vad or item['mapa']]
+        
+        # Idiomas já detectados antes; os demais o modelo detecta na 1ª janela
+        idiomas = None
+        if self.idioma == 'auto':
+            idiomas = [self.processador.idioma_guardado(item['arquivo']) for item in com_fala]
+        
+        print(f"📦 Transcrevendo {len(com_fala)} arquivos em lote...")
+        with lote.etapa('inferencia'):
+            decodificador = DecodificadorLotes(self.model,
+                                               None if self.idioma == 'auto' else self.idioma,
+                                               self.lote_curtos)
+            resultados = decodificador.transcrever([item['audio'] for item in com_fala], idiomas)
+        for item, result in zip(com_fala, resultados):
+            item['result'] = result
+        
+        duracao_lote = sum(item['duracao'] for item in itens) or 1
+        for item in itens:
+            arquivo = item['arquivo']
+            try:
+                result = item.get('result') or {'text': '', 'segments': [], 'language': self.idioma}
+                probabilidade = result.pop('probabilidade_idioma', None)
+                if probabilidade is not None:
+                    self.processador.guardar_idioma(arquivo, result['language'], round(probabilidade, 4))
+                if self.vad:
+                    if item['mapa']:
+                        result = self._remapear_tempos(result, item['mapa'])
+                    result['vad'] = item['vad']
+                
+                medidor = MedidorEtapas()
+                medidor.duracao_audio = item['duracao']
+                medidor.somar_parcela(lote, item['duracao'] / duracao_lote)
+                metadados = self.salvar_resultados(arquivo, result, output_dir, medidor)
+                if cache:
+                    cache.salvar(item['chave'], arquivo, self._opcoes_cache(), result)
+                    cache.registrar_saida(os.path.join(output_dir, f"{Path(arquivo).stem}.json"),
+                                          item['chave'])
+                metricas[os.path.basename(arquivo)] = metadados.get('desempenho')
+                sucesso += 1
+            except Exception as e:
+                self.ultimo_erro = str(e)
+                print(f"❌ Erro ao salvar {arquivo}: {str(e)}")
+                falhas += 1
+        
+        return sucesso, falhas, metricas
+
+
+# Transcritor do processo worker: o modelo é carregado uma única vez por processo
+_transcritor_worker = None
+
+
+def _inicializar_worker(config):
+    """Inicializador do ProcessPoolExecutor"""
+    global _transcritor_worker
+    _transcritor_worker = TranscritorVideos(**config)
+
+
+def _worker_transcrever_video(video_path, output_dir):
+    """
+    Transcreve um arquivo usando o modelo já carregado no worker
+    
+    Returns:
+        tuple: (sucesso, métricas do arquivo ou None)
+    """
+    ok = _transcritor_worker.transcrever_video(video_path, output_dir)
+    return ok, _transcritor_worker.ultimas_metricas
+
+
+def _worker_transcrever_curtos(arquivos, output_dir):
+    """Transcreve um lote de arquivos curtos no worker"""
+    return _transcritor_worker.transcrever_curtos(arquivos, output_dir)
+
+
+def _worker_transcrever_audio(audio, idioma=None, prompt=None):
+    """Transcreve uma parte de áudio (modo longo) no worker"""
+    return _transcritor_worker._transcrever_audio(audio, verbose=None, prompt=prompt,
+                                                  idioma=idioma)
+
+
+def _opcao_threads(valor):
+    """Valida --threads: inteiro positivo ou 'auto'"""
+    if valor == 'auto':
+        return valor
+    try:
+        threads = int(valor)
+    except ValueError:
+        threads = 0
+    if threads < 1:
+        raise argparse.ArgumentTypeError(f"use um inteiro positivo ou 'auto' (recebido: {valor})")
+    return threads
 
 
 def main():
     """Função principal - interface CLI"""
     
+    # Subcomando do serviço HTTP: python transcrever.py serve [opções]
+    if len(sys.argv) > 1 and sys.argv[1] == 'serve':
+        from servidor import main as servir
+        return servir(sys.argv[2:])
+    
+    # Subcomando ao vivo: python transcrever.py ao-vivo <url|arquivo|-> -o output/
+    if len(sys.argv) > 1 and sys.argv[1] == 'ao-vivo':
+        from transcricao_ao_vivo import main as ao_vivo
+        return ao_vivo(sys.argv[2:])
+    
+    # Subcomando de busca: python transcrever.py buscar "termos" -o output/
+    if len(sys.argv) > 1 and sys.argv[1] == 'buscar':
+        from busca_transcricoes import main as buscar
+        return buscar(sys.argv[2:])
+    
     parser = argparse.ArgumentParser(
         description='🎯 Sistema de Transcrição Local de Vídeos com Whisper',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -245,6 +1556,51 @@ Exemplos de uso:
   # Transcrever em inglês
   python transcrever.py --input video.mp4 --output output/ --idioma en
 
+  # Pasta com arquivos em vários idiomas: detecta o idioma de cada um
+  python transcrever.py --input pasta_videos/ --output output/ --idioma auto
+
+  # Transcrever uma pasta com 4 processos em paralelo
+  python transcrever.py --input pasta_videos/ --output output/ --workers 4
+
+  # Limpar o áudio e transcrever em um só passo (sem arquivos WAV)
+  python transcrever.py --input video.mp4 --output output/ --limpar
+
+  # Transcrever de novo mesmo o que já está no cache
+  python transcrever.py --input pasta_videos/ --output output/ --sem-cache
+
+  # Remover silêncios antes do Whisper (reuniões, aulas)
+  python transcrever.py --input reuniao.mp4 --output output/ --vad
+
+  # Vigiar uma pasta e transcrever cada arquivo novo (modelo sempre carregado)
+  python transcrever.py --input input/ --output output/ --vigiar
+
+  # Exportar tempo, CPU e memória por etapa (Prometheus ou JSON lines)
+  python transcrever.py --input pasta_videos/ --output output/ --metricas metricas.prom
+
+  # Serviço HTTP local com 2 modelos carregados (veja: transcrever.py serve -h)
+  python transcrever.py serve --modelo base --instancias 2
+
+  # Transcrição ao vivo de uma transmissão (veja: transcrever.py ao-vivo -h)
+  python transcrever.py ao-vivo rtsp://camera/sala --output output/
+  
+  # Buscar nas transcrições de uma pasta (veja: transcrever.py buscar -h)
+  python transcrever.py buscar "orçamento anual" --output output/
+
+  # Milhares de áudios curtos (até 60s): 16 arquivos por passada do modelo
+  python transcrever.py --input mensagens_voz/ --output output/ --lote-curtos 16
+  
+  # Mesma reunião em .mp4, .m4a e .webm: transcrita uma vez só
+  python transcrever.py --input reunioes/ --output output/ --deduplicar
+  
+  # Motor faster-whisper (CTranslate2) com int8
+  python transcrever.py --input pasta_videos/ --output output/ --motor faster-whisper --quantizar
+  
+  # Vídeo longo: partes de ~20 minutos transcritas em 4 processos
+  python transcrever.py --input video_3h.mp4 --output output/ --duracao-chunk 20 --workers 4
+
+  # Modelo mais preciso que termina a pasta em 8 horas
+  python transcrever.py --input pasta_videos/ --output output/ --modelo auto --prazo 8
+
 Modelos disponíveis:
   tiny   - 39MB  - Mais rápido, menos preciso
   base   - 74MB  - Bom equilíbrio (RECOMENDADO)
@@ -269,14 +1625,138 @@ Modelos disponíveis:
     parser.add_argument(
         '--modelo', '-m',
         default='base',
-        choices=['tiny', 'base', 'small', 'medium', 'large'],
-        help='Modelo Whisper a usar (padrão: base)'
+        choices=['tiny', 'base', 'small', 'medium', 'large', 'auto'],
+        help='Modelo Whisper a usar (padrão: base); "auto" escolhe pelo --prazo'
+    )
+    
+    parser.add_argument(
+        '--prazo',
+        type=float,
+        help='Com --modelo auto: horas disponíveis para o lote; cada arquivo '
+             'recebe o modelo mais preciso que ainda termina no prazo'
     )
     
     parser.add_argument(
         '--idioma', '-l',
         default='pt',
-        help='Código do idioma (pt, en, es, etc. - padrão: pt)'
+        help='Código do idioma (pt, en, es, etc. - padrão: pt); "auto" detecta '
+             'o idioma de cada arquivo com o modelo tiny'
+    )
+    
+    parser.add_argument(
+        '--workers', '-w',
+        type=int,
+        help='Processos paralelos para lote ou partes; cada um carrega o modelo '
+             '(padrão: 1; com --threads auto, limite máximo)'
+    )
+    
+    parser.add_argument(
+        '--threads', '-t',
+        type=_opcao_threads,
+        help='Threads de cada processo (torch e FFmpeg). Padrão: núcleos '
+             'divididos entre os --workers. "auto" mede o modelo nesta máquina '
+             'e escolhe processos e threads'
+    )
+    
+    parser.add_argument(
+        '--duracao-chunk', '-d',
+        type=int,
+        help='Modo longo: divide arquivos maiores que N minutos em silêncios '
+             'e transcreve as partes (em paralelo com --workers; padrão: 10)'
+    )
+    
+    parser.add_argument(
+        '--lote-curtos', '-b',
+        type=int,
+        default=0,
+        metavar='N',
+        help='Em pastas, transcreve arquivos de até 60s juntos, N janelas '
+             'de 30s por passada do modelo (ex: 16)'
+    )
+    
+    parser.add_argument(
+        '--limpar',
+        action='store_true',
+        help='Aplica highpass/lowpass/loudnorm na própria decodificação, '
+             'sem gerar arquivos de áudio intermediários'
+    )
+    
+    parser.add_argument(
+        '--vad',
+        action='store_true',
+        help='Remove trechos sem fala antes do Whisper; os tempos continuam '
+             'os do vídeo original'
+    )
+    
+    parser.add_argument(
+        '--vigiar', '--watch',
+        action='store_true',
+        help='Fica vigiando a pasta de entrada e transcreve arquivos novos '
+             'assim que o upload termina'
+    )
+    
+    parser.add_argument(
+        '--intervalo',
+        type=int,
+        default=5,
+        help='Segundos entre verificações da pasta no modo --vigiar (padrão: 5)'
+    )
+    
+    parser.add_argument(
+        '--max-tentativas',
+        type=int,
+        default=3,
+        help='Tentativas por arquivo no modo --vigiar antes de movê-lo '
+             'para a pasta falhas/ (padrão: 3)'
+    )
+    
+    parser.add_argument(
+        '--metricas',
+        help='Exporta tempo, CPU e memória por etapa: .prom gera texto do '
+             'Prometheus, outras extensões geram JSON lines'
+    )
+    
+    parser.add_argument(
+        '--sem-cache',
+        action='store_true',
+        help='Ignora o cache da pasta de saída e transcreve tudo de novo'
+    )
+    
+    parser.add_argument(
+        '--cache-modelo',
+        action='store_true',
+        help='Guarda o modelo em um formato de carga rápida em '
+             '~/.cache/transcricao_local/modelos e carrega dele nas próximas execuções'
+    )
+    
+    parser.add_argument(
+        '--quantizar',
+        action='store_true',
+        help='Quantiza as camadas lineares do modelo para int8 (CPU): '
+             'transcrição mais rápida e com menos memória'
+    )
+    
+    parser.add_argument(
+        '--deduplicar',
+        action='store_true',
+        help='Reconhece pela impressão digital do áudio gravações repetidas em '
+             'outra codificação (.mp4, .m4a, .webm) e reaproveita a transcrição'
+    )
+    
+    parser.add_argument(
+        '--motor',
+        choices=list(MOTORES),
+        default=MotorWhisper.NOME,
+        help='Biblioteca que roda o modelo: whisper (padrão, PyTorch) ou '
+             'faster-whisper (CTranslate2; pip install faster-whisper)'
+    )
+    
+    parser.add_argument(
+        '--retomar', '--resume',
+        dest='retomar',
+        action='store_true',
+        help='Grava checkpoints durante a transcrição e continua do último '
+             'checkpoint se o arquivo foi interrompido'
     )
     
     args = parser.parse_args()
@@ -287,13 +1767,82 @@ Modelos disponíveis:
         print(f"❌ Erro: '{args.input}' não encontrado")
         return
     
+    if args.vigiar and not input_path.is_dir():
+        print(f"❌ Erro: --vigiar precisa de um diretório em --input")
+        return
+    
+    if args.deduplicar and args.sem_cache:
+        print(f"❌ Erro: --deduplicar reaproveita transcrições do cache e não funciona com --sem-cache")
+        return
+    
+    if args.lote_curtos < 0:
+        print(f"❌ Erro: --lote-curtos precisa ser positivo")
+        return
+    
+    if args.motor != MotorWhisper.NOME and (args.modelo == 'auto' or args.lote_curtos
+                                           or args.threads == 'auto'):
+        print(f"❌ Erro: --modelo auto, --lote-curtos e --threads auto só funcionam "
+              f"com o motor {MotorWhisper.NOME}")
+        return
+    
+    if args.modelo == 'auto':
+        if not args.prazo or args.prazo <= 0:
+            print(f"❌ Erro: --modelo auto precisa de --prazo (horas)")
+            return
+        if args.vigiar or args.threads == 'auto':
+            print(f"❌ Erro: --modelo auto não funciona com --vigiar nem com --threads auto")
+            return
+    
     # Inicializar transcritor
-    transcritor = TranscritorVideos(modelo=args.modelo, idioma=args.idioma)
+    # Em arquivo único os workers transcrevem as partes do modo longo (todo
+    # arquivo acima de --duracao-chunk, ou de MINUTOS_PARTE sem ele)
+    paralelo = not args.vigiar
+    workers = (args.workers or 1) if paralelo else 1
+    threads = args.threads if args.threads != 'auto' else None
+    transcritor = TranscritorVideos(modelo=args.modelo, idioma=args.idioma,
+                                    workers=workers,
+                                    duracao_chunk=args.duracao_chunk,
+                                    limpar=args.limpar,
+                                    usar_cache=not args.sem_cache,
+                                    vad=args.vad,
+                                    arquivo_metricas=args.metricas,
+                                    retomar=args.retomar,
+                                    cache_modelo=args.cache_modelo,
+                                    quantizar=args.quantizar,
+                                    threads=threads,
+                                    prazo=args.prazo,
+                                    lote_curtos=args.lote_curtos,
+                                    motor=args.motor,
+                                    deduplicar=args.deduplicar)
+    
+    if args.threads == 'auto':
+        if paralelo:
+            transcritor.calibrar_threads(max_workers=args.workers)
+        else:
+            # Um único processo transcrevendo: todos os núcleos para ele
+            transcritor.threads = OrcamentoCPU.cpus_disponiveis()
+            transcritor.processador.threads = transcritor.threads
     
     # Processar
-    if input_path.is_file():
+    if args.vigiar:
+        # Processo único com o modelo sempre carregado
+        transcritor.workers = 1
+        transcritor.vigiar_pasta(str(input_path), args.output,
+                                 intervalo=args.intervalo,
+                                 max_tentativas=args.max_tentativas)
+    elif input_path.is_file():
         # Arquivo único
+        if args.modelo == 'auto':
+            # Saída em dia (de qualquer modelo): nada a planejar nem medir
+            if transcritor._saida_em_dia(str(input_path), args.output,
+                                         list(TranscritorVideos.MODELOS_DISPONIVEIS)):
+                print(f"⏭️  Sem alterações desde a última transcrição (cache)")
+                return
+            transcritor.modelo = next(iter(transcritor.planejar_modelos([input_path])))
         transcritor.transcrever_video(str(input_path), args.output)
+        transcritor.atualizar_indice_busca(args.output)
+        if args.metricas and transcritor.ultimas_metricas:
+            exportar_metricas(args.metricas, {input_path.name: transcritor.ultimas_metricas})
     else:
         # Diretório (lote)
         transcritor.transcrever_lote(str(input_path), args.output)
@@ -0,0 +1,483 @@
+#!/usr/bin/env python3
+"""
+🔴 Transcrição ao Vivo
+Autor: Diego Sottani
+
+Transcreve enquanto o áudio chega (reunião, transmissão, arquivo crescendo):
+- FFmpeg lê uma URL (RTSP/HTTP...), um arquivo que ainda está sendo gravado
+  ou a entrada padrão e entrega PCM para um buffer em memória
+- A cada passo o buffer inteiro (até uma janela) é transcrito de novo e o
+  texto provisório aparece na tela
+- Um segmento só é confirmado quando duas transcrições seguidas concordam
+  nele (ou quando a janela enche); aí vai para o disco e sai do buffer
+- No fim, os mesmos .md/.txt/.json do modo arquivo, com a latência de cada
+  segmento
+
+Uso:
+    python transcrever.py ao-vivo rtsp://camera/sala --output output/
+    ffmpeg -f pulse -i default -f wav - | python transcrever.py ao-vivo - -o output/
+"""
+
+import sys
+import time
+import bisect
+import argparse
+import threading
+import subprocess
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from transcrever import TranscritorVideos
+from preprocessar_videos import PreProcessadorVideo
+from saidas_transcricao import EscritorTranscricao
+from instrumentacao import MedidorEtapas
+from motores_inferencia import MOTORES, MotorWhisper
+
+
+class TranscritorAoVivo:
+    """Classe para transcrever um fluxo de áudio em janelas deslizantes"""
+    
+    TAXA_AMOSTRAGEM = 16000
+    
+    # Bytes lidos do FFmpeg por vez (float32 mono: 0.1s)
+    BLOCO_LEITURA = 1600 * 4
+    
+    # Uma janela do Whisper: acima disso o buffer seria cortado em duas
+    JANELA_MAXIMA = 30.0
+    
+    # Últimas linhas de erro do FFmpeg guardadas para a mensagem final
+    LINHAS_ERRO = 20
+    
+    def __init__(self, transcritor, janela=10.0, passo=1.0, tempo_real=False, seguir=False):
+        """
+        Prepara a transcrição ao vivo
+        
+        Args:
+            transcritor: TranscritorVideos com o modelo, idioma e threads
+            janela: Máximo de segundos no buffer; quando enche, o que já foi
+                transcrito é confirmado mesmo sem concordância. Janelas
+                menores confirmam antes e decodificam menos por passo.
+            passo: Segundos de áudio novo entre duas transcrições do buffer
+                (intervalo de atualização do texto provisório)
+            tempo_real: Lê a fonte na velocidade de reprodução (-re), para
+                simular uma transmissão a partir de um arquivo
+            seguir: A fonte é um arquivo que ainda está crescendo; continua
+                lendo até ser interrompido (Ctrl+C)
+        """
+        self.transcritor = transcritor
+        self.janela = min(janela, self.JANELA_MAXIMA)
+        self.passo = passo
+        self.tempo_real = tempo_real
+        self.seguir = seguir
+        
+        # Com 'auto', o idioma da primeira fala vale para o resto do fluxo
+        self.idioma = None if transcritor.idioma == 'auto' else transcritor.idioma
+        
+        self._condicao = threading.Condition()
+        self._blocos = []
+        self._recebidas = 0
+        self._encerrado = False
+        self._erro_ffmpeg = ''
+        # (amostras recebidas, instante) para saber quando cada trecho chegou
+        self._chegadas = []
+        
+        self._buffer = np.zeros(0, dtype=np.float32)
+        self._inicio_buffer = 0
+        self._anterior = []
+        self._texto_confirmado = ''
+        self._parcial = ''
+        self._tela = sys.stdout.isatty()
+        
+        self.latencias_parciais = []
+        self.latencias_confirmadas = []
+    
+    def _comando_ffmpeg(self, fonte):
+        """Comando do FFmpeg que entrega a fonte como PCM float32 mono no stdout"""
+        cmd = ['ffmpeg', '-nostdin', '-loglevel', 'error']
+        if self.tempo_real:
+            cmd += ['-re']
+        if '://' in fonte:
+            # Sem buffer de entrada: o áudio sai assim que chega da rede
+            cmd += ['-fflags', 'nobuffer']
+        
+        if fonte == '-':
+            entrada = 'pipe:0'
+        elif self.seguir:
+            cmd += ['-follow', '1']
+            entrada = 'file:' + fonte
+        else:
+            entrada = fonte
+        
+        cmd += [
+            '-i', entrada,
+            '-vn',
+            '-ar', str(self.TAXA_AMOSTRAGEM),
+            '-ac', '1',
+            '-f', 'f32le',
+            '-'
+        ]
+        return self.transcritor.processador._com_threads(cmd)
+    
+    @staticmethod
+    def _drenar_erros(processo, linhas):
+        """Thread que esvazia o stderr do FFmpeg, guardando só as últimas linhas"""
+        for linha in processo.stderr:
+            linhas.append(linha.decode('utf-8', errors='replace').rstrip())
+    
+    def _ler(self, processo):
+        """Thread de leitura: passa o PCM do FFmpeg para o buffer à medida que chega"""
+        # Em sessões longas os erros de rede enchem o pipe do stderr e
+        # travariam o FFmpeg se ninguém o lesse até o fim do stdout
+        linhas_erro = deque(maxlen=self.LINHAS_ERRO)
+        drenador = threading.Thread(target=self._drenar_erros, args=(processo, linhas_erro),
+                                    daemon=True)
+        drenador.start()
+        
+        resto = b''
+        while True:
+            bloco = processo.stdout.read1(self.BLOCO_LEITURA)
+            if not bloco:
+                break
+            bloco = resto + bloco
+            util = len(bloco) - len(bloco) % 4
+            resto = bloco[util:]
+            amostras = np.frombuffer(bloco[:util], dtype=np.float32)
+            with self._condicao:
+                self._blocos.append(amostras)
+                self._recebidas += len(amostras)
+                self._chegadas.append((self._recebidas, time.monotonic()))
+                self._condicao.notify()
+        
+        processo.wait()
+        drenador.join()
+        with self._condicao:
+            self._erro_ffmpeg = '\n'.join(linhas_erro).strip()
+            self._encerrado = True
+            self._condicao.notify()
+    
+    def _aguardar_audio(self):
+        """
+        Espera até haver um passo de áudio novo ou o fluxo acabar e junta
+        os blocos recebidos ao buffer
+        
+        Returns:
+            bool: True se o fluxo acabou
+        """
+        alvo = self._inicio_buffer + len(self._buffer) + int(self.passo * self.TAXA_AMOSTRAGEM)
+        with self._condicao:
+            self._condicao.wait_for(lambda: self._encerrado or self._recebidas >= alvo)
+            blocos, self._blocos = self._blocos, []
+            encerrado = self._encerrado
+        if blocos:
+            self._buffer = np.concatenate([self._buffer, *blocos])
+        return encerrado
+    
+    def _chegada(self, amostra):
+        """Instante em que a amostra (posição absoluta) chegou do FFmpeg"""
+        with self._condicao:
+            i = bisect.bisect_left(self._chegadas, (amostra, 0.0))
+            if i == len(self._chegadas):
+                i -= 1
+            return self._chegadas[i][1]
+    
+    def _hipotese(self, medidor):
+        """
+        Transcreve o buffer atual
+        
+        Returns:
+            list: Segmentos com tempos absolutos (desde o início do fluxo)
+        """
+        inicio = self._inicio_buffer / self.TAXA_AMOSTRAGEM
+        fim = inicio + len(self._buffer) / self.TAXA_AMOSTRAGEM
+        prompt = self._texto_confirmado[-self.transcritor.TAMANHO_PROMPT:] or None
+        
+        with medidor.etapa('transcricao'):
+            result = self.transcritor.motor_inferencia.transcrever(
+                self.transcritor.model,
+                self._buffer,
+                idioma=self.idioma,
+                prompt=prompt,
+                # Cada passo é independente; sem o fallback de temperatura,
+                # o tempo por passo fica previsível
+                condition_on_previous_text=False,
+                temperature=0.0,
+                verbose=None
+            )
+        
+        segmentos = []
+        for segmento in result['segments']:
+            if not segmento['text'].strip():
+                continue
+            segmentos.append(dict(segmento,
+                                  start=round(min(inicio + segmento['start'], fim), 3),
+                                  end=round(min(inicio + segmento['end'], fim), 3)))
+        if segmentos and self.idioma is None:
+            self.idioma = result.get('language')
+        return segmentos
+    
+    def _escolher_confirmados(self, segmentos, final):
+        """
+        Segmentos estáveis: o começo em que esta transcrição e a anterior
+        concordam. O último segmento nunca entra (pode estar cortado no meio
+        de uma palavra), exceto no fim do fluxo.
+        """
+        if final:
+            return segmentos
+        
+        estaveis = 0
+        while (estaveis < min(len(segmentos) - 1, len(self._anterior))
+               and self._normalizar(segmentos[estaveis]) == self._normalizar(self._anterior[estaveis])):
+            estaveis += 1
+        
+        duracao_buffer = len(self._buffer) / self.TAXA_AMOSTRAGEM
+        if estaveis == 0 and segmentos and duracao_buffer >= self.janela:
+            # Janela cheia sem concordância: confirma o que houver
+            estaveis = max(1, len(segmentos) - 1)
+        return segmentos[:estaveis]
+    
+    @staticmethod
+    def _normalizar(segmento):
+        """Texto comparável entre duas transcrições do mesmo trecho"""
+        return ' '.join(segmento['text'].lower().split())
+    
+    def _confirmar(self, escritor, confirmados):
+        """Grava os segmentos confirmados e tira o áudio deles do buffer"""
+        agora = time.monotonic()
+        for i, segmento in enumerate(confirmados):
+            fim_amostra = int(segmento['end'] * self.TAXA_AMOSTRAGEM)
+            segmento['id'] = escritor.total_segmentos + i
+            segmento['latencia_s'] = round(agora - self._chegada(fim_amostra), 3)
+            self.latencias_confirmadas.append(segmento['latencia_s'])
+            self._mostrar(f"{self.transcritor._formatar_timestamp(segmento['start'])} "
+                          f"{segmento['text'].strip()}  ⏱️ {segmento['latencia_s']:.1f}s")
+        
+        texto = ''.join(segmento['text'] for segmento in confirmados)
+        escritor.adicionar({'text': texto, 'segments': confirmados, 'language': self.idioma})
+        self._texto_confirmado += texto
+        
+        corte = int(confirmados[-1]['end'] * self.TAXA_AMOSTRAGEM) - self._inicio_buffer
+        self._descartar(corte)
+    
+    def _descartar(self, amostras):
+        """Remove as primeiras amostras do buffer"""
+        amostras = max(0, min(amostras, len(self._buffer)))
+        self._buffer = self._buffer[amostras:]
+        self._inicio_buffer += amostras
+    
+    def _mostrar(self, linha, parcial=False):
+        """
+        Escreve uma linha confirmada ou o texto provisório; no terminal o
+        provisório é reescrito no lugar
+        """
+        if self._tela:
+            sys.stdout.write('\r\033[K')
+            if parcial:
+                sys.stdout.write(f"⏳ {linha}")
+            else:
+                sys.stdout.write(f"✅ {linha}\n")
+                if self._parcial:
+                    sys.stdout.write(f"⏳ {self._parcial}")
+            sys.stdout.flush()
+        else:
+            print(f"{'⏳' if parcial else '✅'} {linha}", flush=True)
+    
+    def _passo(self, escritor, medidor, final):
+        """Transcreve o buffer, confirma o que estabilizou e mostra o resto"""
+        if not len(self._buffer):
+            return
+        fim_amostra = self._inicio_buffer + len(self._buffer)
+        segmentos = self._hipotese(medidor)
+        
+        confirmados = self._escolher_confirmados(segmentos, final)
+        self._anterior = segmentos[len(confirmados):]
+        parcial = ' '.join(segmento['text'].strip() for segmento in self._anterior)
+        if parcial != self._parcial:
+            self._parcial = parcial
+            self.latencias_parciais.append(time.monotonic() - self._chegada(fim_amostra - 1))
+            if parcial:
+                self._mostrar(parcial, parcial=True)
+        
+        if confirmados:
+            self._confirmar(escritor, confirmados)
+        elif not segmentos and len(self._buffer) >= self.janela * self.TAXA_AMOSTRAGEM:
+            # Janela cheia sem fala: guarda só o último passo (fala começando)
+            self._descartar(len(self._buffer) - int(self.passo * self.TAXA_AMOSTRAGEM))
+    
+    def transcrever(self, fonte, output_dir, nome):
+        """
+        Transcreve a fonte até ela acabar ou até Ctrl+C
+        
+        Args:
+            fonte: URL, caminho de arquivo ou '-' para a entrada padrão
+            output_dir: Diretório para salvar a transcrição
+            nome: Nome base dos arquivos de saída
+        
+        Returns:
+            dict: Metadados da transcrição gravada
+        
+        Raises:
+            RuntimeError: Se o FFmpeg não entregar áudio nenhum
+        """
+        if self.transcritor.model is None:
+            self.transcritor._carregar_modelo()
+        if self.transcritor.threads:
+            print(f"🧵 {self.transcritor.threads} threads")
+        
+        # O FFmpeg só começa depois do modelo carregado: a carga não conta na latência
+        processo = subprocess.Popen(self._comando_ffmpeg(fonte),
+                                    stdin=None if fonte == '-' else subprocess.DEVNULL,
+                                    stdout=subprocess.PIPE,
+                                    stderr=subprocess.PIPE)
+        leitor = threading.Thread(target=self._ler, args=(processo,), daemon=True)
+        leitor.start()
+        
+        print(f"🔴 Ao vivo: {fonte} (janela {self.janela:g}s, passo {self.passo:g}s)")
+        print(f"   Ctrl+C encerra e grava a transcrição\n")
+        
+        medidor = MedidorEtapas()
+        with EscritorTranscricao(self.transcritor, nome, output_dir) as escritor:
+            try:
+                while not self._aguardar_audio():
+                    self._passo(escritor, medidor, final=False)
+            except KeyboardInterrupt:
+                if self._tela:
+                    sys.stdout.write('\n')
+                print(f"🛑 Encerrando...")
+                self._encerrar_ffmpeg(processo)
+            
+            leitor.join()
+            self._aguardar_audio()
+            self._passo(escritor, medidor, final=True)
+            if self._tela and self._parcial:
+                sys.stdout.write('\n')
+            
+            if not self._recebidas:
+                raise RuntimeError(f"FFmpeg não entregou áudio: {self._erro_ffmpeg or fonte}")
+            
+            medidor.duracao_audio = self._recebidas / self.TAXA_AMOSTRAGEM
+            print()
+            metadados = escritor.finalizar(medidor=medidor)
+        
+        self._imprimir_latencias(medidor)
+        return metadados
+    
+    @staticmethod
+    def _encerrar_ffmpeg(processo, espera=3):
+        """
+        Encerra o FFmpeg; com -follow ele pode ignorar o primeiro sinal
+        enquanto espera o arquivo crescer
+        """
+        processo.terminate()
+        try:
+            processo.wait(timeout=espera)
+        except subprocess.TimeoutExpired:
+            processo.kill()
+    
+    def _imprimir_latencias(self, medidor):
+        """Resumo da latência (chegada do áudio → texto na tela)"""
+        print(f"\n⏱️  Latência (chegada do áudio → texto):")
+        for rotulo, valores in (('provisório', self.latencias_parciais),
+                                ('confirmado', self.latencias_confirmadas)):
+            if not valores:
+                continue
+            ordenados = sorted(valores)
+            p50 = ordenados[len(ordenados) // 2]
+            p95 = ordenados[min(len(ordenados) - 1, int(0.95 * len(ordenados)))]
+            print(f"   {rotulo:<11} p50 {p50:.2f}s | p95 {p95:.2f}s | máx {ordenados[-1]:.2f}s")
+        
+        resumo = medidor.resumo()
+        if resumo['fator_tempo_real'] is not None:
+            print(f"⚡ Fator de tempo real: {resumo['fator_tempo_real']}")
+            if not self.tempo_real and resumo['fator_tempo_real'] > 1:
+                print(f"⚠️  Mais lento que o tempo real: use --janela menor, --passo maior "
+                      f"ou um modelo menor")
+
+
+def main(argv=None):
+    """Função principal - interface CLI do modo ao-vivo"""
+    
+    parser = argparse.ArgumentParser(
+        prog='transcrever.py ao-vivo',
+        description='🔴 Transcrição ao vivo de uma transmissão, arquivo crescendo ou stdin',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Exemplos de uso:
+  
+  # Câmera ou transmissão (RTSP, HTTP, HLS...)
+  python transcrever.py ao-vivo rtsp://192.168.0.10/sala --output output/
+  
+  # Microfone via entrada padrão
+  ffmpeg -f pulse -i default -f wav - | python transcrever.py ao-vivo - -o output/ -n reuniao
+  
+  # Arquivo ainda sendo gravado (Ctrl+C para encerrar)
+  python transcrever.py ao-vivo gravacao.mkv -o output/ --seguir
+  
+  # Medir a latência simulando uma transmissão com um arquivo pronto
+  python transcrever.py ao-vivo aula.mp4 -o output/ --tempo-real --janela 6
+        """
+    )
+    
+    parser.add_argument('fonte',
+                        help="URL, arquivo ou '-' para a entrada padrão")
+    parser.add_argument('--output', '-o', required=True,
+                        help='Pasta para salvar a transcrição')
+    parser.add_argument('--nome', '-n',
+                        help='Nome dos arquivos de saída (padrão: nome do arquivo ou ao_vivo_<data>)')
+    parser.add_argument('--modelo', '-m', default='base',
+                        choices=list(TranscritorVideos.MODELOS_DISPONIVEIS),
+                        help='Modelo Whisper a usar (padrão: base)')
+    parser.add_argument('--idioma', '-l', default='pt',
+                        help='Código do idioma ou auto (padrão: pt)')
+    parser.add_argument('--janela', type=float, default=10.0,
+                        help='Segundos máximos no buffer antes de confirmar (padrão: 10, máx: 30)')
+    parser.add_argument('--passo', type=float, default=1.0,
+                        help='Segundos de áudio novo entre atualizações (padrão: 1)')
+    parser.add_argument('--tempo-real', action='store_true',
+                        help='Lê a fonte na velocidade de reprodução (simula uma transmissão)')
+    parser.add_argument('--seguir', action='store_true',
+                        help='A fonte é um arquivo crescendo: continua lendo até Ctrl+C')
+    parser.add_argument('--cache-modelo', action='store_true',
+                        help='Carrega o modelo da cópia local de carga rápida')
+    parser.add_argument('--quantizar', action='store_true',
+                        help='Quantiza o modelo para int8 (CPU)')
+    parser.add_argument('--threads', '-t', type=int,
+                        help='Threads do torch e do FFmpeg (padrão: do torch)')
+    parser.add_argument('--motor', choices=list(MOTORES), default=MotorWhisper.NOME,
+                        help='Biblioteca que roda o modelo (padrão: whisper)')
+    
+    args = parser.parse_args(argv)
+    
+    if args.passo <= 0 or args.janela < args.passo:
+        parser.error('--passo deve ser positivo e menor que --janela')
+    if args.janela > TranscritorAoVivo.JANELA_MAXIMA:
+        print(f"⚠️  --janela limitada a {TranscritorAoVivo.JANELA_MAXIMA:g}s (uma janela do Whisper)")
+    
+    if not PreProcessadorVideo.verificar_ffmpeg():
+        sys.exit(1)
+    
+    nome = args.nome
+    if not nome:
+        if args.fonte == '-' or '://' in args.fonte:
+            nome = f"ao_vivo_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        else:
+            nome = Path(args.fonte).stem
+    
+    transcritor = TranscritorVideos(modelo=args.modelo, idioma=args.idioma,
+                                    usar_cache=False, cache_modelo=args.cache_modelo,
+                                    quantizar=args.quantizar, threads=args.threads,
+                                    motor=args.motor)
+    ao_vivo = TranscritorAoVivo(transcritor, janela=args.janela, passo=args.passo,
+                                tempo_real=args.tempo_real, seguir=args.seguir)
+    try:
+        ao_vivo.transcrever(args.fonte, args.output, nome)
+    except RuntimeError as e:
+        print(f"❌ Erro: {e}")
+        sys.exit(1)
+    transcritor.atualizar_indice_busca(args.output)
+
+
+if __name__ == '__main__':
+    main()